@@ -34,6 +34,25 @@ setup(
             'ipykernel',
             'notebook',
             'streamlit>=1.22.0'
+        ],
+        'parquet': [
+            'pyarrow'
+        ],
+        'http': [
+            'brotli',
+            'h2',
+            'urllib3>=2.3'
+        ],
+        'async': [
+            'aiohttp',
+            'aiofiles'
+        ],
+        'html': [
+            'lxml',
+            'selectolax>=0.3'
+        ],
+        'text': [
+            'nltk'
         ]
     },
     package_data={'bdtdfinder': ['py.typed']}
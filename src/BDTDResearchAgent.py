@@ -1,14 +1,33 @@
 import os
-import re
 import csv
+import asyncio
 import argparse
+from typing import Optional, Sequence
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
 # Imports dos módulos fornecidos
-from BDTDfinder import BDTDCrawler
-from BDTDdownloader import PDFDownloader
+from BDTDfinder import BDTDCrawler, RecordWriter, MAX_PAGE_LIMIT, RECORD_FIELDS
+from BDTDdownloader import PDFDownloader, DownloadScheduler, MIN_PDF_SIZE
+from BDTDasync import AsyncPDFDownloader, create_session
+from BDTDstore import PDFStore
+from BDTDrules import LinkRules, LINK_RULES_FILE
+from BDTDparse import html_parser, html_text
+from BDTDhttp import HTTPClient, get_client
+from BDTDrecord import BDTDRecord, read_records_table, write_records_table, split_urls
+from BDTDharvest import HarvestState, CrawlCheckpoint
+from BDTDplanner import PartitionHarvestError, QueryPlanner
+from BDTDcache import ResponseCache, DEFAULT_CACHE_DIR
+from BDTDindex import RecordIndex
+from BDTDtext import match_terms, tokenize
+from BDTDranker import RecordRanker
+from BDTDdedupe import MinHashDeduplicator
+
+# Pasta padrão do repositório de PDFs por conteúdo, dentro de output_dir
+PDF_STORE_DIR = ".pdfstore"
+
+# Sufixo do checkpoint da coleta paginada, gravado ao lado do arquivo de resultados
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
 
 class BDTDAgent:
     """
@@ -16,7 +35,14 @@ class BDTDAgent:
     download de arquivos e raspagem de texto plain das páginas acadêmicas, armazenando tudo na pasta definida por output_dir.
     """
 
-    def __init__(self, subject: str, max_pages_limit: int = 50, download_pdf: bool = False, output_dir: str = "output"):
+    def __init__(self, subject: str, max_pages_limit: int = 50, download_pdf: bool = False, output_dir: str = "output",
+                 max_workers: int = 4, client: Optional[HTTPClient] = None, cache_dir: Optional[str] = None,
+                 cache_ttl: float = 24 * 3600, output_format: str = "csv", delta: bool = False,
+                 partition_size: Optional[int] = None, index_path: Optional[str] = None,
+                 filter_fields: Sequence[str] = ("title",), stem_terms: bool = False,
+                 top_k: Optional[int] = None, dedupe: bool = False,
+                 download_workers: int = 8, per_host_downloads: int = 2, async_downloads: bool = False,
+                 store_dir: Optional[str] = None, parser: Optional[str] = None):
         """
         Inicializa o agente com as configurações necessárias.
         
@@ -25,16 +51,77 @@ class BDTDAgent:
             max_pages_limit (int): Número máximo de páginas para percorrer na busca (default=50).
             download_pdf (bool): Se True, faz o download dos arquivos após filtrar (default=False).
             output_dir (str): Diretório para salvar os arquivos gerados (default: "output").
+            max_workers (int): Número máximo de páginas da busca requisitadas em paralelo (default=4).
+            client (Optional[HTTPClient]): Cliente HTTP usado pela busca, raspagem e download.
+                Se None, usa o cliente compartilhado do processo.
+            cache_dir (Optional[str]): Diretório do cache das respostas da API da BDTD. Se None, o cache fica desativado.
+            cache_ttl (float): Validade (em segundos) das respostas em cache (default=24h).
+            output_format (str): Formato dos arquivos de resultados, "csv" ou "parquet" (default: "csv").
+                Em Parquet os campos multivalorados (autores, assuntos, URLs...) são gravados como listas.
+            delta (bool): Se True, mantém o estado da coleta em output_dir e, havendo resultados anteriores,
+                busca apenas os registros novos e os incorpora ao arquivo existente (default=False).
+            partition_size (Optional[int]): Se definido, coleta a busca completa dividindo-a em subconsultas
+                disjuntas de até partition_size registros (por ano e tipo de documento), coletadas em paralelo.
+                Nesse modo max_pages_limit não se aplica (default=None).
+            index_path (Optional[str]): Arquivo SQLite do índice de texto completo local. Se definido, os
+                registros coletados são indexados e podem ser consultados com search_index sem acessar
+                a BDTD (default=None).
+            filter_fields (Sequence[str]): Campos pesquisados por filter_by_subject, entre 'title',
+                'subjects' e 'abstract' (default: apenas "title").
+            stem_terms (bool): Se True, filter_by_subject compara os termos pelo radical (stemmer RSLP
+                do nltk), aceitando plurais e variações (default=False).
+            top_k (Optional[int]): Se definido, filter_by_subject ordena os registros por relevância (BM25
+                sobre título, assuntos e resumo) e mantém apenas os top_k melhores, que seguem para raspagem
+                e download (default=None, filtragem booleana).
+            dedupe (bool): Se True, após a coleta agrupa registros quase duplicados (mesmo título, autores
+                e ano com pequenas variações, via MinHash/LSH) e mantém um registro por grupo em
+                results_dedup, usado nas etapas seguintes (default=False).
+            download_workers (int): Número total de downloads simultâneos, entre todos os registros (default=8).
+            per_host_downloads (int): Número máximo de downloads simultâneos em um mesmo host (default=2).
+            async_downloads (bool): Se True, os downloads usam o AsyncPDFDownloader (aiohttp/aiofiles) em um
+                único event loop, em vez de threads; download_workers passa a limitar as conexões abertas
+                (default=False).
+            store_dir (Optional[str]): Diretório do repositório de PDFs endereçado por conteúdo (SHA-256).
+                Cada PDF é gravado uma única vez e as pastas dos registros recebem hardlinks; URLs já
+                baixadas não são requisitadas de novo (default: output_dir/.pdfstore).
+            parser (Optional[str]): Backend de HTML da busca de PDFs e da raspagem de texto ('lxml' ou
+                'html.parser'); se None, 'lxml' quando instalado e, na raspagem, o selectolax quando
+                instalado (pip install .[html]).
+        
+        Todas as etapas (busca, raspagem e download) compartilham o mesmo cliente HTTP,
+        reaproveitando as conexões abertas com cada host.
         """
         self.subject = subject
         self.max_pages_limit = max_pages_limit
+        self.max_workers = max(1, max_workers)
         self.download_pdf = download_pdf
         self.output_dir = output_dir  # Agora configurável via argumento
         self.scrape_text = False    # Atributo para controle de raspagem de texto
+        self.client = client or get_client()
+        self.cache = ResponseCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+
+        if output_format not in ("csv", "parquet"):
+            raise ValueError(f"Formato de saída não suportado: {output_format}")
+        self.output_format = output_format
+        self.delta = delta
+        self.partition_size = partition_size
+        # Partições que falharam na última coleta particionada (ver run_partitioned_crawler)
+        self.failed_partitions = []
+        self.index_path = index_path
+        self.filter_fields = tuple(filter_fields)
+        self.stem_terms = stem_terms
+        self.top_k = top_k
+        self.dedupe = dedupe
+        self.download_workers = max(1, download_workers)
+        self.per_host_downloads = max(1, per_host_downloads)
+        self.async_downloads = async_downloads
+        self.store_dir = store_dir or os.path.join(self.output_dir, PDF_STORE_DIR)
+        self.parser = html_parser(parser) if parser else None
 
-        # Caminhos para os CSVs gerados
-        self.output_csv = os.path.join(self.output_dir, "results.csv")
-        self.filtered_csv = os.path.join(self.output_dir, "results_filtered.csv")
+        # Caminhos para os arquivos gerados
+        self.output_csv = os.path.join(self.output_dir, f"results.{output_format}")
+        self.dedup_csv = os.path.join(self.output_dir, f"results_dedup.{output_format}")
+        self.filtered_csv = os.path.join(self.output_dir, f"results_filtered.{output_format}")
         self.page_details_csv = os.path.join(self.output_dir, "results_page.csv")
         
     def run_crawler(self) -> str:
@@ -42,59 +129,294 @@ class BDTDAgent:
         Executa o BDTDCrawler em múltiplas páginas até o limite definido e salva o resultado consolidado
         em um arquivo CSV final (self.output_csv).
         
+        self.max_pages_limit é contado em páginas de 20 registros (o tamanho de página padrão da BDTD),
+        mas a busca usa páginas de MAX_PAGE_LIMIT registros e pede apenas os campos usados por
+        process_record, reduzindo o número de requisições e o tamanho de cada resposta.
+        
+        A primeira página é buscada sozinha para ler o 'resultCount' e calcular quantas páginas
+        realmente existem; as demais são requisitadas em paralelo (até self.max_workers por vez).
+        Cada página é gravada no CSV assim que chega, na ordem original de relevância.
+        
+        Em CSV, cada página concluída é registrada em um checkpoint ('results.csv.checkpoint.json').
+        Se a coleta for interrompida (erro persistente após as novas tentativas do crawler),
+        a próxima execução com a mesma busca retoma a partir da última página concluída.
+        
+        Em modo delta (self.delta), se já houver resultados e estado de uma coleta anterior,
+        delega para run_delta_crawler.
+        
         Returns:
             str: Caminho do arquivo CSV resultante ou None se nenhum registro for encontrado.
         """
-        crawler = BDTDCrawler()
-        all_records = []
+        crawler = BDTDCrawler(client=self.client, cache=self.cache)
         
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
         
-        page_count = 0
+        if self.partition_size:
+            return self.run_partitioned_crawler(crawler)
         
-        for page in range(1, self.max_pages_limit + 1):
+        max_records = self.max_pages_limit * 20
+        query = {
+            'keywords': self.subject,
+            'limit': MAX_PAGE_LIMIT,
+            'max_records': max_records,
+            'fields': RECORD_FIELDS
+        }
+        checkpoint = CrawlCheckpoint(self.output_csv + CHECKPOINT_SUFFIX, query) if self.output_format == "csv" else None
+        resume = checkpoint is not None and checkpoint.resumable and os.path.exists(self.output_csv)
+        
+        state = HarvestState.for_query(self.output_dir, self.subject) if self.delta else None
+        if not resume and state is not None and state.seen_ids and os.path.exists(self.output_csv):
+            return self.run_delta_crawler(crawler, state)
+        
+        if resume:
+            # Descarta qualquer gravação parcial posterior à última página concluída
+            with open(self.output_csv, "r+b") as f:
+                f.truncate(checkpoint.offset)
+            if state is not None:
+                state.update(
+                    BDTDRecord.from_row(row)
+                    for row in read_records_table(self.output_csv).to_dict("records")
+                )
+            print(f"==> Retomando a coleta a partir da página {checkpoint.last_page + 1} "
+                  f"({checkpoint.records} registros já gravados).")
+        else:
+            if checkpoint is not None:
+                checkpoint.clear()
+            if os.path.exists(self.output_csv):
+                os.remove(self.output_csv)
+        
+        start_page = checkpoint.last_page + 1 if resume else 1
+        written = checkpoint.records if resume else 0
+        next_page = start_page
+        
+        with RecordWriter(self.output_csv, append=resume) as writer:
             try:
-                url = crawler.create_query_url(
+                pages = crawler.iter_pages(
                     keywords=self.subject,
+                    max_workers=self.max_workers,
+                    max_records=max_records - written,
                     search_type="AllFields",
                     sort="relevance",
-                    page=page,
-                    limit=20,
-                    language="pt-br"
+                    page=start_page,
+                    limit=MAX_PAGE_LIMIT,
+                    language="pt-br",
+                    fields=RECORD_FIELDS
                 )
-                results_json = crawler.fetch_results(url)
-                records = results_json.get('records', [])
-                if not records:
-                    # Se não vier nenhum registro nesta página, encerra a busca
-                    break
-                
-                for record in records:
-                    processed = crawler.process_record(record)
-                    all_records.append(processed)
-                
-                page_count += 1
-                print(f"Página {page} processada com sucesso ({len(records)} registros).")
-                
+                for page, results_json in pages:
+                    records = [crawler.process_record(record) for record in results_json.get('records', [])]
+                    if page == start_page:
+                        result_count = results_json.get('resultCount', 0)
+                        print(f"Total de registros na BDTD: {result_count}.")
+                    writer.write(records)
+                    if state is not None:
+                        state.update(records)
+                    if checkpoint is not None:
+                        checkpoint.save(page, written + writer.count, os.path.getsize(self.output_csv))
+                    next_page = page + 1
+                    print(f"Página {page} processada com sucesso ({len(records)} registros).")
+                completed = True
             except Exception as e:
-                print(f"Erro na página {page}: {e}")
-                break
+                print(f"Erro na página {next_page}: {e}")
+                completed = False
         
-        if not all_records:
+        if written + writer.count == 0:
             print(f"\nNenhum registro encontrado para o assunto: '{self.subject}'.")
             return None
         
-        # Gera dataframe e salva o CSV
-        df = pd.DataFrame(all_records)
-        df.to_csv(self.output_csv, index=False, encoding="utf-8", sep=";")
+        if completed:
+            if checkpoint is not None:
+                checkpoint.clear()
+            if state is not None:
+                state.save()
+        elif checkpoint is not None:
+            print("Coleta interrompida. Execute novamente para retomar a partir da última página concluída.")
         
-        print(f"\nTotal de páginas processadas: {page_count}")
+        print(f"\nTotal de páginas processadas: {next_page - 1}")
         print(f"Arquivo CSV consolidado salvo em: {self.output_csv}")
         return self.output_csv
 
+    def run_partitioned_crawler(self, crawler: BDTDCrawler) -> str:
+        """
+        Coleta a busca completa dividindo-a em partições disjuntas (QueryPlanner), coletadas em
+        paralelo e sem paginação profunda. Os registros são deduplicados por id e gravados à medida
+        que cada partição termina.
+        
+        Se alguma partição falhar, a coleta é dada como incompleta: as partições não coletadas são
+        informadas (e guardadas em self.failed_partitions) e, em modo delta, o estado não é gravado,
+        para que a próxima execução não pule os registros que faltaram.
+        
+        Args:
+            crawler (BDTDCrawler): Crawler usado na busca.
+        
+        Returns:
+            str: Caminho do arquivo de resultados ou None se nenhum registro for encontrado.
+        """
+        planner = QueryPlanner(crawler, max_partition_size=self.partition_size)
+        partitions = planner.plan(self.subject, search_type="AllFields", language="pt-br")
+        plan = planner.summary(partitions)
+        print(f"==> Busca dividida em {plan['partitions']} partição(ões), {plan['records']} registros "
+              f"(maior partição: {plan['largest']}).")
+        
+        if os.path.exists(self.output_csv):
+            os.remove(self.output_csv)
+        state = HarvestState.for_query(self.output_dir, self.subject) if self.delta else None
+        
+        self.failed_partitions = []
+        completed = False
+        with RecordWriter(self.output_csv) as writer:
+            try:
+                harvested = planner.iter_partition_records(
+                    self.subject,
+                    partitions,
+                    max_workers=self.max_workers,
+                    search_type="AllFields",
+                    language="pt-br"
+                )
+                for partition, records in harvested:
+                    writer.write(records)
+                    if state is not None:
+                        state.update(records)
+                    print(f"Partição {' '.join(partition.filters) or '(completa)'} concluída ({len(records)} registros).")
+                completed = True
+            except PartitionHarvestError as e:
+                self.failed_partitions = [partition for partition, _ in e.failures]
+            except Exception as e:
+                print(f"Erro na coleta particionada: {e}")
+        
+        if not completed:
+            print(f"\nColeta incompleta: {writer.count} registros gravados em {self.output_csv}.")
+            for partition in self.failed_partitions:
+                print(f"  Partição não coletada: {' '.join(partition.filters) or '(completa)'} "
+                      f"({partition.count} registros)")
+            if state is not None:
+                print("Estado da coleta incremental não atualizado. Execute novamente para coletar os registros que faltaram.")
+            return self.output_csv if writer.count else None
+        
+        if writer.count == 0:
+            print(f"\nNenhum registro encontrado para o assunto: '{self.subject}'.")
+            return None
+        if state is not None:
+            state.save()
+        
+        print(f"\nTotal de registros coletados: {writer.count}")
+        print(f"Arquivo consolidado salvo em: {self.output_csv}")
+        return self.output_csv
+
+    def run_delta_crawler(self, crawler: BDTDCrawler, state: HarvestState) -> str:
+        """
+        Coleta apenas os registros publicados desde a última execução e os incorpora, no topo,
+        ao arquivo de resultados existente (sem duplicar ids).
+        
+        Args:
+            crawler (BDTDCrawler): Crawler usado na busca.
+            state (HarvestState): Estado da coleta anterior; é atualizado e gravado ao final.
+        
+        Returns:
+            str: Caminho do arquivo de resultados atualizado.
+        """
+        print(f"==> Coleta incremental: {len(state.seen_ids)} registros conhecidos, "
+              f"data mais recente: {state.newest_date or 'N/A'}")
+        new_path = os.path.join(self.output_dir, f"results_new.{self.output_format}")
+        
+        with RecordWriter(new_path) as writer:
+            try:
+                pages = crawler.iter_new_records(
+                    keywords=self.subject,
+                    state=state,
+                    max_records=self.max_pages_limit * 20,
+                    search_type="AllFields",
+                    limit=MAX_PAGE_LIMIT,
+                    language="pt-br",
+                    fields=RECORD_FIELDS
+                )
+                for records in pages:
+                    writer.write(records)
+                    state.update(records)
+            except Exception as e:
+                print(f"Erro na coleta incremental: {e}")
+        
+        if writer.count == 0:
+            print("Nenhum registro novo desde a última execução.")
+        else:
+            merged = pd.concat([read_records_table(new_path), read_records_table(self.output_csv)])
+            merged = merged.drop_duplicates(subset="id", keep="first")
+            write_records_table(merged, self.output_csv)
+            print(f"{writer.count} registro(s) novo(s) incorporado(s) a {self.output_csv}")
+        
+        if os.path.exists(new_path):
+            os.remove(new_path)
+        state.save()
+        return self.output_csv
+
+    def index_records(self, csv_path: str) -> int:
+        """
+        Indexa os registros do arquivo de resultados no índice local (self.index_path).
+        Registros já indexados são atualizados; os de coletas anteriores permanecem no índice.
+        
+        Args:
+            csv_path (str): Caminho do arquivo de resultados.
+        
+        Returns:
+            int: Número de registros indexados.
+        """
+        with RecordIndex(self.index_path) as index:
+            count = index.add_file(csv_path)
+            total = len(index)
+        print(f"{count} registro(s) indexado(s) em {self.index_path} ({total} no índice).")
+        return count
+
+    def search_index(self, query: str, limit: int = 20, **kwargs) -> pd.DataFrame:
+        """
+        Consulta o índice local, sem acessar a BDTD.
+        
+        Args:
+            query (str): Termos de busca (acentos e maiúsculas são ignorados).
+            limit (int): Número máximo de resultados (default=20).
+            **kwargs: Parâmetros adicionais para RecordIndex.search (any_term, prefix, weights).
+        
+        Returns:
+            pd.DataFrame: Registros encontrados, do mais ao menos relevante, com a coluna 'score'.
+        """
+        if not self.index_path or not os.path.exists(self.index_path):
+            print("Índice local não encontrado. Execute a coleta com index_path definido.")
+            return pd.DataFrame()
+        with RecordIndex(self.index_path) as index:
+            results = index.search(query, limit=limit, **kwargs)
+        return pd.DataFrame([{**record.to_row(), 'score': score} for record, score in results])
+
+    def deduplicate(self, csv_path: str) -> str:
+        """
+        Remove registros quase duplicados (o mesmo trabalho com ids diferentes ou pequenas
+        variações de título) e salva o resultado em self.dedup_csv. O arquivo original da coleta
+        não é alterado, preservando checkpoints e o modo delta.
+        
+        Args:
+            csv_path (str): Caminho do arquivo de resultados.
+        
+        Returns:
+            str: Caminho do arquivo sem duplicatas (self.dedup_csv).
+        """
+        df = read_records_table(csv_path)
+        deduped = MinHashDeduplicator().deduplicate(df)
+        groups = int((deduped['duplicate_ids'] != '').sum())
+        print(f"{groups} grupo(s) de duplicatas; {len(df) - len(deduped)} registro(s) removido(s).")
+        write_records_table(deduped, self.dedup_csv)
+        print(f"Arquivo sem duplicatas salvo em: {self.dedup_csv} ({len(deduped)} de {len(df)} registros)")
+        return self.dedup_csv
+
     def filter_by_subject(self, csv_path: str) -> str:
         """
-        Filtra o CSV, mantendo apenas as linhas cujo 'title' contenha ao menos uma das palavras de self.subject.
+        Filtra o CSV, mantendo apenas as linhas em que algum dos campos de self.filter_fields
+        (por padrão, apenas 'title') contenha ao menos uma das palavras de self.subject.
+        
+        A comparação ignora maiúsculas e acentos ("regressao" casa com "Regressão"). Todos os
+        termos são compilados em uma única expressão aplicada de forma vetorizada à coluna inteira.
+        Com self.stem_terms, os termos são comparados pelo radical (RSLP), de modo que variações
+        como "regressões" também são aceitas.
+        
+        Com self.top_k, os registros são ordenados por relevância (BM25 sobre título, assuntos e
+        resumo, com a pontuação gravada na coluna 'score') e apenas os top_k melhores são mantidos.
         
         Args:
             csv_path (str): Caminho do CSV original.
@@ -103,19 +425,18 @@ class BDTDAgent:
             str: Caminho do CSV filtrado (self.filtered_csv).
         """
         try:
-            df = pd.read_csv(csv_path, sep=";")
+            df = read_records_table(csv_path)
         except pd.errors.EmptyDataError:
             print("O arquivo CSV de resultados está vazio. Encerrando o processo.")
             return None
         
-        subject_terms = self.subject.lower().split()
-        
-        def match_title(title):
-            title_lower = str(title).lower()
-            return any(re.search(rf"\b{term}\b", title_lower) for term in subject_terms)
-        
-        filtered_df = df[df["title"].apply(match_title)]
-        filtered_df.to_csv(self.filtered_csv, index=False, encoding="utf-8", sep=";")
+        if self.top_k:
+            filtered_df = RecordRanker().rank(df, self.subject, top_k=self.top_k)
+            print(f"{len(filtered_df)} registro(s) mais relevante(s) selecionado(s) de {len(df)}.")
+        else:
+            subject_terms = tokenize(self.subject)
+            filtered_df = df[match_terms(df, subject_terms, fields=self.filter_fields, stem=self.stem_terms)]
+        write_records_table(filtered_df, self.filtered_csv)
         
         print(f"Arquivo CSV filtrado salvo em: {self.filtered_csv}")
         return self.filtered_csv
@@ -159,34 +480,105 @@ class BDTDAgent:
         Faz o download dos arquivos a partir das URLs no CSV filtrado.
         - Cria para cada registro uma pasta de nome '{id}' dentro de output_dir.
         - Baixa todos os arquivos sem renomear (mantendo o nome original do servidor ou da URL).
-        
-        Obs.: A checagem final de integridade e tamanho é feita na rotina de sanity check.
+        - Os downloads de todos os registros são distribuídos por um DownloadScheduler: até
+          self.download_workers simultâneos, com no máximo self.per_host_downloads por host.
+          Com self.async_downloads, as mesmas tarefas rodam em um único event loop (AsyncPDFDownloader).
+        - Cada PDF é validado durante o download (assinatura '%PDF' e tamanho mínimo/máximo);
+          conteúdos inválidos são descartados sem chegar ao disco e pastas sem nenhum PDF são removidas.
+        - Os PDFs ficam no repositório endereçado por conteúdo (self.store_dir) e as pastas dos registros
+          recebem hardlinks: o mesmo arquivo, visto por várias URLs ou registros, é baixado e gravado uma vez.
+        - As regras que localizaram o texto completo em cada host são aprendidas e gravadas no repositório
+          (rules.json), de modo que os registros seguintes do mesmo host vão direto ao link certo.
         
         Args:
             csv_path (str): Caminho do CSV filtrado.
         """
-        df = pd.read_csv(csv_path, sep=";")
+        df = read_records_table(csv_path, columns=["id", "urls"])
         
-        for idx, row in df.iterrows():
+        # Uma tarefa por URL; cada registro tem seu próprio downloader (pasta de destino)
+        records = {}
+        tasks = []
+        for idx, row in enumerate(df.to_dict("records")):
             rec_id = str(row.get("id", "no_id"))
+            url_list = split_urls(row.get("urls"))
+            if not url_list:
+                continue
+            
             folder_name = self.sanitize_folder_name(rec_id)
             pdf_subfolder = os.path.join(self.output_dir, folder_name)
-
             if not os.path.exists(pdf_subfolder):
                 os.makedirs(pdf_subfolder)
             
-            downloader = PDFDownloader(pdf_subfolder)
-            # Assume que as URLs estão separadas por '|'
-            url_list = [u.strip() for u in str(row.get("urls", "")).split("|") if u.strip()]
+            records[idx] = {
+                "id": rec_id,
+                "folder": pdf_subfolder,
+                "pending": len(url_list),
+                "files": []
+            }
+            tasks.extend((idx, url) for url in url_list)
+        
+        completed = 0
+        
+        def report(idx, url, downloaded_files):
+            nonlocal completed
+            record = records[idx]
+            for dfile in downloaded_files:
+                print(f"Arquivo baixado: {dfile}")
+            record["files"].extend(f for f in downloaded_files if f not in record["files"])
+            record["pending"] -= 1
+            if record["pending"] == 0:
+                completed += 1
+                print(f"[{completed}/{len(records)}] Registro {record['id']}: "
+                      f"{len(record['files'])} arquivo(s) baixado(s).")
+                # Nenhum PDF válido: remove a pasta vazia do registro
+                if not os.listdir(record["folder"]):
+                    os.rmdir(record["folder"])
+        
+        store = PDFStore(self.store_dir)
+        rules = LinkRules(os.path.join(self.store_dir, LINK_RULES_FILE))
+        try:
+            if self.async_downloads:
+                print(f"==> Baixando arquivos de {len(records)} registro(s) ({len(tasks)} URL(s), assíncrono, "
+                      f"até {self.download_workers} conexões, {self.per_host_downloads} por host).")
+                asyncio.run(self._download_async(records, tasks, report, store, rules))
+                return
             
-            for url in url_list:
+            for record in records.values():
+                record["downloader"] = PDFDownloader(record["folder"], client=self.client, store=store,
+                                                     rules=rules, parser=self.parser)
+            scheduler = DownloadScheduler(max_workers=self.download_workers, per_host=self.per_host_downloads)
+            print(f"==> Baixando arquivos de {len(records)} registro(s) ({len(tasks)} URL(s), "
+                  f"{scheduler.max_workers} downloads simultâneos, até {scheduler.per_host} por host).")
+            
+            results = scheduler.run(tasks, lambda idx, url: records[idx]["downloader"].process_page(url))
+            for idx, url, downloaded_files in results:
+                report(idx, url, downloaded_files)
+        finally:
+            # O índice de URLs e as regras aprendidas são gravados mesmo se o download for interrompido
+            store.save()
+            rules.save()
+
+    async def _download_async(self, records: dict, tasks: list, report, store: PDFStore, rules: LinkRules):
+        """
+        Executa as tarefas (registro, URL) de download_pdfs concorrentemente em uma única sessão aiohttp.
+        """
+        async with create_session(max_connections=self.download_workers, per_host=self.per_host_downloads) as session:
+            downloaders = {
+                idx: AsyncPDFDownloader(record["folder"], session=session, store=store, rules=rules,
+                                        parser=self.parser)
+                for idx, record in records.items()
+            }
+            
+            async def run_task(idx, url):
+                # Como no DownloadScheduler, um erro inesperado afeta apenas a própria tarefa
                 try:
-                    downloaded_files = downloader.process_page(url)
-                    for dfile in downloaded_files:
-                        print(f"Arquivo baixado: {dfile}")
+                    downloaded_files = await downloaders[idx].process_page(url)
                 except Exception as e:
                     print(f"Erro ao baixar de {url}: {e}")
-                    continue
+                    downloaded_files = []
+                report(idx, url, downloaded_files)
+            
+            await asyncio.gather(*(run_task(idx, url) for idx, url in tasks))
 
     def sanity_check_downloads(self):
         """
@@ -197,12 +589,19 @@ class BDTDAgent:
           4) Caso a pasta fique vazia, remove a pasta também.
         
         Exibe logs sobre as remoções realizadas.
+        
+        Obs.: download_pdfs já valida cada PDF durante o download; esta rotina serve para limpar
+        pastas baixadas por outros meios ou por versões anteriores.
         """
         base_output = self.output_dir
         
         for folder_name in os.listdir(base_output):
             folder_path = os.path.join(base_output, folder_name)
             
+            # Ignora pastas ocultas, como o repositório de conteúdo (.pdfstore)
+            if folder_name.startswith('.'):
+                continue
+            
             if os.path.isdir(folder_path):
                 initial_files = os.listdir(folder_path)
                 
@@ -218,7 +617,7 @@ class BDTDAgent:
                         os.remove(file_path)
                         continue
 
-                    if os.path.getsize(file_path) < 100_000:
+                    if os.path.getsize(file_path) < MIN_PDF_SIZE:
                         print(f"[Sanity Check] Removendo '{file_path}' (< 100 KB).")
                         os.remove(file_path)
                         continue
@@ -242,7 +641,7 @@ class BDTDAgent:
             csv_path (str): Caminho do CSV filtrado.
         """
         try:
-            df = pd.read_csv(csv_path, sep=";")
+            df = read_records_table(csv_path, columns=["id", "urls"])
         except Exception as e:
             print(f"Erro ao ler o CSV filtrado para raspagem: {e}")
             return
@@ -255,15 +654,13 @@ class BDTDAgent:
 
         for idx, row in df.iterrows():
             record_id = str(row.get("id", "no_id"))
-            urls_str = str(row.get("urls", ""))
-            url_list = [u.strip() for u in urls_str.split("|") if u.strip()]
+            url_list = split_urls(row.get("urls"))
             for url in url_list:
                 print(f"Raspando texto da página: {url}")
                 try:
-                    response = requests.get(url, timeout=60)
+                    response = self.client.get(url)
                     response.raise_for_status()
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    plain_text = soup.get_text(separator=" ", strip=True)
+                    plain_text = html_text(response.text, self.parser)
                 except Exception as e:
                     print(f"Erro ao acessar ou processar {url}: {e}")
                     plain_text = ""
@@ -276,11 +673,12 @@ class BDTDAgent:
     def run(self):
         """
         Executa todo o fluxo:
-          1) Busca com BDTDCrawler (multi-páginas) e salva em output/results.csv.
+          1) Busca com BDTDCrawler (multi-páginas) e salva em output/results.csv
+             (e indexa os registros no índice local, se index_path estiver definido).
+             (Opcional) Remove registros quase duplicados (output/results_dedup.csv).
           2) Filtra o CSV em output/results_filtered.csv pelas palavras de self.subject.
           3) Raspagem do texto plain de cada link visitado (se o argumento --scrape_text for utilizado).
-          4) (Opcional) Faz download dos arquivos em pastas separadas.
-          5) (Opcional) Ao final, executa o sanity check para remover PDFs indesejados.
+          4) (Opcional) Faz download dos arquivos em pastas separadas, validando cada PDF durante o download.
         """
         print(f"==> Iniciando busca para o assunto: '{self.subject}'")
         print(f"==> Número máximo de páginas: {self.max_pages_limit}")
@@ -291,6 +689,12 @@ class BDTDAgent:
             print("Nenhum registro foi encontrado na busca. Encerrando o processo.")
             return
         
+        if self.index_path:
+            self.index_records(csv_path)
+        
+        if self.dedupe:
+            csv_path = self.deduplicate(csv_path)
+        
         filtered_csv = self.filter_by_subject(csv_path)
         if filtered_csv is None or os.path.getsize(filtered_csv) == 0:
             print("Nenhum registro após a filtragem. Encerrando o processo.")
@@ -303,7 +707,6 @@ class BDTDAgent:
         if self.download_pdf:
             self.download_pdfs(filtered_csv)
             print("==> Download de arquivos concluído.")
-            self.sanity_check_downloads()
         
         print("==> Processo finalizado com sucesso!")
 
@@ -344,6 +747,95 @@ def parse_arguments():
         default="output",
         help="Diretório para saída (default: output)."
     )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help=f"Diretório do cache das respostas da API da BDTD (ex.: {DEFAULT_CACHE_DIR}). Desativado por padrão."
+    )
+    parser.add_argument(
+        "--output_format",
+        type=str,
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Formato dos arquivos de resultados (default: csv)."
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Se presente, busca apenas registros novos desde a última execução em output_dir."
+    )
+    parser.add_argument(
+        "--partition_size",
+        type=int,
+        default=None,
+        help="Se definido, coleta a busca completa em partições de até N registros (ignora --max_pages_limit)."
+    )
+    parser.add_argument(
+        "--index_path",
+        type=str,
+        default=None,
+        help="Arquivo SQLite do índice local de texto completo dos registros coletados. Desativado por padrão."
+    )
+    parser.add_argument(
+        "--filter_fields",
+        nargs="+",
+        choices=["title", "subjects", "abstract"],
+        default=["title"],
+        help="Campos usados na filtragem pelas palavras do assunto (default: title)."
+    )
+    parser.add_argument(
+        "--stem",
+        action="store_true",
+        help="Se presente, a filtragem compara as palavras pelo radical (requer nltk)."
+    )
+    parser.add_argument(
+        "--top_k",
+        type=int,
+        default=None,
+        help="Se definido, mantém apenas os K registros mais relevantes (BM25) para raspagem e download."
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Se presente, remove registros quase duplicados (MinHash/LSH) antes da filtragem."
+    )
+    parser.add_argument(
+        "--download_workers",
+        type=int,
+        default=8,
+        help="Número total de downloads simultâneos (default=8)."
+    )
+    parser.add_argument(
+        "--per_host_downloads",
+        type=int,
+        default=2,
+        help="Número máximo de downloads simultâneos por host (default=2)."
+    )
+    parser.add_argument(
+        "--store_dir",
+        type=str,
+        default=None,
+        help="Diretório do repositório de PDFs por conteúdo (SHA-256); default: output_dir/.pdfstore."
+    )
+    parser.add_argument(
+        "--html_parser",
+        type=str,
+        choices=["lxml", "html.parser"],
+        default=None,
+        help="Backend de HTML da busca de PDFs e da raspagem; default: lxml se instalado (pip install .[html])."
+    )
+    parser.add_argument(
+        "--async_downloads",
+        action="store_true",
+        help="Se presente, faz os downloads com aiohttp/aiofiles em um único event loop (requer pip install .[async])."
+    )
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=4,
+        help="Número máximo de páginas da busca requisitadas em paralelo (default=4)."
+    )
     
     return parser.parse_args()
 
@@ -359,7 +851,22 @@ def main():
         subject=args.subject,
         max_pages_limit=args.max_pages_limit,
         download_pdf=args.download_pdf,
-        output_dir=args.output_dir  # Passa o diretório configurado
+        output_dir=args.output_dir,  # Passa o diretório configurado
+        max_workers=args.max_workers,
+        cache_dir=args.cache_dir,
+        output_format=args.output_format,
+        delta=args.delta,
+        partition_size=args.partition_size,
+        index_path=args.index_path,
+        filter_fields=args.filter_fields,
+        stem_terms=args.stem,
+        top_k=args.top_k,
+        dedupe=args.dedupe,
+        download_workers=args.download_workers,
+        per_host_downloads=args.per_host_downloads,
+        async_downloads=args.async_downloads,
+        store_dir=args.store_dir,
+        parser=args.html_parser
     )
     # Define o atributo scrape_text conforme o argumento
     agent.scrape_text = args.scrape_text
@@ -11,7 +11,7 @@ import shutil
 # Imports dos módulos existentes
 from BDTDfinder import BDTDCrawler
 from BDTDdownloader import PDFDownloader
-from BDTDResearchAgent import BDTDAgent
+from BDTDResearchAgent import BDTDAgent, PDF_STORE_DIR, CHECKPOINT_SUFFIX
 
 class BDTDReviewer:
     """
@@ -45,7 +45,11 @@ class BDTDReviewer:
         debug: bool = False,
         openrouter_api_key: Optional[str] = None,
         model: Optional[str] = "google/gemini-2.0-pro-exp-02-05:free",
-        log_callback = None
+        log_callback = None,
+        cache_dir: Optional[str] = None,
+        delta: bool = False,
+        top_k: Optional[int] = None,
+        dedupe: bool = False
     ):
         """
         Inicializa o BDTDReviewer com os parâmetros fornecidos.
@@ -60,6 +64,13 @@ class BDTDReviewer:
             output_dir: Diretório de saída (default: "output")
             debug: Modo debug (default: False)
             openrouter_api_key: Chave API do OpenRouter (opcional)
+            cache_dir: Diretório do cache das respostas da API da BDTD (opcional, fora de output_dir)
+            delta: Se True, preserva os resultados e o estado da coleta anterior em output_dir
+                e busca apenas os registros novos (default: False)
+            top_k: Se definido, apenas os top_k registros mais relevantes para o tema (BM25 sobre título,
+                assuntos e resumo) seguem para raspagem, download e extração de metadados (default: None)
+            dedupe: Se True, registros quase duplicados (mesmo trabalho em repositórios diferentes) são
+                reduzidos a um só antes da filtragem, evitando evidência duplicada na revisão (default: False)
         """
         self.theme = theme
         self.output_lang = output_lang
@@ -70,6 +81,10 @@ class BDTDReviewer:
         self.output_dir = output_dir
         self.debug = debug
         self.model = model
+        self.cache_dir = cache_dir
+        self.delta = delta
+        self.top_k = top_k
+        self.dedupe = dedupe
         
         # Configuração do OpenRouter
         self.openrouter_api_key = openrouter_api_key or os.getenv("OPENROUTER_API_KEY")
@@ -330,6 +345,22 @@ class BDTDReviewer:
         except Exception as e:
             raise Exception(f"Erro ao gerar revisão: {e}")
 
+    def _preserved_files(self) -> set:
+        """
+        Arquivos de output_dir mantidos na limpeza do início de run:
+        - o repositório de PDFs por conteúdo (.pdfstore), para que PDFs já baixados não sejam baixados de novo;
+        - os resultados e o checkpoint de uma coleta interrompida, para que ela seja retomada;
+        - no modo delta, os resultados (e o estado da coleta anterior, harvest_state_*).
+        
+        Returns:
+            set: Nomes dos arquivos e pastas preservados
+        """
+        preserved = {PDF_STORE_DIR}
+        checkpoint = "results.csv" + CHECKPOINT_SUFFIX
+        if self.delta or os.path.exists(os.path.join(self.output_dir, checkpoint)):
+            preserved.update({"results.csv", checkpoint})
+        return preserved
+
     def run(self) -> str:
         """
         Executa o processo completo de revisão sistemática.
@@ -347,8 +378,12 @@ class BDTDReviewer:
                 if self.debug:
                     print(f"    [DEBUG] Diretório '{self.output_dir}' criado.")
             else:
-                # Remove todos os arquivos e subdiretórios do diretório de saída
+                # Remove todos os arquivos e subdiretórios do diretório de saída, exceto os que
+                # devem sobreviver entre execuções (ver _preserved_files)
+                preserved = self._preserved_files()
                 for filename in os.listdir(self.output_dir):
+                    if filename in preserved or (self.delta and filename.startswith("harvest_state_")):
+                        continue
                     file_path = os.path.join(self.output_dir, filename)
                     try:
                         if os.path.isfile(file_path) or os.path.islink(file_path):
@@ -367,7 +402,11 @@ class BDTDReviewer:
                 subject=self.theme,
                 max_pages_limit=self.max_pages,
                 download_pdf=self.download_pdfs,
-                output_dir=self.output_dir
+                output_dir=self.output_dir,
+                cache_dir=self.cache_dir,
+                delta=self.delta,
+                top_k=self.top_k,
+                dedupe=self.dedupe
             )
             agent.scrape_text = self.scrape_text
             agent.run()
@@ -472,6 +511,28 @@ def parse_args():
         action="store_true",
         help="Ativar modo debug"
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Diretório do cache das respostas da API da BDTD (default: desativado)"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Buscar apenas registros novos desde a última execução (preserva os resultados anteriores)"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Processar apenas os K registros mais relevantes para o tema (default: todos os filtrados)"
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Remover registros quase duplicados antes da filtragem"
+    )
     parser.add_argument(
         "--model",
         type=str,
@@ -497,7 +558,11 @@ def main():
             scrape_text=args.scrape_text,
             output_dir=args.output_dir,
             debug=args.debug,
-            model=args.model
+            model=args.model,
+            cache_dir=args.cache_dir,
+            delta=args.delta,
+            top_k=args.top_k,
+            dedupe=args.dedupe
         )
         
         output_file = reviewer.run()
@@ -0,0 +1,235 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+
+def _meta_content(soup: BeautifulSoup, name: str) -> List[str]:
+    """
+    Retorna o conteúdo das tags <meta name="..."> com o nome informado (sem distinção de maiúsculas).
+    """
+    pattern = re.compile(f'^{re.escape(name)}$', re.I)
+    return [tag['content'].strip() for tag in soup.find_all('meta', attrs={'name': pattern, 'content': True})
+            if tag['content'].strip()]
+
+
+def _unique(urls: List[str]) -> List[str]:
+    return list(dict.fromkeys(urls))
+
+
+class RepositoryAdapter:
+    """
+    Adaptador de uma plataforma de repositório (DSpace, OJS...): reconhece as páginas da
+    plataforma e localiza diretamente a URL do texto completo, sem percorrer todos os links.
+
+    Subclasses definem name e sobrescrevem matches (identificação da plataforma pela página),
+    resolve (URLs do texto completo a partir da página) e, opcionalmente, resolve_url (URLs do
+    texto completo a partir apenas da URL, dispensando o acesso à página).
+    """
+
+    name = 'base'
+
+    def matches(self, soup: BeautifulSoup, url: str) -> bool:
+        """
+        Indica se a página pertence à plataforma do adaptador.
+
+        Args:
+            soup (BeautifulSoup): Página
+            url (str): URL final da página
+
+        Returns:
+            bool: True se o adaptador se aplica
+        """
+        return False
+
+    def resolve(self, soup: BeautifulSoup, url: str) -> List[str]:
+        """
+        Localiza as URLs do texto completo na página.
+
+        Args:
+            soup (BeautifulSoup): Página
+            url (str): URL final da página (base dos links relativos)
+
+        Returns:
+            List[str]: URLs dos PDFs (vazia se o adaptador não as encontrar)
+        """
+        return []
+
+    def resolve_url(self, url: str) -> List[str]:
+        """
+        Deduz as URLs do texto completo apenas pela URL da página, quando o padrão da plataforma permite.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            List[str]: URLs dos PDFs (vazia se não for possível)
+        """
+        return []
+
+
+class CitationMetaAdapter(RepositoryAdapter):
+    """
+    Metadados Highwire/Google Scholar (<meta name="citation_pdf_url">), publicados pela maioria
+    dos repositórios (DSpace, OJS, EPrints...).
+    """
+
+    name = 'citation_pdf_url'
+
+    def matches(self, soup: BeautifulSoup, url: str) -> bool:
+        return bool(_meta_content(soup, 'citation_pdf_url'))
+
+    def resolve(self, soup: BeautifulSoup, url: str) -> List[str]:
+        return _unique([urljoin(url, content) for content in _meta_content(soup, 'citation_pdf_url')])
+
+
+class DSpaceAdapter(RepositoryAdapter):
+    """
+    DSpace (até a versão 6: /handle/... e /bitstream/...; a partir da 7: /items/... e
+    /bitstreams/<uuid>/download). Os arquivos são os links de bitstream que indicam PDF.
+    """
+
+    name = 'dspace'
+
+    _BITSTREAM = re.compile(r'/bitstreams?/', re.I)
+
+    def matches(self, soup: BeautifulSoup, url: str) -> bool:
+        generators = _meta_content(soup, 'generator')
+        if any(generator.lower().startswith('dspace') for generator in generators):
+            return True
+        path = urlparse(url).path
+        return '/handle/' in path or '/items/' in path
+
+    def resolve(self, soup: BeautifulSoup, url: str) -> List[str]:
+        links = []
+        for link in soup.find_all('a', href=True):
+            href = urljoin(url, link['href'])
+            if not self._BITSTREAM.search(href):
+                continue
+            text = link.get_text(' ', strip=True).lower()
+            path = urlparse(href).path.lower()
+            if path.endswith('.pdf') or path.endswith('/download') or 'pdf' in text:
+                links.append(href)
+        return _unique(links)
+
+
+class OJSAdapter(RepositoryAdapter):
+    """
+    Open Journal Systems: a página do artigo (/article/view/<id>) lista as "galleys"
+    (/article/view/<id>/<galley>); o PDF de uma galley está em /article/download/<id>/<galley>.
+    """
+
+    name = 'ojs'
+
+    _GALLEY = re.compile(r'/article/view/(\d+)/(\d+)/?$')
+
+    def matches(self, soup: BeautifulSoup, url: str) -> bool:
+        generators = _meta_content(soup, 'generator')
+        if any('open journal systems' in generator.lower() for generator in generators):
+            return True
+        return '/article/view/' in urlparse(url).path
+
+    def _download_url(self, url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        match = self._GALLEY.search(parsed.path)
+        if not match:
+            return None
+        path = parsed.path[:match.start()] + f'/article/download/{match.group(1)}/{match.group(2)}'
+        return parsed._replace(path=path, query='', fragment='').geturl()
+
+    def resolve(self, soup: BeautifulSoup, url: str) -> List[str]:
+        links = []
+        for link in soup.find_all('a', href=True):
+            classes = ' '.join(link.get('class', [])).lower()
+            text = link.get_text(' ', strip=True).lower()
+            if 'pdf' not in classes and 'pdf' not in text:
+                continue
+            download = self._download_url(urljoin(url, link['href']))
+            if download:
+                links.append(download)
+        return _unique(links)
+
+    def resolve_url(self, url: str) -> List[str]:
+        download = self._download_url(url)
+        return [download] if download else []
+
+
+class AdapterRegistry:
+    """
+    Registro dos adaptadores de repositório. Adaptadores associados a um host são consultados
+    primeiro; em seguida, os adaptadores gerais, na ordem de registro, identificam a plataforma
+    pela própria página. Se nenhum adaptador localizar o texto completo, ou se os links indicados
+    não levarem a um PDF válido, o downloader usa a busca heurística de links (PDFLinkFinder.find_pdf_links).
+    """
+
+    def __init__(self, adapters: Optional[List[RepositoryAdapter]] = None):
+        """
+        Args:
+            adapters (Optional[List[RepositoryAdapter]]): Adaptadores gerais, em ordem de prioridade
+        """
+        self.adapters: List[RepositoryAdapter] = list(adapters or [])
+        self.host_adapters: Dict[str, List[RepositoryAdapter]] = {}
+
+    def register(self, adapter: RepositoryAdapter, hosts: Tuple[str, ...] = ()):
+        """
+        Registra um adaptador.
+
+        Args:
+            adapter (RepositoryAdapter): Adaptador
+            hosts (Tuple[str, ...]): Hosts em que o adaptador se aplica sem verificar a página
+                (ex.: ("repositorio.ufsc.br",)). Se vazio, o adaptador é geral.
+        """
+        if not hosts:
+            self.adapters.append(adapter)
+        for host in hosts:
+            self.host_adapters.setdefault(host.lower(), []).append(adapter)
+
+    def _candidates(self, url: str, soup: Optional[BeautifulSoup]) -> List[RepositoryAdapter]:
+        candidates = list(self.host_adapters.get(urlparse(url).netloc.lower(), []))
+        if soup is not None:
+            candidates += [adapter for adapter in self.adapters if adapter.matches(soup, url)]
+        return candidates
+
+    def resolve(self, soup: BeautifulSoup, url: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Localiza as URLs do texto completo de uma página com o primeiro adaptador que as encontrar.
+
+        Args:
+            soup (BeautifulSoup): Página
+            url (str): URL final da página
+
+        Returns:
+            Tuple[Optional[str], List[str]]: (nome do adaptador, URLs dos PDFs); (None, []) se nenhum se aplicar
+        """
+        for adapter in self._candidates(url, soup):
+            links = adapter.resolve(soup, url)
+            if links:
+                return adapter.name, links
+        return None, []
+
+    def resolve_url(self, url: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Deduz as URLs do texto completo apenas pela URL da página (sem acessá-la).
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            Tuple[Optional[str], List[str]]: (nome do adaptador, URLs dos PDFs); (None, []) se nenhum se aplicar
+        """
+        for adapter in list(self.host_adapters.get(urlparse(url).netloc.lower(), [])) + self.adapters:
+            links = adapter.resolve_url(url)
+            if links:
+                return adapter.name, links
+        return None, []
+
+
+def default_registry() -> AdapterRegistry:
+    """
+    Cria um registro com os adaptadores padrão: metadados citation_pdf_url, DSpace e OJS.
+
+    Returns:
+        AdapterRegistry: Registro de adaptadores
+    """
+    return AdapterRegistry([CitationMetaAdapter(), DSpaceAdapter(), OJSAdapter()])
@@ -0,0 +1,484 @@
+import os
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+from BDTDdownloader import (
+    PDFLinkFinder, PDFStreamValidator, InvalidPDFError,
+    MIN_PDF_SIZE, MAX_PDF_SIZE, PROBE_BYTES, CHUNK_SIZE, WRITE_BUFFER_SIZE
+)
+from BDTDadapters import default_registry
+from BDTDhttp import DEFAULT_TIMEOUT, DEFAULT_USER_AGENT, _accept_encoding
+
+try:
+    import aiohttp
+    import aiofiles
+except ImportError:
+    aiohttp = None
+    aiofiles = None
+
+
+def _require_async_deps():
+    if aiohttp is None or aiofiles is None:
+        raise ImportError("O downloader assíncrono requer os pacotes 'aiohttp' e 'aiofiles' (pip install .[async])")
+
+
+# Downloads em andamento por arquivo parcial (ver BDTDdownloader.partial_lock)
+_partial_locks = {}
+
+
+@asynccontextmanager
+async def partial_lock(partial_path: str):
+    """
+    Garante acesso exclusivo (entre tarefas do event loop) ao arquivo parcial de um download.
+    """
+    entry = _partial_locks.setdefault(partial_path, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _partial_locks[partial_path]
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Indica se o erro é temporário (conexão interrompida, timeout, resposta truncada ou erro
+    5xx/429) e, portanto, vale uma nova tentativa (ver BDTDCrawler.is_transient_error).
+
+    Args:
+        error (Exception): Erro da requisição
+
+    Returns:
+        bool: True se o download deve ser retomado
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+def create_session(
+    max_connections: int = 100,
+    per_host: int = 2,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT
+) -> 'aiohttp.ClientSession':
+    """
+    Cria a sessão aiohttp compartilhada pelos downloads, com limite global e por host de conexões
+    simultâneas e os mesmos cabeçalhos e timeouts do HTTPClient. Deve ser chamada dentro do event loop.
+
+    Args:
+        max_connections (int): Número total de conexões simultâneas
+        per_host (int): Número máximo de conexões simultâneas por host
+        timeout (float | tuple): Timeout (conexão, leitura) em segundos
+
+    Returns:
+        aiohttp.ClientSession: Sessão HTTP assíncrona
+    """
+    _require_async_deps()
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=max_connections, limit_per_host=per_host),
+        timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+        headers={'User-Agent': DEFAULT_USER_AGENT, 'Accept-Encoding': _accept_encoding()}
+    )
+
+
+class AsyncPDFDownloader(PDFLinkFinder):
+    """
+    Versão assíncrona (aiohttp/aiofiles) do PDFDownloader, com a mesma semântica de
+    get_page_content, download_pdf, find_pdf_links e process_page.
+
+    Várias instâncias (uma por pasta de destino) podem compartilhar a mesma sessão, de modo que
+    milhares de páginas e PDFs fiquem em andamento em um único processo, limitados apenas pelas
+    conexões da sessão. O cancelamento é cooperativo: uma tarefa cancelada interrompe a
+    requisição em andamento, mas mantém o arquivo parcial ('.part') e seus dados de retomada
+    ('.part.json'), de modo que o download seja retomado com Range/If-Range na próxima tentativa.
+    """
+
+    def __init__(self, output_dir: str = "downloads", session: Optional['aiohttp.ClientSession'] = None,
+                 chunk_size: int = CHUNK_SIZE, probe: bool = True, min_size: int = MIN_PDF_SIZE,
+                 max_size: Optional[int] = MAX_PDF_SIZE, store=None, retries: int = 3, backoff: float = 1.0,
+                 adapters=None, rules=None, parser: Optional[str] = None, full_parse: bool = False,
+                 **session_kwargs):
+        """
+        Inicializa o downloader.
+
+        Args:
+            output_dir (str): Diretório onde os PDFs serão salvos.
+            session (aiohttp.ClientSession, optional): Sessão compartilhada (ver create_session). Se None,
+                a sessão é criada no primeiro uso e fechada por close() ou ao sair do 'async with'.
+            chunk_size (int): Tamanho dos blocos lidos e gravados durante o download.
+            probe (bool): Se True, process_page sonda cada link candidato (ver probe) e baixa apenas os PDFs reais.
+            min_size (int): Tamanho mínimo (em bytes) de um PDF aceito.
+            max_size (int, optional): Tamanho máximo (em bytes) de um PDF aceito; None desativa o limite.
+            store (PDFStore, optional): Repositório endereçado por conteúdo (ver PDFDownloader).
+            retries (int): Novas tentativas de um download após erros temporários, continuando o arquivo parcial.
+            backoff (float): Espera inicial (em segundos) entre tentativas, dobrada a cada nova falha.
+            adapters (AdapterRegistry, optional): Adaptadores de repositório (ver PDFDownloader).
+            rules (LinkRules, optional): Regras aprendidas por host (ver PDFDownloader).
+            parser (str, optional): Backend do BeautifulSoup (ver PDFDownloader).
+            full_parse (bool): Se True, constrói a árvore completa das páginas (ver PDFDownloader).
+            **session_kwargs: Parâmetros de create_session usados quando a sessão é criada aqui.
+        """
+        _require_async_deps()
+        self.output_dir = output_dir
+        self.session = session
+        self.chunk_size = chunk_size
+        self.probe_links = probe
+        self.min_size = min_size
+        self.max_size = max_size
+        self.store = store
+        self.retries = retries
+        self.adapters = adapters if adapters is not None else default_registry()
+        self.rules = rules
+        self.parser = parser
+        self.full_parse = full_parse
+        self.backoff = backoff
+        self._session_kwargs = session_kwargs
+        self._owns_session = session is None
+
+        # Cria o diretório de saída se não existir
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+
+    async def __aenter__(self) -> 'AsyncPDFDownloader':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Fecha a sessão, se ela foi criada por este downloader.
+        """
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get(self, url: str, **kwargs):
+        if self.session is None:
+            self.session = create_session(**self._session_kwargs)
+        return self.session.get(url, allow_redirects=True, **kwargs)
+
+    async def _parse(self, html: str) -> BeautifulSoup:
+        # A análise do HTML é feita fora do event loop para não bloquear os demais downloads
+        return await asyncio.get_running_loop().run_in_executor(None, self.parse_page, html)
+
+    async def save_response(self, response: 'aiohttp.ClientResponse', filename: str = None,
+                            partial_path: str = None, offset: int = 0) -> str:
+        """
+        Grava em disco, de forma assíncrona, o corpo de uma resposta, validando-o durante a
+        transferência e renomeando o arquivo parcial ao final (ver PDFDownloader.save_response).
+        Um conteúdo inválido é descartado; após uma falha de conexão ou um cancelamento o parcial
+        é mantido para ser continuado.
+
+        Args:
+            response (aiohttp.ClientResponse): Resposta aberta
+            filename (str, optional): Nome do arquivo para salvar. Se None, usa 'Content-Disposition' ou a URL.
+            partial_path (str, optional): Arquivo parcial. Se None, usa o da URL final (ver resume_path).
+            offset (int): Bytes já gravados no parcial, quando a resposta continua um download.
+
+        Returns:
+            str: Caminho do arquivo gravado
+
+        Raises:
+            InvalidPDFError: Se o conteúdo não for um PDF ou o tamanho estiver fora dos limites
+            aiohttp.ClientError: Se a conexão falhar ou a transferência ficar incompleta
+        """
+        reason = self.probe_verdict(response.status, response.headers)
+        if reason:
+            raise InvalidPDFError(reason)
+
+        filepath = os.path.join(self.output_dir, filename or self.response_filename(response.headers, str(response.url)))
+        partial_path = partial_path or self.resume_path(str(response.url))
+        offset = self.start_partial(partial_path, response.status, response.headers, offset)
+        validator = PDFStreamValidator(self.min_size, self.max_size)
+        sha256 = hashlib.sha256()
+        try:
+            if offset:
+                # Os bytes já recebidos entram na validação e no SHA-256
+                async with aiofiles.open(partial_path, 'rb') as f:
+                    while True:
+                        chunk = await f.read(WRITE_BUFFER_SIZE)
+                        if not chunk:
+                            break
+                        validator.feed(chunk)
+                        sha256.update(chunk)
+            async with aiofiles.open(partial_path, 'ab' if offset else 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    validator.feed(chunk)
+                    sha256.update(chunk)
+                    await f.write(chunk)
+            total = self.response_size(response.status, response.headers)
+            if total is not None and validator.size < total:
+                raise aiohttp.ClientPayloadError(f"transferência incompleta ({validator.size} de {total} bytes)")
+            validator.finish()
+            urls = [str(r.url) for r in response.history] + [str(response.url)]
+            filepath = self.finish_download(partial_path, filepath, sha256.hexdigest(), urls)
+        except InvalidPDFError:
+            self.discard_partial(partial_path)
+            raise
+        return filepath
+
+    async def probe(self, url: str) -> str:
+        """
+        Sonda um link candidato antes do download com um GET apenas dos primeiros bytes
+        (ver PDFDownloader.probe).
+        
+        Args:
+            url (str): URL candidata
+            
+        Returns:
+            str: URL final do PDF, ou '' se o link não levar a um PDF aceitável
+        """
+        try:
+            async with self._get(url, headers={'Range': f'bytes=0-{PROBE_BYTES - 1}'}) as response:
+                response.raise_for_status()
+                if response.status == 206:
+                    # Apenas os bytes pedidos: lidos por inteiro, a conexão volta ao pool
+                    head = await response.read()
+                else:
+                    # Servidores que ignoram o Range respondem 200 com o arquivo inteiro: lê só o início
+                    head = b''
+                    while len(head) < PROBE_BYTES:
+                        chunk = await response.content.read(PROBE_BYTES - len(head))
+                        if not chunk:
+                            break
+                        head += chunk
+                    response.close()
+                reason = self.probe_verdict(response.status, response.headers, head)
+                final_url = str(response.url)
+        except asyncio.TimeoutError:
+            print(f"Tempo excedido ao sondar {url}. Pulando...")
+            return ""
+        except aiohttp.ClientError as e:
+            print(f"Erro ao sondar {url}: {e}")
+            return ""
+        
+        if reason:
+            print(f"Ignorando {url}: {reason}")
+            return ""
+        return final_url
+    
+    async def get_page_content(self, url: str) -> tuple:
+        """
+        Obtém o conteúdo HTML da página e retorna um objeto BeautifulSoup e a URL final.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            tuple: (BeautifulSoup ou None, URL final)
+        """
+        try:
+            async with self._get(url) as response:
+                response.raise_for_status()
+                final_url = str(response.url)
+                # Se a resposta for um PDF, retorna None e a URL (o corpo não é lido)
+                if self.is_pdf_response(response):
+                    return None, final_url
+                html = await response.text(errors='replace')
+        except asyncio.TimeoutError:
+            print(f"Tempo excedido ao acessar {url}. Pulando página...")
+            return None, url
+        except aiohttp.ClientError as e:
+            print(f"Erro ao acessar a página: {e}")
+            return None, url
+        return await self._parse(html), final_url
+
+    async def download_pdf(self, url: str, filename: str = None) -> str:
+        """
+        Baixa um arquivo PDF, seguindo os redirecionamentos na mesma requisição e descartando
+        conteúdos inválidos (ver save_response). Após erros temporários, até self.retries novas
+        tentativas continuam o arquivo parcial com uma requisição Range.
+
+        Args:
+            url (str): URL do arquivo
+            filename (str, optional): Nome do arquivo para salvar. Se None, usa 'Content-Disposition' ou a URL.
+
+        Returns:
+            str: Caminho do arquivo baixado ("" em caso de falha)
+        """
+        stored = self.stored_files(url)
+        if stored:
+            return stored[0]
+
+        partial_path = self.resume_path(url)
+        async with partial_lock(partial_path):
+            # Outro download da mesma URL pode ter terminado durante a espera
+            stored = self.stored_files(url)
+            if stored:
+                return stored[0]
+
+            for attempt in range(self.retries + 1):
+                offset, headers = self.resume_request(partial_path)
+                try:
+                    async with self._get(url, headers=headers) as response:
+                        response.raise_for_status()
+                        return await self.save_response(response, filename, partial_path, offset)
+                except InvalidPDFError as e:
+                    print(f"Descartando {url}: {e}")
+                    return ""
+                except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                    if offset and isinstance(e, aiohttp.ClientResponseError) and e.status == 416:
+                        # Intervalo recusado: o parcial não corresponde ao arquivo atual e é descartado
+                        self.discard_partial(partial_path)
+                        continue
+                    if attempt == self.retries or not is_transient_error(e):
+                        if isinstance(e, asyncio.TimeoutError):
+                            print(f"Tempo excedido para download de {url}. Pulando este arquivo...")
+                        else:
+                            print(f"Erro ao baixar o PDF: {e}")
+                        return ""
+                    received = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+                    delay = self.backoff * 2 ** attempt
+                    print(f"Download de {url} interrompido ({received} bytes recebidos: {e!r}). "
+                          f"Retomando em {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+            return ""
+
+    async def process_page(self, url: str) -> list:
+        """
+        Processa uma página web para encontrar e baixar PDFs. Os PDFs encontrados na página
+        são baixados concorrentemente.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            list: Lista de caminhos dos arquivos baixados
+        """
+        print(f"Processando página: {url}")
+
+        # Página (ou PDF) já baixada em outro registro ou execução
+        stored = self.stored_files(url)
+        if stored:
+            print(f"Já baixado (repositório local): {url}")
+            return stored
+
+        # Adaptador ou modelo de URL aprendido que deduz o PDF pela URL: a página não precisa ser acessada.
+        # Se nenhum desses links levar a um PDF, a página é acessada e os demais métodos são tentados.
+        tried = set()
+        rule = None
+        direct_links = self.resolve_page_url(url)
+        if not direct_links:
+            rule, direct_links = self.learned_page_url(url)
+        if direct_links:
+            paths = await asyncio.gather(*(self.download_pdf(pdf_url) for pdf_url in direct_links))
+            pdf_urls = [pdf_url for pdf_url, path in zip(direct_links, paths) if path]
+            if pdf_urls:
+                self.learn_links(url, url, None, pdf_urls)
+                self.remember_page([url], pdf_urls)
+                return list(dict.fromkeys(path for path in paths if path))
+            self.rule_failed(rule)
+            tried.update(direct_links)
+            print(f"Nenhum PDF válido nos links deduzidos da URL; acessando a página {url}")
+
+        # Uma única requisição: os cabeçalhos decidem se a resposta é o próprio PDF ou uma página
+        is_pdf = False
+        try:
+            async with self._get(url) as response:
+                response.raise_for_status()
+                final_url = str(response.url)
+                is_pdf = self.is_pdf_response(response)
+                if is_pdf:
+                    partial_path = self.resume_path(final_url)
+                    try:
+                        async with partial_lock(partial_path):
+                            return [await self.save_response(response, partial_path=partial_path)]
+                    except InvalidPDFError as e:
+                        print(f"Descartando {final_url}: {e}")
+                        return []
+                html = await response.text(errors='replace')
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            if is_pdf and is_transient_error(e):
+                # Conexão interrompida durante o PDF: download_pdf continua o arquivo parcial
+                print(f"Download de {final_url} interrompido ({e!r}). Retomando...")
+                path = await self.download_pdf(final_url)
+                return [path] if path else []
+            if is_pdf:
+                print(f"Erro ao baixar o PDF: {e}")
+            elif isinstance(e, asyncio.TimeoutError):
+                print(f"Tempo excedido ao acessar {url}. Pulando página...")
+            else:
+                print(f"Erro ao acessar a página: {e}")
+            return []
+
+        # Encontra links para PDFs: primeiro pelas regras aprendidas para o host; se nenhuma se
+        # aplicar (ou a regra não levar a um PDF), pelos adaptadores de repositório ou pela busca heurística
+        soup = await self._parse(html)
+        rule, pdf_links = self.learned_links(soup, final_url)
+        pdf_links = [link for link in pdf_links if link not in tried]
+        if pdf_links:
+            files, found_links, pdf_urls = await self.download_links(pdf_links, probe=False)
+            if pdf_urls:
+                self.learn_links(url, final_url, soup, found_links)
+                self.remember_page([url, final_url], pdf_urls)
+                return files
+            self.rule_failed(rule)
+            tried.update(pdf_links)
+
+        pdf_links, from_adapter = self.resolve_pdf_links(soup, final_url)
+        pdf_links = [link for link in pdf_links if link not in tried]
+
+        # Com a sondagem, apenas os links que levam a PDFs reais (e distintos) são baixados;
+        # os apontados por um adaptador dispensam a sondagem
+        files, found_links, pdf_urls = await self.download_links(pdf_links, probe=self.probe_links and not from_adapter)
+        tried.update(pdf_links)
+
+        # Adaptador sem resultado (indicação errada ou desatualizada): recorre à busca heurística
+        if from_adapter and not pdf_urls:
+            print(f"Nenhum PDF válido nos links do adaptador; usando a busca heurística em {final_url}")
+            pdf_links = [link for link in self.find_pdf_links(soup, final_url) if link not in tried]
+            files, found_links, pdf_urls = await self.download_links(pdf_links, probe=self.probe_links)
+            tried.update(pdf_links)
+
+        if not tried:
+            print("Nenhum PDF encontrado na página.")
+
+        self.learn_links(url, final_url, soup, found_links)
+        self.remember_page([url, final_url], pdf_urls)
+        return files
+
+    async def download_links(self, pdf_links: list, probe: bool) -> Tuple[list, list, list]:
+        """
+        Baixa concorrentemente os links candidatos de uma página.
+
+        Args:
+            pdf_links (list): Links candidatos
+            probe (bool): Se True, sonda cada link e baixa apenas os PDFs reais (e distintos)
+
+        Returns:
+            Tuple[list, list, list]: (caminhos dos arquivos, links que levaram a PDFs,
+                URLs efetivamente baixadas após a sondagem)
+        """
+        # Links já baixados dispensam a sondagem e o download
+        stored = {link: self.stored_files(link) for link in pdf_links}
+        pending = [(link, link) for link in pdf_links if not stored[link]]
+
+        if probe:
+            probed = await asyncio.gather(*(self.probe(link) for link, _ in pending))
+            # Links diferentes podem levar (após os redirecionamentos) ao mesmo arquivo
+            distinct = {}
+            for (link, _), pdf_url in zip(pending, probed):
+                if pdf_url and pdf_url not in distinct:
+                    distinct[pdf_url] = link
+            pending = [(link, pdf_url) for pdf_url, link in distinct.items()]
+
+        for _, pdf_url in pending:
+            print(f"Tentando baixar PDF: {pdf_url}")
+        paths = await asyncio.gather(*(self.download_pdf(pdf_url) for _, pdf_url in pending))
+
+        found_links = [link for link in pdf_links if stored[link]]
+        pdf_urls = list(found_links)
+        for (link, pdf_url), path in zip(pending, paths):
+            if path:
+                found_links.append(link)
+                pdf_urls.append(pdf_url)
+        files = [path for found in stored.values() for path in found] + [path for path in paths if path]
+        return list(dict.fromkeys(files)), found_links, pdf_urls
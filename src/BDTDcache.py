@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import urllib.parse
+from typing import Dict, Optional
+
+# Diretório padrão do cache, fora do output_dir (que é apagado a cada execução pelas UIs)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bdtdfinder")
+
+
+class ResponseCache:
+    """
+    Cache persistente em disco para respostas JSON da API de busca da BDTD.
+
+    Cada entrada é um arquivo JSON identificado pelo hash da URL normalizada, contendo o corpo
+    da resposta e os validadores HTTP (ETag/Last-Modified). Entradas dentro do TTL são servidas
+    sem acesso à rede; entradas expiradas são revalidadas com uma requisição condicional.
+    Quando o tamanho total ultrapassa max_bytes, as entradas usadas há mais tempo são removidas (LRU).
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttl: float = 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir (str): Diretório onde as entradas são gravadas
+            ttl (float): Tempo (em segundos) durante o qual uma entrada é considerada válida
+            max_bytes (int): Tamanho máximo total do cache em bytes
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normaliza a URL de consulta para que a mesma busca gere sempre a mesma chave,
+        independentemente da ordem dos parâmetros.
+
+        Args:
+            url (str): URL de consulta
+
+        Returns:
+            str: URL normalizada
+        """
+        parts = urllib.parse.urlsplit(url)
+        query = sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+        return urllib.parse.urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path,
+            urllib.parse.urlencode(query),
+            ''
+        ))
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(self.normalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _entries(self):
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Retorna a entrada armazenada para a URL, fresca ou expirada.
+
+        Args:
+            url (str): URL de consulta
+
+        Returns:
+            Optional[Dict]: Entrada com as chaves 'body', 'etag', 'last_modified' e 'stored_at', ou None
+        """
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Atualiza o mtime, usado como horário do último acesso na política LRU
+            os.utime(path, None)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """
+        Verifica se a entrada ainda está dentro do TTL.
+
+        Args:
+            entry (Dict): Entrada retornada por get
+
+        Returns:
+            bool: True se a entrada pode ser usada sem revalidação
+        """
+        return time.time() - entry.get('stored_at', 0) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        Monta os cabeçalhos de uma requisição condicional a partir dos validadores da entrada.
+
+        Args:
+            entry (Optional[Dict]): Entrada retornada por get
+
+        Returns:
+            Dict[str, str]: Cabeçalhos If-None-Match/If-Modified-Since (vazio se não houver validadores)
+        """
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def set(self, url: str, body: Dict, headers: Optional[Dict] = None):
+        """
+        Armazena a resposta da URL, substituindo a entrada anterior.
+
+        Args:
+            url (str): URL de consulta
+            body (Dict): Corpo JSON da resposta
+            headers (Optional[Dict]): Cabeçalhos da resposta (para extrair ETag/Last-Modified)
+        """
+        headers = headers or {}
+        entry = {
+            'url': self.normalize_url(url),
+            'stored_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'body': body
+        }
+        self._write(self._path(url), entry)
+
+    def touch(self, url: str, entry: Dict):
+        """
+        Renova o TTL de uma entrada revalidada pelo servidor (resposta 304).
+
+        Args:
+            url (str): URL de consulta
+            entry (Dict): Entrada retornada por get
+        """
+        entry = dict(entry, stored_at=time.time())
+        self._write(self._path(url), entry)
+
+    def _write(self, path: str, entry: Dict):
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        # Grava em arquivo temporário e renomeia, para que leituras concorrentes nunca vejam um JSON parcial
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """
+        Remove as entradas usadas há mais tempo até que o cache volte a caber em max_bytes.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    def clear(self):
+        """
+        Remove todas as entradas do cache.
+        """
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            self._total_bytes = 0
@@ -0,0 +1,210 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from BDTDtext import fold_series, text_series
+
+# Tamanho (em bytes) dos n-gramas da chave: cada n-grama de 4 bytes já é um inteiro de 32 bits
+SHINGLE_SIZE = 4
+
+
+class UnionFind:
+    """
+    Estrutura union-find (com compressão de caminho) para agrupar registros duplicados.
+    """
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class MinHashDeduplicator:
+    """
+    Detecta registros quase duplicados (o mesmo trabalho com ids diferentes ou títulos com
+    pequenas variações) por MinHash com LSH em bandas.
+
+    Cada registro é reduzido a uma chave normalizada (título + autores + ano), dividida em
+    n-gramas de caracteres. As assinaturas MinHash estimam a similaridade de Jaccard entre as
+    chaves; o LSH compara apenas registros que coincidem em ao menos uma banda da assinatura,
+    evitando a comparação de todos os pares. Os pares confirmados são agrupados (union-find)
+    e um registro canônico é mantido por grupo.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.8,
+        seed: int = 42
+    ):
+        """
+        Inicializa o deduplicador.
+
+        Args:
+            num_perm (int): Número de permutações (tamanho da assinatura MinHash)
+            bands (int): Número de bandas do LSH (num_perm deve ser múltiplo de bands)
+            threshold (float): Similaridade de Jaccard estimada mínima para considerar dois registros duplicados
+            seed (int): Semente das permutações (assinaturas reprodutíveis)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm deve ser múltiplo de bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        # Permutações de 32 bits: (a * x + b) mod 2^32, com a ímpar (bijeção no espaço de 32 bits).
+        # A aritmética em uint32 (com estouro intencional) usa metade da memória de uint64.
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint32) * np.uint32(2) + np.uint32(1)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint32)
+
+    @staticmethod
+    def record_keys(df: pd.DataFrame) -> List[str]:
+        """
+        Monta a chave normalizada de cada registro: título, palavras dos autores principais
+        (em ordem alfabética, para que "Silva, João" e "João Silva" coincidam) e ano de publicação,
+        sem acentos, maiúsculas ou pontuação.
+
+        Args:
+            df (pd.DataFrame): Tabela de registros
+
+        Returns:
+            List[str]: Chave de cada linha (vazia para registros sem título)
+        """
+        empty = pd.Series('', index=df.index)
+        titles = fold_series(df['title']) if 'title' in df.columns else empty
+        titles = titles.str.replace(r'[\W_]+', ' ', regex=True).str.strip()
+        authors = fold_series(df['primary_authors']) if 'primary_authors' in df.columns else empty
+        authors = authors.str.replace(r'[\W_]+', ' ', regex=True).str.split().map(sorted).str.join(' ')
+        years = (
+            text_series(df['publication_dates']).str.extract(r'(\d{4})', expand=False).fillna('')
+            if 'publication_dates' in df.columns else empty
+        )
+        keys = (titles + ' ' + authors + ' ' + years).str.strip()
+        return [key if title else '' for key, title in zip(keys, titles)]
+
+    def signatures(self, keys: List[str], chunk_size: int = 1000) -> np.ndarray:
+        """
+        Calcula as assinaturas MinHash das chaves.
+
+        Os bytes das chaves de um bloco de registros são concatenados e cada janela de 4 bytes
+        (n-grama) é lida diretamente como um inteiro. Todos os n-gramas do bloco passam de uma
+        vez pelas num_perm funções de hash, e o mínimo por registro é obtido com np.minimum.reduceat.
+        Registros sem chave ficam com a assinatura vazia (valor máximo) e não são agrupados.
+
+        Args:
+            keys (List[str]): Chaves normalizadas (ver record_keys)
+            chunk_size (int): Registros processados por bloco (limita o uso de memória)
+
+        Returns:
+            np.ndarray: Matriz (registros x num_perm) de assinaturas
+        """
+        signatures = np.full((len(keys), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(keys), chunk_size):
+            rows = np.array([i for i in range(start, min(start + chunk_size, len(keys))) if keys[i]], dtype=int)
+            if not len(rows):
+                continue
+            # Chaves menores que um n-grama são completadas com espaços
+            encoded = [keys[i].encode('utf-8').ljust(SHINGLE_SIZE) for i in rows]
+            lengths = np.array([len(e) for e in encoded])
+            data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint32)
+
+            windows = data[:-3] | data[1:-2] << np.uint32(8) | data[2:-1] << np.uint32(16) | data[3:] << np.uint32(24)
+            # Descarta as janelas que atravessam o fim de uma chave
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            owner = np.repeat(np.arange(len(rows)), lengths)[:len(windows)]
+            valid = np.arange(len(windows)) - offsets[owner] <= lengths[owner] - SHINGLE_SIZE
+            shingles = windows[valid]
+
+            hashed = self._a[:, None] * shingles[None, :]
+            hashed += self._b[:, None]
+            starts = np.concatenate(([0], np.cumsum(lengths - SHINGLE_SIZE + 1)[:-1]))
+            signatures[rows] = np.minimum.reduceat(hashed, starts, axis=1).T
+        return signatures
+
+    def _similar(self, signatures: np.ndarray, i: int, j: int) -> bool:
+        return np.mean(signatures[i] == signatures[j]) >= self.threshold
+
+    def clusters(self, df: pd.DataFrame) -> List[List[int]]:
+        """
+        Agrupa os registros quase duplicados.
+
+        Args:
+            df (pd.DataFrame): Tabela de registros
+
+        Returns:
+            List[List[int]]: Grupos com mais de um registro (posições das linhas em df)
+        """
+        keys = self.record_keys(df)
+        signatures = self.signatures(keys)
+        valid = np.flatnonzero([bool(key) for key in keys])
+        groups = UnionFind(len(keys))
+
+        for band in range(self.bands):
+            chunk = np.ascontiguousarray(signatures[valid, band * self.rows:(band + 1) * self.rows])
+            buckets = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * self.rows))).ravel()
+            _, inverse, counts = np.unique(buckets, return_inverse=True, return_counts=True)
+            # Apenas os baldes com mais de um registro geram pares candidatos
+            shared = np.flatnonzero(counts[inverse] > 1)
+            if not len(shared):
+                continue
+            shared = shared[np.argsort(inverse[shared], kind='stable')]
+            bounds = np.flatnonzero(np.diff(inverse[shared])) + 1
+            for bucket in np.split(valid[shared], bounds):
+                # Cada registro é ligado ao primeiro registro já visto do balde que lhe seja similar
+                seen = [bucket[0]]
+                for item in bucket[1:]:
+                    for other in seen:
+                        if groups.find(item) == groups.find(other) or self._similar(signatures, item, other):
+                            groups.union(item, other)
+                            break
+                    else:
+                        seen.append(item)
+
+        members: Dict[int, List[int]] = {}
+        for i in range(len(keys)):
+            members.setdefault(groups.find(i), []).append(i)
+        return [group for group in members.values() if len(group) > 1]
+
+    def deduplicate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Mantém um registro canônico por grupo de duplicatas: o mais completo (mais campos
+        preenchidos), ou o primeiro em caso de empate. A coluna 'duplicate_ids' lista os ids
+        descartados em favor de cada registro canônico (os registros com 'duplicate_ids'
+        preenchido são os grupos de duplicatas encontrados).
+
+        Args:
+            df (pd.DataFrame): Tabela de registros
+
+        Returns:
+            pd.DataFrame: Registros sem duplicatas, na ordem original
+        """
+        df = df.reset_index(drop=True)
+        filled = sum((text_series(df[column]).str.len() > 0).to_numpy(dtype=int) for column in df.columns)
+        ids = text_series(df['id']) if 'id' in df.columns else pd.Series(df.index.astype(str))
+
+        keep = np.ones(len(df), dtype=bool)
+        duplicate_ids = [''] * len(df)
+        clusters = self.clusters(df)
+        for group in clusters:
+            canonical = max(group, key=lambda i: (filled[i], -i))
+            for i in group:
+                if i != canonical:
+                    keep[i] = False
+            duplicate_ids[canonical] = '; '.join(ids[i] for i in group if i != canonical)
+
+        return df.assign(duplicate_ids=duplicate_ids)[keep].reset_index(drop=True)
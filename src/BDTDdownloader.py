@@ -1,83 +1,129 @@
 import requests
 from bs4 import BeautifulSoup
 import os
-from urllib.parse import urljoin, urlparse
+import json
 import time
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterable, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urljoin, urlparse
 import re
 
-class PDFDownloader:
+from BDTDhttp import get_client
+from BDTDadapters import AdapterRegistry, default_registry
+from BDTDrules import LinkRule, LinkRules
+from BDTDparse import LINK_TAGS, parse_html
+from BDTDfinder import BDTDCrawler
+from BDTDharvest import write_json
+
+# Tamanho mínimo (em bytes) de um PDF aceito: arquivos menores costumam ser capas,
+# miniaturas ou páginas de erro
+MIN_PDF_SIZE = 100_000
+
+# Tamanho máximo (em bytes) de um PDF aceito: downloads maiores são interrompidos
+MAX_PDF_SIZE = 200_000_000
+
+# Bytes lidos pela sondagem (GET com Range) para localizar a assinatura do PDF
+PROBE_BYTES = 1024
+PDF_MAGIC = b'%PDF'
+
+# Tamanho dos blocos lidos da rede (o que já chegou de um bloco se perde se a conexão cair)
+# e do buffer de escrita em disco
+CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+PARTIAL_SUFFIX = '.part'
+
+# Downloads em andamento por arquivo parcial: dois downloads da mesma URL não gravam o mesmo '.part'
+_partial_locks = {}
+_partial_locks_guard = threading.Lock()
+
+
+@contextmanager
+def partial_lock(partial_path: str):
     """
-    Classe para localizar e baixar PDFs de páginas web, com suporte a redirecionamentos e timeout.
+    Garante acesso exclusivo (entre threads) ao arquivo parcial de um download.
+    """
+    with _partial_locks_guard:
+        entry = _partial_locks.setdefault(partial_path, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _partial_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _partial_locks[partial_path]
+
+
+class InvalidPDFError(Exception):
+    """
+    Conteúdo recusado durante o download (assinatura ausente ou tamanho fora dos limites).
+    """
+
+
+class PDFStreamValidator:
+    """
+    Valida um PDF à medida que os blocos chegam: a assinatura '%PDF' nos primeiros bytes e o
+    tamanho entre os limites. Uma falha levanta InvalidPDFError imediatamente, para que o
+    download seja interrompido sem ler (nem gravar) o restante.
     """
     
-    def __init__(self, output_dir="downloads", timeout=60):
+    def __init__(self, min_size: int = MIN_PDF_SIZE, max_size: Optional[int] = MAX_PDF_SIZE):
         """
-        Inicializa o downloader.
-        
         Args:
-            output_dir (str): Diretório onde os PDFs serão salvos.
-            timeout (int): Tempo máximo (em segundos) para aguardar uma resposta do servidor.
+            min_size (int): Tamanho mínimo (em bytes) do arquivo completo
+            max_size (Optional[int]): Tamanho máximo (em bytes); None desativa o limite
         """
-        self.output_dir = output_dir
-        self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        # Cria o diretório de saída se não existir
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.size = 0
+        self.head = b''
     
-    def follow_redirects(self, url: str) -> str:
+    def feed(self, chunk: bytes):
         """
-        Segue todos os redirecionamentos e retorna a URL final.
+        Registra um bloco recebido.
         
-        Args:
-            url (str): URL inicial
-            
-        Returns:
-            str: URL final após todos os redirecionamentos
+        Raises:
+            InvalidPDFError: Se a assinatura estiver ausente ou o tamanho máximo for excedido
         """
-        try:
-            response = self.session.get(url, allow_redirects=True, stream=True, timeout=self.timeout)
-            response.close()
-            return response.url
-        except requests.exceptions.Timeout:
-            print(f"Tempo excedido ao acessar (redirect) {url}. Pulando...")
-            return url
-        except requests.exceptions.RequestException as e:
-            print(f"Erro ao seguir redirecionamento: {e}")
-            return url
+        self.size += len(chunk)
+        if len(self.head) < PROBE_BYTES:
+            self.head += chunk[:PROBE_BYTES - len(self.head)]
+            if len(self.head) >= PROBE_BYTES and PDF_MAGIC not in self.head:
+                raise InvalidPDFError("não é PDF (assinatura %PDF ausente)")
+        if self.max_size and self.size > self.max_size:
+            raise InvalidPDFError(f"mais de {self.max_size} bytes")
     
-    def get_page_content(self, url: str) -> tuple:
+    def finish(self):
         """
-        Obtém o conteúdo HTML da página e retorna um objeto BeautifulSoup e a URL final.
+        Conclui a validação ao fim do download.
         
-        Args:
-            url (str): URL da página
-            
-        Returns:
-            tuple: (BeautifulSoup ou None, URL final)
+        Raises:
+            InvalidPDFError: Se a assinatura estiver ausente ou o arquivo for menor que o mínimo
         """
-        try:
-            final_url = self.follow_redirects(url)
-            # Agora obtém o conteúdo da página final
-            response = self.session.get(final_url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Se a resposta for um PDF, retorna None e a URL
-            if 'application/pdf' in response.headers.get('Content-Type', '').lower():
-                return None, final_url
-                
-            return BeautifulSoup(response.text, 'html.parser'), final_url
-            
-        except requests.exceptions.Timeout:
-            print(f"Tempo excedido ao acessar {url}. Pulando página...")
-            return None, url
-        except requests.exceptions.RequestException as e:
-            print(f"Erro ao acessar a página: {e}")
-            return None, url
+        if PDF_MAGIC not in self.head:
+            raise InvalidPDFError("não é PDF (assinatura %PDF ausente)")
+        if self.size < self.min_size:
+            raise InvalidPDFError(f"{self.size} bytes (< {self.min_size // 1000} KB)")
+
+
+class PDFLinkFinder:
+    """
+    Regras compartilhadas pelos downloaders síncrono e assíncrono: identificação de URLs de PDF,
+    busca de links em páginas, sondagem dos candidatos e escolha do nome do arquivo baixado.
+    """
+    
+    min_size = MIN_PDF_SIZE
+    max_size = MAX_PDF_SIZE
+    store = None
+    adapters: Optional[AdapterRegistry] = None
+    rules: Optional[LinkRules] = None
+    parser: Optional[str] = None
+    full_parse = False
     
     def is_pdf_url(self, url: str) -> bool:
         """
@@ -105,6 +151,19 @@ class PDFDownloader:
         
         return any(re.search(pattern, url.lower()) for pattern in pdf_patterns)
     
+    def parse_page(self, html: str) -> BeautifulSoup:
+        """
+        Analisa uma página para a busca de PDFs com o backend escolhido (ver BDTDparse). Sem
+        full_parse, apenas links, iframes e metadados são construídos.
+        
+        Args:
+            html (str): Conteúdo HTML da página
+            
+        Returns:
+            BeautifulSoup: Página analisada
+        """
+        return parse_html(html, self.parser, only=None if self.full_parse else LINK_TAGS)
+    
     def find_pdf_links(self, soup: BeautifulSoup, base_url: str) -> list:
         """
         Localiza links para PDFs na página.
@@ -144,52 +203,609 @@ class PDFDownloader:
         
         return list(pdf_links)
     
-    def download_pdf(self, url: str, filename: str = None) -> str:
+    def resolve_pdf_links(self, soup: BeautifulSoup, base_url: str) -> Tuple[list, bool]:
+        """
+        Localiza os PDFs de uma página: primeiro pelos adaptadores de repositório (citation_pdf_url,
+        DSpace, OJS...), que apontam o texto completo diretamente; se nenhum se aplicar, pela busca
+        heurística de find_pdf_links.
+        
+        Args:
+            soup (BeautifulSoup): Objeto BeautifulSoup com o conteúdo da página
+            base_url (str): URL base para resolver links relativos
+            
+        Returns:
+            Tuple[list, bool]: (URLs dos PDFs, True se vieram de um adaptador)
         """
-        Baixa um arquivo PDF (ou supostamente PDF), respeitando timeout.
+        if soup is not None and self.adapters is not None:
+            name, links = self.adapters.resolve(soup, base_url)
+            if links:
+                print(f"[{name}] {len(links)} PDF(s) localizado(s) em {base_url}")
+                return links, True
+        return self.find_pdf_links(soup, base_url), False
+    
+    def resolve_page_url(self, url: str) -> list:
+        """
+        Deduz os PDFs de uma página apenas pela URL, pelos adaptadores cujo padrão de URL permite
+        (ex.: galleys do OJS), dispensando o acesso à página.
+        
+        Args:
+            url (str): URL da página
+            
+        Returns:
+            list: URLs dos PDFs (vazia se nenhum adaptador se aplicar)
+        """
+        if self.adapters is None:
+            return []
+        name, links = self.adapters.resolve_url(url)
+        if links:
+            print(f"[{name}] {len(links)} PDF(s) deduzido(s) da URL {url}")
+        return links
+    
+    def learned_page_url(self, url: str) -> Tuple[Optional[LinkRule], list]:
+        """
+        Monta os PDFs de uma página pelo modelo de URL aprendido para o host (ver BDTDrules),
+        dispensando o acesso à página.
+        
+        Args:
+            url (str): URL da página
+            
+        Returns:
+            Tuple[Optional[LinkRule], list]: (regra usada, URLs dos PDFs); (None, []) sem regra aplicável
+        """
+        if self.rules is None:
+            return None, []
+        rule, links = self.rules.resolve_url(url)
+        if links:
+            print(f"[regra {rule.kind}] PDF deduzido da URL {url}")
+        return rule, links
+    
+    def learned_links(self, soup: BeautifulSoup, base_url: str) -> Tuple[Optional[LinkRule], list]:
+        """
+        Localiza os PDFs de uma página pela regra aprendida mais confiável do host (padrão do link,
+        texto ou posição), antes dos adaptadores e da busca heurística.
+        
+        Args:
+            soup (BeautifulSoup): Objeto BeautifulSoup com o conteúdo da página
+            base_url (str): URL final da página
+            
+        Returns:
+            Tuple[Optional[LinkRule], list]: (regra usada, URLs dos PDFs); (None, []) sem regra aplicável
+        """
+        if self.rules is None:
+            return None, []
+        rule, links = self.rules.resolve(soup, base_url)
+        if links:
+            print(f"[regra {rule.kind}] {len(links)} PDF(s) localizado(s) em {base_url}")
+        return rule, links
+    
+    def rule_failed(self, rule: Optional[LinkRule]):
+        """
+        Registra que uma regra aprendida não levou a nenhum PDF válido (a confiança dela diminui).
+        """
+        if self.rules is not None and rule is not None:
+            self.rules.record(rule, False)
+    
+    def learn_links(self, url: str, final_url: str, soup: Optional[BeautifulSoup], links: list):
+        """
+        Aprende (ou reforça) as regras do host a partir dos links que levaram a PDFs válidos.
+        
+        Args:
+            url (str): URL requisitada da página
+            final_url (str): URL final da página
+            soup (Optional[BeautifulSoup]): Página (None se não foi acessada)
+            links (list): Links da página, antes da sondagem, que resultaram em PDFs
+        """
+        if self.rules is not None and links:
+            self.rules.learn(url, final_url, soup, links)
+    
+    @staticmethod
+    def is_pdf_response(response) -> bool:
+        """
+        Verifica, pelos cabeçalhos, se a resposta é um PDF.
+        
+        Args:
+            response: Resposta HTTP (requests ou aiohttp)
+            
+        Returns:
+            bool: True se o Content-Type indicar PDF
+        """
+        return 'application/pdf' in response.headers.get('Content-Type', '').lower()
+    
+    @staticmethod
+    def response_size(status: int, headers: Mapping) -> Optional[int]:
+        """
+        Obtém o tamanho total do arquivo pelos cabeçalhos: o total de 'Content-Range' em respostas
+        parciais (206) ou 'Content-Length' em respostas completas sem compressão.
+        
+        Args:
+            status (int): Código HTTP da resposta
+            headers: Cabeçalhos da resposta
+            
+        Returns:
+            Optional[int]: Tamanho em bytes, ou None se desconhecido
+        """
+        if status == 206:
+            total = headers.get('Content-Range', '').rpartition('/')[2].strip()
+            return int(total) if total.isdigit() else None
+        length = headers.get('Content-Length', '').strip()
+        if length.isdigit() and headers.get('Content-Encoding', 'identity').lower() == 'identity':
+            return int(length)
+        return None
+    
+    def probe_verdict(self, status: int, headers: Mapping, head: Optional[bytes] = None) -> str:
+        """
+        Decide, a partir dos cabeçalhos e dos primeiros bytes, se uma resposta é um PDF a ser baixado:
+        o tamanho informado deve estar entre min_size e max_size bytes e o conteúdo deve conter a
+        assinatura '%PDF' (o Content-Type não basta: muitos repositórios enviam PDFs como
+        application/octet-stream, e páginas de erro como application/pdf).
+        
+        Args:
+            status (int): Código HTTP da resposta
+            headers: Cabeçalhos da resposta
+            head (Optional[bytes]): Primeiros bytes do corpo. Se None, apenas o tamanho é verificado.
+            
+        Returns:
+            str: Motivo da recusa, ou '' se a resposta for aceita
+        """
+        size = self.response_size(status, headers)
+        if size is not None and size < self.min_size:
+            return f"{size} bytes (< {self.min_size // 1000} KB)"
+        if size is not None and self.max_size and size > self.max_size:
+            return f"{size} bytes (> {self.max_size} bytes)"
+        if head is not None and PDF_MAGIC not in head[:PROBE_BYTES]:
+            return f"não é PDF ({headers.get('Content-Type') or 'sem Content-Type'})"
+        return ''
+    
+    def resume_path(self, url: str) -> str:
+        """
+        Caminho do arquivo parcial ('.part') do download de uma URL. É o mesmo em todas as
+        tentativas, para que uma nova tentativa (ou execução) continue de onde a anterior parou.
+        Fica no repositório de conteúdo, se houver, ou em output_dir.
         
         Args:
             url (str): URL do arquivo
-            filename (str, optional): Nome do arquivo para salvar. Se None, tenta extrair do 'Content-Disposition' ou URL.
             
         Returns:
-            str: Caminho do arquivo baixado
+            str: Caminho do arquivo parcial
+        """
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:20] + PARTIAL_SUFFIX
+        return os.path.join(self.store.tmp_dir if self.store else self.output_dir, name)
+    
+    @staticmethod
+    def read_resume_info(partial_path: str) -> dict:
+        """
+        Lê os dados de retomada de um arquivo parcial (ETag, Last-Modified e tamanho total),
+        gravados ao lado dele ('.part.json').
         """
         try:
-            # Segue redirecionamentos para obter a URL final
-            final_url = self.follow_redirects(url)
+            with open(partial_path + '.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def discard_partial(partial_path: str):
+        """
+        Remove um arquivo parcial e seus dados de retomada.
+        """
+        for path in (partial_path, partial_path + '.json'):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def resume_request(self, partial_path: str) -> Tuple[int, dict]:
+        """
+        Prepara a requisição que continua um download parcial: 'Range' a partir dos bytes já
+        gravados e 'If-Range' com o ETag (forte) ou o Last-Modified da resposta original, para
+        que o servidor envie o arquivo inteiro se ele tiver mudado. Parciais sem validador não
+        podem ser retomados com segurança e são descartados.
+        
+        Args:
+            partial_path (str): Caminho do arquivo parcial (ver resume_path)
             
-            response = self.session.get(final_url, stream=True, timeout=self.timeout)
-            response.raise_for_status()
+        Returns:
+            Tuple[int, dict]: (bytes já gravados, cabeçalhos da requisição); (0, {}) para começar do zero
+        """
+        info = self.read_resume_info(partial_path)
+        etag = info.get('etag') or ''
+        validator = etag if etag and not etag.startswith('W/') else info.get('last_modified')
+        if validator and os.path.exists(partial_path):
+            offset = os.path.getsize(partial_path)
+            if offset:
+                return offset, {'Range': f'bytes={offset}-', 'If-Range': validator}
+        self.discard_partial(partial_path)
+        return 0, {}
+    
+    def start_partial(self, partial_path: str, status: int, headers: Mapping, offset: int) -> int:
+        """
+        Decide, pela resposta, se o download continua o arquivo parcial: exige uma resposta 206
+        iniciada em offset, com o mesmo ETag e o mesmo tamanho total da resposta original. Caso
+        contrário (servidor ignorou o Range ou o arquivo mudou) o download recomeça do zero e os
+        dados de retomada da nova resposta são gravados.
+        
+        Args:
+            partial_path (str): Caminho do arquivo parcial
+            status (int): Código HTTP da resposta
+            headers: Cabeçalhos da resposta
+            offset (int): Bytes já gravados no parcial (ver resume_request)
             
-            # Tenta obter o nome do arquivo
-            if not filename:
-                content_disposition = response.headers.get('content-disposition')
-                if content_disposition and 'filename=' in content_disposition:
-                    filename_match = re.findall(r'filename=(.+)', content_disposition)
-                    if filename_match:
-                        filename = filename_match[0].strip('"\'')
-                if not filename:
-                    # Tenta extrair do path
-                    filename = os.path.basename(urlparse(final_url).path).split('?')[0]
-                if not filename or not filename.strip():
-                    filename = 'document.pdf'
-            
-            filepath = os.path.join(self.output_dir, filename)
-            
-            # Baixa o arquivo em chunks
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+        Returns:
+            int: Posição a partir da qual a resposta é gravada (0 = recomeço)
+        """
+        total = self.response_size(status, headers)
+        if offset:
+            info = self.read_resume_info(partial_path)
+            etag = headers.get('ETag')
+            if (status == 206 and headers.get('Content-Range', '').startswith(f'bytes {offset}-')
+                    and total is not None and total == info.get('length')
+                    and (not etag or etag == info.get('etag'))):
+                return offset
+        write_json(partial_path + '.json', {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'length': total
+        })
+        return 0
+    
+    def finish_download(self, partial_path: str, filepath: str, digest: str, urls: list) -> str:
+        """
+        Conclui um download validado: sem repositório, renomeia o temporário para o nome final;
+        com repositório, incorpora o conteúdo pelo SHA-256, registra as URLs que levaram a ele e
+        cria o link na pasta de destino.
+        
+        Args:
+            partial_path (str): Arquivo temporário completo
+            filepath (str): Caminho final desejado
+            digest (str): SHA-256 do conteúdo
+            urls (list): URLs que levaram ao conteúdo (requisitada, redirecionamentos e final)
             
+        Returns:
+            str: Caminho do arquivo na pasta de destino
+        """
+        # O download terminou: os dados de retomada não são mais necessários
+        if os.path.exists(partial_path + '.json'):
+            os.remove(partial_path + '.json')
+        if self.store is None:
+            os.replace(partial_path, filepath)
             return filepath
+        filename = os.path.basename(filepath)
+        self.store.add(partial_path, digest)
+        self.store.remember(urls, digest, filename)
+        return self.store.link(digest, os.path.dirname(filepath), filename)
+    
+    def stored_files(self, url: str) -> list:
+        """
+        Se a URL já foi baixada (repositório de conteúdo), cria os links na pasta de destino
+        sem acessar a rede.
+        
+        Args:
+            url (str): URL de uma página ou de um PDF
+            
+        Returns:
+            list: Caminhos dos arquivos (vazia se a URL for desconhecida ou não houver repositório)
+        """
+        entries = self.store.lookup(url) if self.store else None
+        if not entries:
+            return []
+        return [self.store.link(digest, self.output_dir, filename) for digest, filename in entries]
+    
+    def remember_page(self, urls: list, pdf_urls: list):
+        """
+        Associa uma página (URL requisitada e final) aos PDFs baixados a partir dela.
+        """
+        if self.store is None:
+            return
+        for pdf_url in pdf_urls:
+            for digest, filename in self.store.lookup(pdf_url) or []:
+                self.store.remember(urls, digest, filename)
+    
+    @staticmethod
+    def response_filename(headers, url: str) -> str:
+        """
+        Escolhe o nome do arquivo de uma resposta: 'Content-Disposition', o final do path da URL
+        ou 'document.pdf', sempre com a extensão '.pdf'.
+        
+        Args:
+            headers: Cabeçalhos da resposta
+            url (str): URL final da resposta
+            
+        Returns:
+            str: Nome do arquivo
+        """
+        filename = None
+        content_disposition = headers.get('content-disposition')
+        if content_disposition and 'filename=' in content_disposition:
+            filename_match = re.findall(r'filename=(.+)', content_disposition)
+            if filename_match:
+                filename = filename_match[0].strip('"\'')
+        if not filename:
+            # Tenta extrair do path
+            filename = os.path.basename(urlparse(url).path).split('?')[0]
+        if not filename or not filename.strip():
+            filename = 'document.pdf'
+        # Só PDFs validados são gravados: URLs sem extensão (ex.: .../download/12/9) recebem '.pdf'
+        if not filename.lower().endswith('.pdf'):
+            filename += '.pdf'
+        return filename
+
+
+class PDFDownloader(PDFLinkFinder):
+    """
+    Classe para localizar e baixar PDFs de páginas web, com suporte a redirecionamentos e timeout.
+    """
+    
+    def __init__(self, output_dir="downloads", timeout=None, client=None, probe=True, min_size=MIN_PDF_SIZE,
+                 max_size=MAX_PDF_SIZE, store=None, retries=3, backoff=1.0, adapters=None, rules=None,
+                 parser=None, full_parse=False):
+        """
+        Inicializa o downloader.
+        
+        Args:
+            output_dir (str): Diretório onde os PDFs serão salvos.
+            timeout (int | tuple, optional): Tempo máximo (em segundos) para aguardar uma resposta do servidor.
+                Se None, usa o timeout (conexão, leitura) do cliente HTTP.
+            client (HTTPClient, optional): Cliente HTTP a ser usado. Se None, usa o cliente compartilhado,
+                de modo que vários downloaders reaproveitam as mesmas conexões keep-alive.
+            probe (bool): Se True, process_page sonda cada link candidato (ver probe) e baixa apenas os PDFs reais.
+            min_size (int): Tamanho mínimo (em bytes) de um PDF aceito.
+            max_size (int, optional): Tamanho máximo (em bytes) de um PDF aceito; None desativa o limite.
+            store (PDFStore, optional): Repositório endereçado por conteúdo. Se definido, cada PDF é gravado
+                uma única vez (pelo SHA-256) e output_dir recebe links; URLs já baixadas não são requisitadas de novo.
+            retries (int): Novas tentativas de um download após erros temporários; cada tentativa
+                continua o arquivo parcial com uma requisição Range.
+            backoff (float): Espera inicial (em segundos) entre tentativas, dobrada a cada nova falha.
+            adapters (AdapterRegistry, optional): Adaptadores de repositório usados para localizar o texto
+                completo. Se None, usa os adaptadores padrão (ver BDTDadapters.default_registry);
+                AdapterRegistry() vazio desativa os adaptadores, mantendo apenas a busca heurística.
+            rules (LinkRules, optional): Regras aprendidas por host (ver BDTDrules), compartilháveis entre
+                downloaders. Se definidas, são tentadas antes dos adaptadores e aprendem com cada PDF obtido.
+            parser (str, optional): Backend do BeautifulSoup ('lxml' ou 'html.parser'); se None, 'lxml'
+                quando instalado (ver BDTDparse.html_parser).
+            full_parse (bool): Se True, constrói a árvore completa das páginas; por padrão apenas links,
+                iframes e metadados, o que basta para a busca de PDFs (regras de posição ficam restritas
+                às classes do próprio link).
+        """
+        self.output_dir = output_dir
+        self.adapters = adapters if adapters is not None else default_registry()
+        self.rules = rules
+        self.parser = parser
+        self.full_parse = full_parse
+        self.store = store
+        self.probe_links = probe
+        self.min_size = min_size
+        self.max_size = max_size
+        self.retries = retries
+        self.backoff = backoff
+        self.client = client or get_client()
+        self.timeout = timeout if timeout is not None else self.client.timeout
+        self.session = self.client.session
+        
+        # Cria o diretório de saída se não existir
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+    
+    def follow_redirects(self, url: str) -> str:
+        """
+        Segue todos os redirecionamentos e retorna a URL final.
+        Mantido por compatibilidade: process_page e download_pdf seguem os redirecionamentos
+        na própria requisição (ver fetch).
+        
+        Args:
+            url (str): URL inicial
+            
+        Returns:
+            str: URL final após todos os redirecionamentos
+        """
+        try:
+            response = self.client.get(url, allow_redirects=True, stream=True, timeout=self.timeout)
+            response.close()
+            return response.url
+        except requests.exceptions.Timeout:
+            print(f"Tempo excedido ao acessar (redirect) {url}. Pulando...")
+            return url
+        except requests.exceptions.RequestException as e:
+            print(f"Erro ao seguir redirecionamento: {e}")
+            return url
+    
+    def fetch(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """
+        Abre a URL com uma única requisição GET, seguindo os redirecionamentos, sem ler o corpo.
+        A resposta ainda aberta permite inspecionar os cabeçalhos e decidir entre interpretar o
+        HTML ou gravar o conteúdo em disco, sem requisitar a URL final de novo.
+        
+        Args:
+            url (str): URL inicial
+            headers (Optional[dict]): Cabeçalhos adicionais (por exemplo, Range)
+            
+        Returns:
+            requests.Response: Resposta com stream=True (response.url é a URL final)
+            
+        Raises:
+            requests.exceptions.RequestException: Se a requisição falhar ou retornar erro HTTP
+        """
+        response = self.client.get(url, headers=headers, allow_redirects=True, stream=True, timeout=self.timeout)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return response
+    
+    def probe(self, url: str) -> str:
+        """
+        Sonda um link candidato antes do download, com um GET apenas dos primeiros PROBE_BYTES
+        bytes (cabeçalho Range), seguindo os redirecionamentos. Verifica o tamanho informado
+        (Content-Range/Content-Length), a assinatura '%PDF' e, para o log, o Content-Type.
+        
+        Args:
+            url (str): URL candidata
+            
+        Returns:
+            str: URL final do PDF, ou '' se o link não levar a um PDF aceitável
+        """
+        try:
+            response = self.client.get(url, headers={'Range': f'bytes=0-{PROBE_BYTES - 1}'},
+                                       allow_redirects=True, stream=True, timeout=self.timeout)
+            with response:
+                response.raise_for_status()
+                if response.status_code == 206:
+                    # Apenas os bytes pedidos: lidos por inteiro, a conexão volta ao pool
+                    head = response.content
+                else:
+                    # Servidores que ignoram o Range respondem 200 com o arquivo inteiro: lê só o início
+                    head = next(response.iter_content(chunk_size=PROBE_BYTES), b'')
+                reason = self.probe_verdict(response.status_code, response.headers, head)
+                final_url = response.url
+        except requests.exceptions.Timeout:
+            print(f"Tempo excedido ao sondar {url}. Pulando...")
+            return ""
+        except requests.exceptions.RequestException as e:
+            print(f"Erro ao sondar {url}: {e}")
+            return ""
+        
+        if reason:
+            print(f"Ignorando {url}: {reason}")
+            return ""
+        return final_url
+    
+    def get_page_content(self, url: str) -> tuple:
+        """
+        Obtém o conteúdo HTML da página e retorna um objeto BeautifulSoup e a URL final.
+        
+        Args:
+            url (str): URL da página
             
+        Returns:
+            tuple: (BeautifulSoup ou None, URL final)
+        """
+        try:
+            response = self.fetch(url)
         except requests.exceptions.Timeout:
-            print(f"Tempo excedido para download de {url}. Pulando este arquivo...")
-            return ""  # Retorna vazio indicando falha
+            print(f"Tempo excedido ao acessar {url}. Pulando página...")
+            return None, url
         except requests.exceptions.RequestException as e:
-            print(f"Erro ao baixar o PDF: {e}")
+            print(f"Erro ao acessar a página: {e}")
+            return None, url
+        
+        with response:
+            # Se a resposta for um PDF, retorna None e a URL (o corpo não é lido)
+            if self.is_pdf_response(response):
+                return None, response.url
+            try:
+                return self.parse_page(response.text), response.url
+            except requests.exceptions.RequestException as e:
+                print(f"Erro ao ler a página: {e}")
+                return None, response.url
+    
+    def save_response(self, response: requests.Response, filename: str = None,
+                      partial_path: str = None, offset: int = 0) -> str:
+        """
+        Grava em disco o corpo de uma resposta aberta com stream=True, validando-o durante a
+        transferência (ver PDFStreamValidator), e a fecha. O conteúdo é gravado em blocos grandes
+        no arquivo parcial ('.part'), renomeado atomicamente para o nome final apenas se o PDF
+        for válido. Um conteúdo inválido é descartado; após uma falha de conexão o parcial é
+        mantido, para que download_pdf continue o download com uma requisição Range.
+        Com repositório de conteúdo, o SHA-256 é calculado durante a transferência e o arquivo
+        final é um link para o objeto do repositório (ver finish_download).
+        
+        Args:
+            response (requests.Response): Resposta obtida com fetch
+            filename (str, optional): Nome do arquivo para salvar. Se None, tenta extrair do 'Content-Disposition' ou URL.
+            partial_path (str, optional): Arquivo parcial. Se None, usa o da URL final (ver resume_path).
+            offset (int): Bytes já gravados no parcial, quando a resposta continua um download (ver resume_request).
+            
+        Returns:
+            str: Caminho do arquivo gravado
+            
+        Raises:
+            InvalidPDFError: Se o conteúdo não for um PDF ou o tamanho estiver fora dos limites
+            requests.exceptions.RequestException: Se a conexão falhar ou a transferência ficar incompleta
+        """
+        with response:
+            # Recusa pelo tamanho informado antes de ler o corpo
+            reason = self.probe_verdict(response.status_code, response.headers)
+            if reason:
+                raise InvalidPDFError(reason)
+            
+            filepath = os.path.join(self.output_dir, filename or self.response_filename(response.headers, response.url))
+            partial_path = partial_path or self.resume_path(response.url)
+            offset = self.start_partial(partial_path, response.status_code, response.headers, offset)
+            validator = PDFStreamValidator(self.min_size, self.max_size)
+            sha256 = hashlib.sha256()
+            try:
+                if offset:
+                    # Os bytes já recebidos entram na validação e no SHA-256
+                    with open(partial_path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+                            validator.feed(chunk)
+                            sha256.update(chunk)
+                with open(partial_path, 'ab' if offset else 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            validator.feed(chunk)
+                            sha256.update(chunk)
+                            f.write(chunk)
+                total = self.response_size(response.status_code, response.headers)
+                if total is not None and validator.size < total:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"transferência incompleta ({validator.size} de {total} bytes)")
+                validator.finish()
+                urls = [r.url for r in response.history] + [response.url]
+                filepath = self.finish_download(partial_path, filepath, sha256.hexdigest(), urls)
+            except InvalidPDFError:
+                self.discard_partial(partial_path)
+                raise
+        
+        return filepath
+    
+    def download_pdf(self, url: str, filename: str = None) -> str:
+        """
+        Baixa um arquivo PDF, respeitando timeout e descartando conteúdos inválidos (ver save_response).
+        Os redirecionamentos são seguidos na própria requisição do download. Após erros temporários
+        (conexão interrompida, timeout, 5xx), até self.retries novas tentativas continuam o arquivo
+        parcial com uma requisição Range, em vez de baixar tudo de novo.
+        
+        Args:
+            url (str): URL do arquivo
+            filename (str, optional): Nome do arquivo para salvar. Se None, tenta extrair do 'Content-Disposition' ou URL.
+            
+        Returns:
+            str: Caminho do arquivo baixado
+        """
+        stored = self.stored_files(url)
+        if stored:
+            return stored[0]
+        
+        partial_path = self.resume_path(url)
+        with partial_lock(partial_path):
+            # Outro download da mesma URL pode ter terminado durante a espera
+            stored = self.stored_files(url)
+            if stored:
+                return stored[0]
+            
+            for attempt in range(self.retries + 1):
+                offset, headers = self.resume_request(partial_path)
+                try:
+                    return self.save_response(self.fetch(url, headers), filename, partial_path, offset)
+                except InvalidPDFError as e:
+                    print(f"Descartando {url}: {e}")
+                    return ""
+                except requests.exceptions.RequestException as e:
+                    if offset and isinstance(e, requests.exceptions.HTTPError) and e.response is not None \
+                            and e.response.status_code == 416:
+                        # Intervalo recusado: o parcial não corresponde ao arquivo atual e é descartado
+                        self.discard_partial(partial_path)
+                        continue
+                    if attempt == self.retries or not BDTDCrawler.is_transient_error(e):
+                        if isinstance(e, requests.exceptions.Timeout):
+                            print(f"Tempo excedido para download de {url}. Pulando este arquivo...")
+                        else:
+                            print(f"Erro ao baixar o PDF: {e}")
+                        return ""  # Retorna vazio indicando falha
+                    received = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+                    delay = self.backoff * 2 ** attempt
+                    print(f"Download de {url} interrompido ({received} bytes recebidos: {e}). "
+                          f"Retomando em {delay:.1f}s...")
+                    time.sleep(delay)
             return ""
     
     def process_page(self, url: str) -> list:
@@ -204,32 +820,218 @@ class PDFDownloader:
         """
         print(f"Processando página: {url}")
         
-        # Obtém o conteúdo da página e a URL final após redirecionamentos
-        soup, final_url = self.get_page_content(url)
+        # Página (ou PDF) já baixada em outro registro ou execução
+        downloaded_files = self.stored_files(url)
+        if downloaded_files:
+            print(f"Já baixado (repositório local): {url}")
+            return downloaded_files
+        
+        # Adaptador ou modelo de URL aprendido que deduz o PDF pela URL: a página não precisa ser acessada.
+        # Se nenhum desses links levar a um PDF, a página é acessada e os demais métodos são tentados.
+        tried = set()
+        rule = None
+        direct_links = self.resolve_page_url(url)
+        if not direct_links:
+            rule, direct_links = self.learned_page_url(url)
+        if direct_links:
+            pdf_urls = []
+            for pdf_url in direct_links:
+                pdf_path = self.download_pdf(pdf_url)
+                if pdf_path:
+                    downloaded_files.append(pdf_path)
+                    pdf_urls.append(pdf_url)
+            if pdf_urls:
+                self.learn_links(url, url, None, pdf_urls)
+                self.remember_page([url], pdf_urls)
+                return downloaded_files
+            self.rule_failed(rule)
+            tried.update(direct_links)
+            print(f"Nenhum PDF válido nos links deduzidos da URL; acessando a página {url}")
+        # Uma única requisição: os cabeçalhos decidem se a resposta é o próprio PDF ou uma página
+        try:
+            response = self.fetch(url)
+        except requests.exceptions.Timeout:
+            print(f"Tempo excedido ao acessar {url}. Pulando página...")
+            return downloaded_files
+        except requests.exceptions.RequestException as e:
+            print(f"Erro ao acessar a página: {e}")
+            return downloaded_files
         
-        downloaded_files = []
+        final_url = response.url
         
-        # Se a URL final já é um PDF, baixa diretamente
-        if soup is None and self.is_pdf_url(final_url):
-            pdf_path = self.download_pdf(final_url)
+        # Se a URL final já é um PDF, grava a resposta diretamente (validada durante o download)
+        if self.is_pdf_response(response):
+            partial_path = self.resume_path(final_url)
+            try:
+                with partial_lock(partial_path):
+                    pdf_path = self.save_response(response, partial_path=partial_path)
+            except InvalidPDFError as e:
+                print(f"Descartando {final_url}: {e}")
+                pdf_path = ""
+            except requests.exceptions.RequestException as e:
+                if BDTDCrawler.is_transient_error(e):
+                    # Conexão interrompida: download_pdf continua o arquivo parcial
+                    print(f"Download de {final_url} interrompido ({e}). Retomando...")
+                    pdf_path = self.download_pdf(final_url)
+                else:
+                    print(f"Erro ao baixar o PDF: {e}")
+                    pdf_path = ""
             if pdf_path:
                 downloaded_files.append(pdf_path)
             return downloaded_files
         
-        # Encontra links para PDFs
-        pdf_links = self.find_pdf_links(soup, final_url)
+        with response:
+            try:
+                soup = self.parse_page(response.text)
+            except requests.exceptions.RequestException as e:
+                print(f"Erro ao ler a página: {e}")
+                return downloaded_files
+        
+        # Encontra links para PDFs: primeiro pelas regras aprendidas para o host; se nenhuma se
+        # aplicar (ou a regra não levar a um PDF), pelos adaptadores de repositório ou pela busca heurística
+        rule, pdf_links = self.learned_links(soup, final_url)
+        pdf_links = [link for link in pdf_links if link not in tried]
+        if pdf_links:
+            found_links, pdf_urls = self.download_links(pdf_links, downloaded_files, probe=False)
+            if pdf_urls:
+                self.learn_links(url, final_url, soup, found_links)
+                self.remember_page([url, final_url], pdf_urls)
+                return downloaded_files
+            self.rule_failed(rule)
+            tried.update(pdf_links)
         
-        if not pdf_links:
+        pdf_links, from_adapter = self.resolve_pdf_links(soup, final_url)
+        pdf_links = [link for link in pdf_links if link not in tried]
+        
+        # Com a sondagem, apenas os links que forem PDFs reais são baixados. Os links apontados
+        # por um adaptador dispensam a sondagem (ainda são validados durante o download).
+        found_links, pdf_urls = self.download_links(pdf_links, downloaded_files,
+                                                    probe=self.probe_links and not from_adapter)
+        tried.update(pdf_links)
+        
+        # Adaptador sem resultado (indicação errada ou desatualizada): recorre à busca heurística
+        if from_adapter and not pdf_urls:
+            print(f"Nenhum PDF válido nos links do adaptador; usando a busca heurística em {final_url}")
+            pdf_links = [link for link in self.find_pdf_links(soup, final_url) if link not in tried]
+            found_links, pdf_urls = self.download_links(pdf_links, downloaded_files, probe=self.probe_links)
+            tried.update(pdf_links)
+        
+        if not tried:
             print("Nenhum PDF encontrado na página.")
-            return downloaded_files
         
-        # Baixa cada PDF encontrado
-        for pdf_url in pdf_links:
+        self.learn_links(url, final_url, soup, found_links)
+        self.remember_page([url, final_url], pdf_urls)
+        return downloaded_files
+    
+    def download_links(self, pdf_links: list, downloaded_files: list, probe: bool) -> Tuple[list, list]:
+        """
+        Baixa os links candidatos de uma página.
+        
+        Args:
+            pdf_links (list): Links candidatos
+            downloaded_files (list): Caminhos já obtidos para a página (recebe os novos arquivos)
+            probe (bool): Se True, sonda cada link e baixa apenas os PDFs reais
+            
+        Returns:
+            Tuple[list, list]: (links que levaram a PDFs, URLs efetivamente baixadas após a sondagem)
+        """
+        probed = set()
+        found_links = []
+        pdf_urls = []
+        for link in pdf_links:
+            # Link já baixado: dispensa a sondagem e o download
+            stored = self.stored_files(link)
+            if stored:
+                downloaded_files.extend(path for path in stored if path not in downloaded_files)
+                found_links.append(link)
+                pdf_urls.append(link)
+                continue
+            pdf_url = link
+            if probe:
+                pdf_url = self.probe(link)
+                # Links diferentes podem levar (após os redirecionamentos) ao mesmo arquivo
+                if not pdf_url or pdf_url in probed:
+                    continue
+                probed.add(pdf_url)
             print(f"Tentando baixar PDF: {pdf_url}")
             pdf_path = self.download_pdf(pdf_url)
             if pdf_path:
-                downloaded_files.append(pdf_path)
-            # Pausa leve para evitar bombardeio de requests
-            time.sleep(0.5)
+                if pdf_path not in downloaded_files:
+                    downloaded_files.append(pdf_path)
+                found_links.append(link)
+                pdf_urls.append(pdf_url)
+        return found_links, pdf_urls
+
+
+class DownloadScheduler:
+    """
+    Agenda os downloads de vários registros em um único pool de threads, com um limite de
+    tarefas simultâneas por host. As tarefas ficam em filas por host, atendidas em rodízio:
+    um host lento ocupa no máximo per_host workers, enquanto os demais seguem baixando
+    dos outros repositórios.
+    """
+    
+    def __init__(self, max_workers: int = 8, per_host: int = 2):
+        """
+        Inicializa o agendador.
         
-        return downloaded_files
+        Args:
+            max_workers (int): Número total de downloads simultâneos
+            per_host (int): Número máximo de downloads simultâneos por host
+        """
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+    
+    def run(
+        self,
+        tasks: Iterable[Tuple[Hashable, str]],
+        handler: Callable[[Hashable, str], list]
+    ) -> Iterator[Tuple[Hashable, str, list]]:
+        """
+        Executa as tarefas e produz os resultados à medida que terminam.
+        
+        Args:
+            tasks (Iterable[Tuple[Hashable, str]]): Pares (chave do registro, URL)
+            handler (Callable): Função chamada como handler(chave, url), retornando a lista de arquivos baixados
+            
+        Yields:
+            Tuple[Hashable, str, list]: (chave, URL, arquivos baixados); uma tarefa que falha produz lista vazia
+        """
+        queues = OrderedDict()
+        for key, url in tasks:
+            queues.setdefault(urlparse(url).netloc, deque()).append((key, url))
+        
+        active = defaultdict(int)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while queues or running:
+                # Distribui as vagas livres em rodízio entre os hosts abaixo do limite
+                dispatched = True
+                while dispatched and len(running) < self.max_workers:
+                    dispatched = False
+                    for host in list(queues):
+                        if len(running) >= self.max_workers:
+                            break
+                        if active[host] >= self.per_host:
+                            continue
+                        key, url = queues[host].popleft()
+                        if queues[host]:
+                            # O host atendido vai para o fim da fila, para que o rodízio continue
+                            # do próximo na rodada seguinte
+                            queues.move_to_end(host)
+                        else:
+                            del queues[host]
+                        active[host] += 1
+                        running[executor.submit(handler, key, url)] = (host, key, url)
+                        dispatched = True
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, key, url = running.pop(future)
+                    active[host] -= 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Erro ao baixar de {url}: {e}")
+                        result = []
+                    yield key, url, result
@@ -1,10 +1,26 @@
+import os
+import csv
+import math
+import time
 import requests
-import pandas as pd
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 import urllib.parse
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from BDTDhttp import HTTPClient, get_client
+from BDTDcache import ResponseCache
+from BDTDrecord import BDTDRecord
+from BDTDharvest import HarvestState
+
+# Maior número de registros por página aceito pela API do VuFind
+MAX_PAGE_LIMIT = 100
+
+# Campos do registro efetivamente consumidos por process_record (projeção via field[])
+RECORD_FIELDS = ['id', 'title', 'summary', 'authors', 'formats', 'languages', 'series', 'subjects', 'urls', 'publicationDates']
+
 class BDTDCrawler:
     """
     Classe para realizar buscas na Base Digital de Teses e Dissertações (BDTD)
@@ -13,11 +29,27 @@ class BDTDCrawler:
     API De fato: https://bdtd.ibict.br/vufind/api/v1/search
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[HTTPClient] = None,
+        cache: Optional[ResponseCache] = None,
+        retries: int = 3,
+        backoff: float = 1.0
+    ):
         """
         Inicializa o crawler com a URL base da API da BDTD.
+        
+        Args:
+            client (Optional[HTTPClient]): Cliente HTTP a ser usado. Se None, usa o cliente compartilhado.
+            cache (Optional[ResponseCache]): Cache em disco das respostas da API. Se None, toda busca vai à rede.
+            retries (int): Novas tentativas de uma requisição após erros temporários
+            backoff (float): Espera inicial (em segundos) entre tentativas, dobrada a cada nova falha
         """
         self.base_url = "https://bdtd.ibict.br/vufind/api/v1/search"
+        self.client = client or get_client()
+        self.cache = cache
+        self.retries = retries
+        self.backoff = backoff
         
     def create_query_url(
         self,
@@ -26,7 +58,10 @@ class BDTDCrawler:
         sort: str = "relevance",
         page: int = 1,
         limit: int = 20,
-        language: str = "pt-br"
+        language: str = "pt-br",
+        fields: Optional[List[str]] = None,
+        filters: Optional[List[str]] = None,
+        facets: Optional[List[str]] = None
     ) -> str:
         """
         Cria a URL de consulta com os parâmetros fornecidos.
@@ -36,12 +71,20 @@ class BDTDCrawler:
             search_type (str): Tipo de busca (AllFields, Title, Author, etc)
             sort (str): Método de ordenação
             page (int): Número da página
-            limit (int): Limite de registros por página
+            limit (int): Limite de registros por página (máximo MAX_PAGE_LIMIT)
             language (str): Idioma das strings traduzidas
+            fields (Optional[List[str]]): Campos a retornar em cada registro (field[]).
+                Se None, a API retorna o conjunto padrão de campos.
+            filters (Optional[List[str]]): Filtros de faceta (filter[]), ex.: 'publishDate:"2020"'.
+                O prefixo '-' exclui os registros com o valor indicado.
+            facets (Optional[List[str]]): Facetas cujas contagens devem ser retornadas (facet[])
             
         Returns:
             str: URL formatada para a consulta
         """
+        if not 0 <= limit <= MAX_PAGE_LIMIT:
+            raise ValueError(f"limit deve estar entre 0 e {MAX_PAGE_LIMIT}")
+        
         params = {
             'lookfor': keywords,
             'type': search_type,
@@ -51,13 +94,22 @@ class BDTDCrawler:
             'prettyPrint': 'false',
             'lng': language
         }
+        if fields:
+            params['field[]'] = list(fields)
+        if filters:
+            params['filter[]'] = list(filters)
+        if facets:
+            params['facet[]'] = list(facets)
         
-        return f"{self.base_url}?{urllib.parse.urlencode(params)}"
+        return f"{self.base_url}?{urllib.parse.urlencode(params, doseq=True)}"
     
     def fetch_results(self, url: str) -> Dict:
         """
         Realiza a requisição HTTP e retorna os resultados.
         
+        Com cache configurado, respostas dentro do TTL são servidas do disco e respostas
+        expiradas são revalidadas via ETag/Last-Modified (HTTP 304 reaproveita o corpo em cache).
+        
         Args:
             url (str): URL de consulta
             
@@ -66,14 +118,64 @@ class BDTDCrawler:
             
         Raises:
             requests.exceptions.RequestException: Se houver erro na requisição
+            ValueError: Se a resposta não for um JSON válido após as novas tentativas
+        """
+        entry = None
+        headers = {}
+        if self.cache is not None:
+            entry = self.cache.get(url)
+            if entry is not None and self.cache.is_fresh(entry):
+                return entry['body']
+            headers = self.cache.conditional_headers(entry)
+        
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.client.get(url, headers=headers)
+                if response.status_code == 304 and entry is not None:
+                    self.cache.touch(url, entry)
+                    return entry['body']
+                response.raise_for_status()
+                results = response.json()
+                if self.cache is not None:
+                    self.cache.set(url, results, response.headers)
+                return results
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # ValueError: corpo JSON truncado nas versões do requests anteriores à 2.27
+                if attempt == self.retries or not self.is_transient_error(e):
+                    print(f"Erro na requisição: {e}")
+                    raise
+                delay = self.backoff * 2 ** attempt
+                print(f"Erro temporário na requisição ({e}). Nova tentativa em {delay:.1f}s...")
+                time.sleep(delay)
+    
+    @staticmethod
+    def is_transient_error(error: Exception) -> bool:
+        """
+        Indica se o erro é temporário (falha de conexão, timeout, resposta truncada ou erro 5xx/429)
+        e, portanto, vale uma nova tentativa.
+        
+        Corpos JSON truncados levantam requests.exceptions.JSONDecodeError a partir do requests 2.27
+        e o ValueError do decodificador JSON nas versões anteriores; os dois casos são reconhecidos.
+        
+        Args:
+            error (Exception): Erro da requisição ou da decodificação da resposta
+            
+        Returns:
+            bool: True se a requisição deve ser repetida
         """
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Erro na requisição: {e}")
-            raise
+        if isinstance(error, requests.exceptions.HTTPError):
+            status = error.response.status_code if error.response is not None else None
+            return status == 429 or (status is not None and status >= 500)
+        if isinstance(error, requests.exceptions.RequestException):
+            return isinstance(error, (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+                getattr(requests.exceptions, 'JSONDecodeError', ())
+            ))
+        # requests < 2.27: response.json() levanta o ValueError do decodificador JSON
+        # (InvalidURL e afins também são ValueError, mas caem no ramo acima)
+        return isinstance(error, ValueError)
 
     def process_authors(self, authors: Dict) -> Dict:
         """
@@ -106,7 +208,7 @@ class BDTDCrawler:
         
         return result
 
-    def process_record(self, record: Dict) -> Dict:
+    def process_record(self, record: Dict) -> BDTDRecord:
         """
         Processa um registro individual extraindo todos os campos.
         
@@ -114,103 +216,344 @@ class BDTDCrawler:
             record (Dict): Registro individual do resultado
             
         Returns:
-            Dict: Registro processado com todos os campos normalizados
+            BDTDRecord: Registro processado, com os campos multivalorados mantidos como listas
         """
         # Processa autores
         authors_info = self.process_authors(record.get('authors', {}))
         
         # Processa URLs
         urls = record.get('urls', [])
-        urls_list = [url.get('url', '') for url in urls]
-        urls_desc = [url.get('desc', '') for url in urls]
         
         # Processa subjects (mantendo a estrutura hierárquica)
         subjects = record.get('subjects', [])
         subjects_flat = [item for sublist in subjects for item in sublist]
         
-        # Cria o dicionário com todos os campos
-        processed = {
-            'id': record.get('id', ''),
-            'title': record.get('title', ''),
+        # Processa o resumo (a API retorna uma lista de parágrafos)
+        summary = record.get('summary', [])
+        if isinstance(summary, str):
+            summary = [summary]
+        
+        return BDTDRecord(
+            id=record.get('id', ''),
+            title=record.get('title', ''),
+            
+            # Campo de resumo
+            abstract=' '.join(summary),
             
             # Campos de autores
-            'primary_authors': '; '.join(authors_info['primary_authors']),
-            'primary_authors_profiles': '; '.join(authors_info['primary_authors_profiles']),
-            'secondary_authors': '; '.join(authors_info['secondary_authors']),
-            'corporate_authors': '; '.join(authors_info['corporate_authors']),
+            primary_authors=authors_info['primary_authors'],
+            primary_authors_profiles=authors_info['primary_authors_profiles'],
+            secondary_authors=authors_info['secondary_authors'],
+            corporate_authors=authors_info['corporate_authors'],
             
             # Campos de formato e idioma
-            'formats': '; '.join(record.get('formats', [])),
-            'languages': '; '.join(record.get('languages', [])),
+            formats=record.get('formats', []),
+            languages=record.get('languages', []),
             
             # Campos de séries
-            'series': '; '.join(record.get('series', [])),
+            series=record.get('series', []),
             
             # Campos de assunto
-            'subjects': '; '.join(subjects_flat),
+            subjects=subjects_flat,
             
             # Campos de URL
-            'urls': '; '.join(urls_list),
-            'urls_descriptions': '; '.join(urls_desc)
-        }
-        
-        return processed
+            urls=[url.get('url', '') for url in urls],
+            urls_descriptions=[url.get('desc', '') for url in urls],
+            
+            # Campos de data
+            publication_dates=record.get('publicationDates', [])
+        )
     
-    def save_to_csv(self, records: List[Dict], filename: Optional[str] = None) -> str:
+    def save_to_csv(self, records: List[BDTDRecord], filename: Optional[str] = None) -> str:
         """
-        Salva os registros processados em um arquivo CSV.
+        Salva os registros processados em um arquivo CSV (ou Parquet, se o nome terminar em .parquet).
         
         Args:
-            records (List[Dict]): Lista de registros processados
+            records (List[BDTDRecord]): Lista de registros processados
             filename (Optional[str]): Nome do arquivo de saída
             
         Returns:
-            str: Nome do arquivo CSV gerado
+            str: Nome do arquivo gerado
         """
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f'bdtd_results_{timestamp}.csv'
         
-        # Cria DataFrame e salva com encoding UTF-8 e separador ponto e vírgula
-        df = pd.DataFrame(records)
-
-        df['urls'] = df['urls'].astype(str).str.replace(';', '|')
-
-        df.to_csv(filename, index=False, encoding='utf-8', sep=';')
+        with RecordWriter(filename) as writer:
+            writer.write(records)
         return filename
     
+    def iter_pages(
+        self,
+        keywords: str,
+        max_pages: Optional[int] = None,
+        max_workers: int = 1,
+        max_records: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Percorre as páginas de uma busca, produzindo a resposta JSON de cada uma em ordem.
+        
+        A primeira página é buscada sozinha para ler o 'resultCount'; as seguintes são requisitadas
+        com até max_workers requisições simultâneas, mantendo no máximo max_workers páginas em memória.
+        A iteração termina na última página existente, em max_pages, ao atingir max_records
+        ou na primeira página vazia. Erros de requisição são propagados para o chamador.
+        
+        Args:
+            keywords (str): Termos de busca
+            max_pages (Optional[int]): Número máximo de páginas (None percorre todas)
+            max_workers (int): Número máximo de páginas requisitadas em paralelo
+            max_records (Optional[int]): Número máximo de registros; a última página é truncada se necessário
+            **kwargs: Parâmetros adicionais para create_query_url (page define a página inicial)
+            
+        Yields:
+            Tuple[int, Dict]: Número da página e resposta JSON da API
+        """
+        start_page = kwargs.pop('page', 1)
+        limit = kwargs.get('limit', 20)
+        
+        def fetch_page(page: int) -> Dict:
+            return self.fetch_results(self.create_query_url(keywords, page=page, **kwargs))
+        
+        def truncate(page: int, results: Dict) -> Dict:
+            if max_records is not None:
+                remaining = max_records - (page - start_page) * limit
+                results['records'] = results.get('records', [])[:max(0, remaining)]
+            return results
+        
+        results = truncate(start_page, fetch_page(start_page))
+        if not results.get('records'):
+            return
+        yield start_page, results
+        
+        last_page = math.ceil(results.get('resultCount', 0) / limit)
+        if max_pages is not None:
+            last_page = min(last_page, start_page + max_pages - 1)
+        if max_records is not None:
+            last_page = min(last_page, start_page + math.ceil(max_records / limit) - 1)
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            pending = deque()
+            next_page = start_page + 1
+            try:
+                while pending or next_page <= last_page:
+                    while next_page <= last_page and len(pending) < max(1, max_workers):
+                        pending.append((next_page, executor.submit(fetch_page, next_page)))
+                        next_page += 1
+                    page, future = pending.popleft()
+                    results = truncate(page, future.result())
+                    if not results.get('records'):
+                        return
+                    yield page, results
+            finally:
+                for _, future in pending:
+                    future.cancel()
+    
+    def iter_records(
+        self,
+        keywords: str,
+        max_pages: Optional[int] = None,
+        max_workers: int = 1,
+        max_records: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[BDTDRecord]:
+        """
+        Produz os registros processados de uma busca, página a página, na ordem de relevância.
+        
+        Args:
+            keywords (str): Termos de busca
+            max_pages (Optional[int]): Número máximo de páginas (None percorre todas)
+            max_workers (int): Número máximo de páginas requisitadas em paralelo
+            max_records (Optional[int]): Número máximo de registros
+            **kwargs: Parâmetros adicionais para create_query_url
+            
+        Yields:
+            BDTDRecord: Registro processado por process_record
+        """
+        pages = self.iter_pages(keywords, max_pages=max_pages, max_workers=max_workers, max_records=max_records, **kwargs)
+        for _, results in pages:
+            for record in results.get('records', []):
+                yield self.process_record(record)
+    
+    def iter_new_records(
+        self,
+        keywords: str,
+        state: HarvestState,
+        max_records: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[List[BDTDRecord]]:
+        """
+        Produz, página a página, apenas os registros ainda não vistos em coletas anteriores.
+        
+        As páginas são percorridas em ordem de data (mais recentes primeiro) e a coleta termina
+        na primeira página sem registros novos ou que já alcance datas anteriores à data mais
+        recente registrada no estado.
+        
+        Os ids conhecidos e a data mais recente são copiados do estado no início da iteração:
+        o chamador pode atualizar o estado a cada página (HarvestState.update) sem encurtar a coleta.
+        
+        Args:
+            keywords (str): Termos de busca
+            state (HarvestState): Estado da coleta anterior (lido apenas no início da iteração)
+            max_records (Optional[int]): Número máximo de registros percorridos
+            **kwargs: Parâmetros adicionais para create_query_url
+            
+        Yields:
+            List[BDTDRecord]: Registros novos de cada página
+        """
+        seen_ids = set(state.seen_ids)
+        newest_date = state.newest_date
+        kwargs['sort'] = 'year'
+        for _, results in self.iter_pages(keywords, max_records=max_records, **kwargs):
+            records = [self.process_record(record) for record in results.get('records', [])]
+            new_records = [record for record in records if str(record.id) not in seen_ids]
+            if new_records:
+                yield new_records
+            
+            oldest = min((max(r.publication_dates) for r in records if r.publication_dates), default='')
+            if not new_records or (newest_date and oldest and oldest < newest_date):
+                return
+    
     def search_and_save(
         self,
         keywords: str,
         filename: Optional[str] = None,
+        max_pages: int = 1,
         **kwargs
     ) -> str:
         """
         Realiza uma busca completa e salva os resultados em CSV.
         
+        Os registros são gravados à medida que cada página chega, sem montar a lista completa em memória.
+        
         Args:
             keywords (str): Termos de busca
             filename (Optional[str]): Nome do arquivo de saída
+            max_pages (int): Número máximo de páginas a percorrer (default: 1)
             **kwargs: Parâmetros adicionais para a busca
             
         Returns:
             str: Nome do arquivo CSV gerado
         """
-        url = self.create_query_url(keywords, **kwargs)
-        results = self.fetch_results(url)
+        if filename is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'bdtd_results_{timestamp}.csv'
         
-        processed_records = []
-        for record in results.get('records', []):
-            processed_record = self.process_record(record)
-            processed_records.append(processed_record)
-            
-        filename = self.save_to_csv(processed_records, filename)
+        results = {}
+        with RecordWriter(filename) as writer:
+            for _, results_page in self.iter_pages(keywords, max_pages=max_pages, **kwargs):
+                if not results:
+                    results = results_page
+                writer.write(self.process_record(record) for record in results_page.get('records', []))
         
         # Adiciona informações sobre a busca
         print(f"Total de registros encontrados: {results.get('resultCount', 0)}")
-        print(f"Registros processados: {len(processed_records)}")
+        print(f"Registros processados: {writer.count}")
         print(f"Status da busca: {results.get('status', 'N/A')}")
         
         return filename
 
-pass
+
+class RecordWriter:
+    """
+    Grava registros processados de forma incremental em CSV (separador ';') ou Parquet,
+    permitindo que a memória usada não dependa do número de páginas coletadas.
+    
+    Registros BDTDRecord são gravados em CSV com os campos multivalorados unidos em texto
+    (ver BDTDRecord.to_row) e em Parquet como colunas do tipo lista.
+    """
+    
+    def __init__(self, filename: str, file_format: Optional[str] = None, append: bool = False):
+        """
+        Inicializa o gravador. O arquivo só é criado quando o primeiro registro é gravado.
+        
+        Args:
+            filename (str): Caminho do arquivo de saída
+            file_format (Optional[str]): 'csv' ou 'parquet'. Se None, é inferido pela extensão.
+            append (bool): Se True, acrescenta ao CSV existente em vez de sobrescrevê-lo (apenas CSV)
+        """
+        if file_format is None:
+            file_format = 'parquet' if filename.lower().endswith('.parquet') else 'csv'
+        if file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Formato de arquivo não suportado: {file_format}")
+        if append and file_format == 'parquet':
+            raise ValueError("Arquivos Parquet não podem ser abertos para acréscimo")
+        
+        self.filename = filename
+        self.file_format = file_format
+        self.append = append
+        self.count = 0
+        self._typed = False
+        self._file = None
+        self._writer = None
+    
+    def _open(self, records: List[Dict]):
+        if self.file_format == 'parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("A gravação em Parquet requer o pacote 'pyarrow' (pip install pyarrow)")
+            if self._typed:
+                schema = BDTDRecord.arrow_schema()
+            else:
+                schema = pa.Table.from_pylist(records).schema
+            self._writer = pq.ParquetWriter(self.filename, schema)
+            return
+        
+        write_header = not (self.append and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0)
+        self._file = open(self.filename, 'a' if self.append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=list(records[0].keys()), delimiter=';')
+        if write_header:
+            self._writer.writeheader()
+    
+    def write(self, records: Iterable[Dict]) -> int:
+        """
+        Grava um lote de registros (tipicamente uma página da busca).
+        
+        Args:
+            records (Iterable[BDTDRecord | Dict]): Registros processados
+            
+        Returns:
+            int: Número de registros gravados neste lote
+        """
+        records = list(records)
+        if not records:
+            return 0
+        if self._writer is None:
+            self._typed = isinstance(records[0], BDTDRecord)
+        if self._typed:
+            if self.file_format == 'parquet':
+                records = [record.to_dict() for record in records]
+            else:
+                records = [record.to_row() for record in records]
+        if self._writer is None:
+            self._open(records)
+        
+        if self.file_format == 'parquet':
+            import pyarrow as pa
+            self._writer.write_table(pa.Table.from_pylist(records, schema=self._writer.schema))
+        else:
+            self._writer.writerows(records)
+            self._file.flush()
+        
+        self.count += len(records)
+        return len(records)
+    
+    def close(self):
+        """
+        Fecha o arquivo de saída.
+        """
+        if self.file_format == 'parquet' and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,180 @@
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+
+def query_key(**params) -> str:
+    """
+    Gera uma chave estável para os parâmetros de uma busca.
+
+    Args:
+        **params: Parâmetros que identificam a busca (keywords, search_type, ...)
+
+    Returns:
+        str: Hash curto dos parâmetros
+    """
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def write_json(path: str, data: Dict):
+    """
+    Grava um JSON de forma atômica (arquivo temporário + rename), de modo que uma execução
+    interrompida nunca deixe o arquivo pela metade.
+
+    Args:
+        path (str): Caminho do arquivo
+        data (Dict): Conteúdo a gravar
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class HarvestState:
+    """
+    Estado persistente da coleta de uma busca: ids já vistos e a data de publicação mais
+    recente encontrada. Permite que execuções seguintes busquem apenas os registros novos.
+    """
+
+    def __init__(self, path: str, query: Optional[Dict] = None):
+        """
+        Carrega o estado do arquivo, se existir.
+
+        Args:
+            path (str): Caminho do arquivo JSON de estado
+            query (Optional[Dict]): Parâmetros da busca, gravados junto ao estado para referência
+        """
+        self.path = path
+        self.query = query or {}
+        self.seen_ids = set()
+        self.newest_date = ''
+        self.last_run = None
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.query = data.get('query', self.query)
+            self.seen_ids = set(data.get('seen_ids', []))
+            self.newest_date = data.get('newest_date', '')
+            self.last_run = data.get('last_run')
+
+    @classmethod
+    def for_query(cls, state_dir: str, keywords: str, search_type: str = "AllFields") -> 'HarvestState':
+        """
+        Retorna o estado associado a uma busca dentro de state_dir.
+
+        Args:
+            state_dir (str): Diretório onde os estados são mantidos
+            keywords (str): Termos de busca
+            search_type (str): Tipo de busca
+
+        Returns:
+            HarvestState: Estado da busca (vazio se ainda não houver coleta anterior)
+        """
+        query = {'keywords': keywords, 'search_type': search_type}
+        path = os.path.join(state_dir, f"harvest_state_{query_key(**query)}.json")
+        return cls(path, query)
+
+    def is_known(self, record_id: str) -> bool:
+        """
+        Verifica se o registro já foi coletado em uma execução anterior.
+        """
+        return str(record_id) in self.seen_ids
+
+    def update(self, records: Iterable):
+        """
+        Registra os ids e as datas de publicação de um lote de registros coletados.
+
+        Args:
+            records (Iterable[BDTDRecord]): Registros coletados
+        """
+        for record in records:
+            self.seen_ids.add(str(record.id))
+            for date in record.publication_dates:
+                if date > self.newest_date:
+                    self.newest_date = date
+
+    def save(self):
+        """
+        Grava o estado em disco.
+        """
+        self.last_run = datetime.now().isoformat(timespec='seconds')
+        write_json(self.path, {
+            'query': self.query,
+            'newest_date': self.newest_date,
+            'last_run': self.last_run,
+            'seen_ids': sorted(self.seen_ids)
+        })
+
+
+class CrawlCheckpoint:
+    """
+    Checkpoint de uma coleta paginada: última página concluída, número de registros gravados
+    e tamanho do arquivo de saída nesse ponto. Permite retomar a coleta após uma falha sem
+    repetir as páginas já gravadas.
+    """
+
+    def __init__(self, path: str, query: Dict):
+        """
+        Carrega o checkpoint, se existir e corresponder à mesma busca.
+
+        Args:
+            path (str): Caminho do arquivo JSON de checkpoint
+            query (Dict): Parâmetros que identificam a busca (termos, tamanho de página, campos...)
+        """
+        self.path = path
+        self.key = query_key(**query)
+        self.last_page = 0
+        self.records = 0
+        self.offset = 0
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('query_key') == self.key:
+                self.last_page = data.get('last_page', 0)
+                self.records = data.get('records', 0)
+                self.offset = data.get('offset', 0)
+
+    @property
+    def resumable(self) -> bool:
+        """
+        Indica se há páginas concluídas de uma coleta anterior interrompida.
+        """
+        return self.last_page > 0
+
+    def save(self, page: int, records: int, offset: int):
+        """
+        Registra a conclusão de uma página.
+
+        Args:
+            page (int): Última página concluída e gravada
+            records (int): Total de registros gravados até essa página
+            offset (int): Tamanho do arquivo de saída após gravar a página
+        """
+        self.last_page = page
+        self.records = records
+        self.offset = offset
+        write_json(self.path, {
+            'query_key': self.key,
+            'last_page': page,
+            'records': records,
+            'offset': offset,
+            'updated_at': datetime.now().isoformat(timespec='seconds')
+        })
+
+    def clear(self):
+        """
+        Remove o checkpoint (coleta concluída).
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.last_page = 0
+        self.records = 0
+        self.offset = 0
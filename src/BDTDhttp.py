@@ -0,0 +1,315 @@
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Timeout padrão (conexão, leitura) em segundos aplicado a todas as requisições
+DEFAULT_TIMEOUT = (10, 60)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+
+def _accept_encoding() -> str:
+    """
+    Monta o cabeçalho Accept-Encoding de acordo com os decodificadores disponíveis.
+    O urllib3 só descomprime brotli se o pacote 'brotli' (ou 'brotlicffi') estiver instalado.
+
+    Returns:
+        str: Valor do cabeçalho Accept-Encoding
+    """
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append('br')
+        except ImportError:
+            pass
+    return ', '.join(encodings)
+
+
+def _enable_http2() -> bool:
+    """
+    Ativa o suporte experimental a HTTP/2 do urllib3 (>= 2.3, requer o pacote 'h2').
+    Servidores que não oferecem HTTP/2 via ALPN continuam sendo acessados por HTTP/1.1.
+
+    Returns:
+        bool: True se o HTTP/2 foi ativado
+    """
+    try:
+        import urllib3.http2
+        urllib3.http2.inject_into_urllib3()
+        return True
+    except (ImportError, AttributeError) as e:
+        print(f"HTTP/2 indisponível ({e}). Usando HTTP/1.1.")
+        return False
+
+
+# Status HTTP que indicam que o servidor está sobrecarregado ou limitando o cliente
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera.
+
+    Args:
+        value (Optional[str]): Valor do cabeçalho
+
+    Returns:
+        Optional[float]: Segundos a aguardar, ou None se ausente/inválido
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostLimiter:
+    """
+    Limitador de requisições de um único host: token bucket para a taxa (requisições/s)
+    e limite de concorrência adaptativo no estilo AIMD. Respostas saudáveis aumentam
+    taxa e concorrência aos poucos; 429/503 reduzem ambas pela metade e suspendem o host
+    pelo tempo indicado em Retry-After.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        max_rate: float = 50.0,
+        min_rate: float = 0.2,
+        rate_step: float = 0.5,
+        concurrency: int = 4,
+        max_concurrency: int = 16
+    ):
+        """
+        Inicializa o limitador.
+
+        Args:
+            rate (float): Taxa inicial de requisições por segundo
+            max_rate (float): Taxa máxima
+            min_rate (float): Taxa mínima após reduções
+            rate_step (float): Aumento da taxa a cada resposta saudável
+            concurrency (int): Limite inicial de requisições simultâneas
+            max_concurrency (int): Limite máximo de requisições simultâneas
+        """
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate_step = rate_step
+        self.limit = float(concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.tokens = 1.0
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float):
+        self.tokens = min(max(1.0, self.limit), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Bloqueia até que o host aceite mais uma requisição.
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.in_flight >= int(self.limit):
+                    wait = None
+                elif self.tokens < 1:
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait)
+
+    def release(self, status: Optional[int] = None, retry_after: Optional[float] = None):
+        """
+        Libera a vaga ocupada por acquire e ajusta os limites conforme a resposta.
+
+        Args:
+            status (Optional[int]): Status HTTP recebido (None se a requisição falhou)
+            retry_after (Optional[float]): Espera pedida pelo servidor, em segundos
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if status in THROTTLE_STATUSES:
+                # Redução multiplicativa
+                self.limit = max(1.0, self.limit / 2)
+                self.rate = max(self.min_rate, self.rate / 2)
+                delay = retry_after if retry_after is not None else 1.0 / self.rate
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            elif status is not None and status < 500:
+                # Aumento aditivo: cerca de +1 de concorrência a cada janela completa de respostas
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+                self.rate = min(self.max_rate, self.rate + self.rate_step)
+            self._cond.notify_all()
+
+
+class RateLimiter:
+    """
+    Conjunto de limitadores adaptativos, um por host.
+    """
+
+    def __init__(self, **limiter_kwargs):
+        """
+        Args:
+            **limiter_kwargs: Parâmetros repassados a cada HostLimiter criado
+        """
+        self.limiter_kwargs = limiter_kwargs
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str) -> HostLimiter:
+        """
+        Retorna o limitador do host, criando-o no primeiro uso.
+        """
+        with self._lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostLimiter(**self.limiter_kwargs)
+            return self.hosts[host]
+
+
+class HTTPClient:
+    """
+    Camada de transporte HTTP compartilhada pelo BDTDCrawler, PDFDownloader e pela raspagem
+    de páginas. Mantém uma única requests.Session com pool de conexões keep-alive por host,
+    negociação de compressão (gzip/deflate e brotli quando disponível) e timeouts consistentes.
+    """
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        pool_connections: int = 20,
+        pool_maxsize: int = 20,
+        http2: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        throttle_retries: int = 3
+    ):
+        """
+        Inicializa o cliente HTTP.
+
+        Args:
+            timeout (float | tuple): Timeout (conexão, leitura) em segundos
+            pool_connections (int): Número de hosts distintos mantidos no pool
+            pool_maxsize (int): Conexões keep-alive mantidas por host
+            http2 (bool): Se True, negocia HTTP/2 com os servidores que o oferecem
+            headers (Optional[Dict[str, str]]): Cabeçalhos adicionais enviados em toda requisição
+            rate_limiter (Optional[RateLimiter]): Limitador adaptativo por host. Se None, usa um RateLimiter padrão.
+            throttle_retries (int): Quantas vezes repetir uma requisição respondida com 429/503
+        """
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.throttle_retries = throttle_retries
+        self.http2 = _enable_http2() if http2 else False
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept-Encoding': _accept_encoding()
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Realiza uma requisição HTTP aplicando o timeout padrão do cliente e o limitador do host.
+
+        Respostas 429/503 reduzem a taxa e a concorrência do host e são repetidas (até
+        throttle_retries vezes) após a espera indicada em Retry-After. Em respostas com
+        stream=True, a vaga do host é liberada assim que os cabeçalhos chegam.
+
+        Args:
+            method (str): Método HTTP
+            url (str): URL da requisição
+            **kwargs: Parâmetros repassados a requests.Session.request
+
+        Returns:
+            requests.Response: Resposta HTTP
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlparse(url).netloc
+        limiter = self.rate_limiter.for_host(host)
+
+        for attempt in range(self.throttle_retries + 1):
+            limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                limiter.release(None)
+                raise
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            limiter.release(response.status_code, retry_after)
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.throttle_retries:
+                return response
+
+            print(f"[{host}] HTTP {response.status_code}: reduzindo para {limiter.rate:.1f} req/s "
+                  f"e {int(limiter.limit)} conexão(ões) simultânea(s).")
+            response.close()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Realiza uma requisição GET (ver request).
+        """
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """
+        Realiza uma requisição HEAD (ver request).
+        """
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self):
+        """
+        Fecha todas as conexões mantidas no pool.
+        """
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """
+    Retorna o cliente HTTP compartilhado pelo processo, criando-o na primeira chamada.
+
+    Returns:
+        HTTPClient: Cliente HTTP padrão
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
@@ -0,0 +1,172 @@
+import re
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from BDTDrecord import BDTDRecord, read_records_table
+
+# Colunas indexadas e seus pesos padrão no ranking bm25 (mais alto = mais relevante)
+INDEX_COLUMNS = ('title', 'subjects', 'authors', 'abstract')
+DEFAULT_WEIGHTS = {'title': 10.0, 'subjects': 5.0, 'authors': 2.0, 'abstract': 1.0}
+
+
+class RecordIndex:
+    """
+    Índice de texto completo local (SQLite FTS5) dos registros coletados.
+
+    Permite refazer buscas sobre os registros já baixados sem consultar a BDTD. O tokenizador
+    'unicode61 remove_diacritics 2' ignora maiúsculas e acentos, de modo que "regressao"
+    encontra "Regressão". Os resultados são ordenados por bm25, com pesos por coluna.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Abre (ou cria) o índice.
+
+        Args:
+            path (str): Arquivo SQLite do índice (":memory:" mantém o índice apenas em memória)
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS records (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+                {', '.join(INDEX_COLUMNS)},
+                tokenize='unicode61 remove_diacritics 2'
+            );
+        """)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def __enter__(self) -> 'RecordIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def _columns(record: BDTDRecord) -> Tuple[str, str, str, str]:
+        authors = record.primary_authors + record.secondary_authors + record.corporate_authors
+        return (record.title, ' '.join(record.subjects), ' '.join(authors), record.abstract)
+
+    def add(self, records: Iterable[BDTDRecord]) -> int:
+        """
+        Indexa um lote de registros. Registros com id já indexado são substituídos.
+
+        Args:
+            records (Iterable[BDTDRecord]): Registros a indexar
+
+        Returns:
+            int: Número de registros indexados
+        """
+        count = 0
+        with self.conn:
+            for record in records:
+                data = json.dumps(record.to_dict(), ensure_ascii=False)
+                row = self.conn.execute("SELECT rowid FROM records WHERE id = ?", (record.id,)).fetchone()
+                if row:
+                    rowid = row[0]
+                    self.conn.execute("DELETE FROM records_fts WHERE rowid = ?", (rowid,))
+                    self.conn.execute("UPDATE records SET data = ? WHERE rowid = ?", (data, rowid))
+                else:
+                    rowid = self.conn.execute(
+                        "INSERT INTO records (id, data) VALUES (?, ?)", (record.id, data)
+                    ).lastrowid
+                self.conn.execute(
+                    f"INSERT INTO records_fts (rowid, {', '.join(INDEX_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                    (rowid,) + self._columns(record)
+                )
+                count += 1
+        return count
+
+    def add_file(self, path: str) -> int:
+        """
+        Indexa os registros de um arquivo de resultados (CSV ou Parquet).
+
+        Args:
+            path (str): Caminho do arquivo gerado pelo BDTDAgent/RecordWriter
+
+        Returns:
+            int: Número de registros indexados
+        """
+        rows = read_records_table(path).to_dict("records")
+        return self.add(BDTDRecord.from_row(row) for row in rows)
+
+    @staticmethod
+    def match_query(text: str, any_term: bool = False, prefix: bool = False) -> str:
+        """
+        Converte um texto livre em uma expressão MATCH do FTS5, com cada termo entre aspas
+        (pontuação e operadores digitados pelo usuário não são interpretados).
+
+        Args:
+            text (str): Termos de busca
+            any_term (bool): Se True, basta um dos termos (OR); senão todos são exigidos (AND)
+            prefix (bool): Se True, cada termo também casa como prefixo ("regress" -> "regressão")
+
+        Returns:
+            str: Expressão MATCH (vazia se não houver termos)
+        """
+        terms = [f'"{term}"' + ('*' if prefix else '') for term in re.findall(r'\w+', text)]
+        return (' OR ' if any_term else ' ').join(terms)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        any_term: bool = False,
+        prefix: bool = False,
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[Tuple[BDTDRecord, float]]:
+        """
+        Busca no índice, ordenando os registros por relevância (bm25).
+
+        Args:
+            query (str): Termos de busca (texto livre)
+            limit (int): Número máximo de resultados
+            any_term (bool): Se True, retorna registros com qualquer um dos termos
+            prefix (bool): Se True, os termos também casam como prefixo
+            weights (Optional[Dict[str, float]]): Pesos por coluna (ver DEFAULT_WEIGHTS)
+
+        Returns:
+            List[Tuple[BDTDRecord, float]]: Registros e pontuações, do mais ao menos relevante
+        """
+        expression = self.match_query(query, any_term=any_term, prefix=prefix)
+        if not expression:
+            return []
+
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        rank = f"bm25(records_fts, {', '.join(str(float(weights[c])) for c in INDEX_COLUMNS)})"
+        rows = self.conn.execute(
+            f"""
+            SELECT r.data, {rank} AS score
+            FROM records_fts JOIN records r ON r.rowid = records_fts.rowid
+            WHERE records_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (expression, limit)
+        ).fetchall()
+
+        results = []
+        for data, score in rows:
+            fields = json.loads(data)
+            record = BDTDRecord(
+                id=fields.pop('id'),
+                title=fields.pop('title'),
+                abstract=fields.pop('abstract', ''),
+                **{k: v for k, v in fields.items() if k in BDTDRecord.LIST_FIELDS}
+            )
+            # bm25 retorna valores negativos (menor = mais relevante)
+            results.append((record, -score))
+        return results
+
+    def close(self):
+        """
+        Fecha a conexão com o banco do índice.
+        """
+        self.conn.close()
@@ -0,0 +1,382 @@
+import os
+import json
+import time
+import argparse
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+
+import requests
+import pandas as pd
+
+from BDTDhttp import HTTPClient, get_client
+from BDTDfinder import BDTDCrawler, RecordWriter
+from BDTDrecord import BDTDRecord, read_records_table, write_records_table
+from BDTDharvest import write_json
+
+# Endpoint OAI-PMH do VuFind da BDTD
+DEFAULT_OAI_URL = "https://bdtd.ibict.br/vufind/OAI/Server"
+
+OAI_NS = {
+    'oai': 'http://www.openarchives.org/OAI/2.0/',
+    'oai_dc': 'http://www.openarchives.org/OAI/2.0/oai_dc/',
+    'dc': 'http://purl.org/dc/elements/1.1/'
+}
+
+
+class OAIError(Exception):
+    """
+    Erro retornado pelo servidor OAI-PMH (elemento <error>) ou resposta que não é um XML válido
+    (código 'invalidResponse').
+    """
+
+    def __init__(self, code: str, message: str):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+class OAIHarvester:
+    """
+    Coletor OAI-PMH para espelhar a coleção da BDTD (ou um set dela) localmente.
+
+    Percorre ListRecords seguindo os resumptionTokens e converte cada registro Dublin Core
+    no mesmo BDTDRecord produzido por BDTDCrawler.process_record. Coletas incrementais
+    usam o parâmetro 'from' com a data da resposta da coleta anterior.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_OAI_URL,
+        metadata_prefix: str = "oai_dc",
+        client: Optional[HTTPClient] = None,
+        retries: int = 3,
+        backoff: float = 1.0
+    ):
+        """
+        Inicializa o coletor.
+
+        Args:
+            base_url (str): URL do endpoint OAI-PMH
+            metadata_prefix (str): Formato de metadados solicitado (apenas oai_dc é convertido)
+            client (Optional[HTTPClient]): Cliente HTTP a ser usado. Se None, usa o cliente compartilhado.
+            retries (int): Novas tentativas de uma requisição após erros temporários
+            backoff (float): Espera inicial (em segundos) entre tentativas, dobrada a cada nova falha
+        """
+        self.base_url = base_url
+        self.metadata_prefix = metadata_prefix
+        self.client = client or get_client()
+        self.retries = retries
+        self.backoff = backoff
+        self.last_response_date = None
+
+    def _request(self, params: Dict) -> ET.Element:
+        """
+        Executa uma requisição OAI-PMH e retorna o elemento raiz da resposta.
+
+        Respostas truncadas ou que não são XML (por exemplo, uma página de erro HTML servida com
+        status 200) são tratadas como erros temporários.
+
+        Raises:
+            OAIError: Se a resposta contiver um erro OAI-PMH ou continuar inválida após as novas tentativas
+            requests.exceptions.RequestException: Se a requisição falhar após as novas tentativas
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.client.get(self.base_url, params=params)
+                response.raise_for_status()
+                root = ET.fromstring(response.content)
+                break
+            except ET.ParseError as e:
+                if attempt == self.retries:
+                    raise OAIError('invalidResponse', f"resposta inválida para {params}: {e}") from e
+                delay = self.backoff * 2 ** attempt
+                print(f"Resposta OAI-PMH inválida ({e}). Nova tentativa em {delay:.1f}s...")
+                time.sleep(delay)
+            except requests.exceptions.RequestException as e:
+                if attempt == self.retries or not BDTDCrawler.is_transient_error(e):
+                    raise
+                delay = self.backoff * 2 ** attempt
+                print(f"Erro temporário no OAI-PMH ({e}). Nova tentativa em {delay:.1f}s...")
+                time.sleep(delay)
+
+        error = root.find('oai:error', OAI_NS)
+        if error is not None:
+            raise OAIError(error.get('code', ''), (error.text or '').strip())
+        return root
+
+    def list_records(
+        self,
+        set_spec: Optional[str] = None,
+        from_date: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Iterator[List[ET.Element]]:
+        """
+        Percorre ListRecords, produzindo os elementos <record> de cada resposta.
+
+        Args:
+            set_spec (Optional[str]): Set a coletar (None coleta toda a coleção)
+            from_date (Optional[str]): Data inicial (datestamp OAI) para coleta incremental
+            until (Optional[str]): Data final (datestamp OAI)
+
+        Yields:
+            List[ET.Element]: Registros de uma resposta
+        """
+        params = {'verb': 'ListRecords', 'metadataPrefix': self.metadata_prefix}
+        if set_spec:
+            params['set'] = set_spec
+        if from_date:
+            params['from'] = from_date
+        if until:
+            params['until'] = until
+
+        first = True
+        while True:
+            try:
+                root = self._request(params)
+            except OAIError as e:
+                if e.code == 'noRecordsMatch':
+                    return
+                raise
+
+            if first:
+                self.last_response_date = root.findtext('oai:responseDate', default=None, namespaces=OAI_NS)
+                first = False
+
+            list_records = root.find('oai:ListRecords', OAI_NS)
+            if list_records is None:
+                return
+            yield list_records.findall('oai:record', OAI_NS)
+
+            token = list_records.find('oai:resumptionToken', OAI_NS)
+            if token is None or not (token.text or '').strip():
+                return
+            # Requisições com resumptionToken não podem repetir os demais argumentos
+            params = {'verb': 'ListRecords', 'resumptionToken': token.text.strip()}
+
+    @staticmethod
+    def record_id(identifier: str) -> str:
+        """
+        Converte o identificador OAI ('oai:<repositório>:<id>') no id usado pela API de busca.
+
+        Args:
+            identifier (str): Identificador OAI do registro
+
+        Returns:
+            str: Id do registro
+        """
+        if identifier.startswith('oai:') and identifier.count(':') >= 2:
+            return identifier.split(':', 2)[2]
+        return identifier
+
+    def deleted_id(self, record: ET.Element) -> Optional[str]:
+        """
+        Retorna o id de um registro marcado como removido no repositório (header status="deleted").
+
+        Args:
+            record (ET.Element): Elemento <record> da resposta
+
+        Returns:
+            Optional[str]: Id do registro removido, ou None se o registro não foi removido
+        """
+        header = record.find('oai:header', OAI_NS)
+        if header is None or header.get('status') != 'deleted':
+            return None
+        return self.record_id(header.findtext('oai:identifier', default='', namespaces=OAI_NS))
+
+    def process_record(self, record: ET.Element) -> Optional[BDTDRecord]:
+        """
+        Converte um registro oai_dc no esquema normalizado de BDTDCrawler.process_record.
+
+        Args:
+            record (ET.Element): Elemento <record> da resposta
+
+        Returns:
+            Optional[BDTDRecord]: Registro normalizado, ou None se o registro foi removido
+        """
+        header = record.find('oai:header', OAI_NS)
+        if header is None or header.get('status') == 'deleted':
+            return None
+
+        dc = record.find('oai:metadata/oai_dc:dc', OAI_NS)
+        if dc is None:
+            return None
+
+        def values(element: str) -> List[str]:
+            return [e.text.strip() for e in dc.findall(f'dc:{element}', OAI_NS) if e.text and e.text.strip()]
+
+        titles = values('title')
+        identifiers = values('identifier')
+        return BDTDRecord(
+            id=self.record_id(header.findtext('oai:identifier', default='', namespaces=OAI_NS)),
+            title=titles[0] if titles else '',
+            abstract=' '.join(values('description')),
+            primary_authors=values('creator'),
+            secondary_authors=values('contributor'),
+            formats=values('type'),
+            languages=values('language'),
+            subjects=values('subject'),
+            urls=[i for i in identifiers if i.startswith(('http://', 'https://'))],
+            publication_dates=[date[:4] for date in values('date')]
+        )
+
+    def iter_records(
+        self,
+        set_spec: Optional[str] = None,
+        from_date: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Iterator[List[BDTDRecord]]:
+        """
+        Produz os registros normalizados de cada resposta de ListRecords.
+
+        Args:
+            set_spec (Optional[str]): Set a coletar
+            from_date (Optional[str]): Data inicial (datestamp OAI)
+            until (Optional[str]): Data final (datestamp OAI)
+
+        Yields:
+            List[BDTDRecord]: Registros normalizados de uma resposta (removidos são descartados)
+        """
+        for records in self.list_records(set_spec=set_spec, from_date=from_date, until=until):
+            processed = (self.process_record(record) for record in records)
+            yield [record for record in processed if record is not None]
+
+    def harvest(
+        self,
+        filename: str,
+        set_spec: Optional[str] = None,
+        from_date: Optional[str] = None,
+        until: Optional[str] = None,
+        state_path: Optional[str] = None
+    ) -> str:
+        """
+        Coleta os registros e os grava em CSV ou Parquet à medida que chegam.
+
+        Com state_path, a coleta é incremental: a data da resposta da última coleta concluída
+        é usada como 'from' (quando from_date não é informado) e atualizada ao final.
+
+        Os registros coletados são gravados primeiro em um arquivo de delta ('<nome>.delta.<ext>').
+        Se o espelho (filename) já existir, o delta é incorporado a ele por id: registros novos
+        são acrescentados, os alterados substituem a versão anterior e os removidos no
+        repositório (header status="deleted") são excluídos.
+
+        Args:
+            filename (str): Arquivo de saída (.csv ou .parquet)
+            set_spec (Optional[str]): Set a coletar
+            from_date (Optional[str]): Data inicial (datestamp OAI)
+            until (Optional[str]): Data final (datestamp OAI)
+            state_path (Optional[str]): Arquivo JSON com as datas das coletas anteriores
+
+        Returns:
+            str: Caminho do arquivo gerado
+        """
+        state = {}
+        state_key = f"{self.base_url}|{self.metadata_prefix}|{set_spec or ''}"
+        if state_path and os.path.exists(state_path):
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        if from_date is None and state_key in state:
+            from_date = state[state_key]
+            print(f"==> Coleta incremental a partir de {from_date}")
+
+        base, ext = os.path.splitext(filename)
+        delta_path = f"{base}.delta{ext}"
+        deleted = set()
+        with RecordWriter(delta_path) as writer:
+            for records in self.list_records(set_spec=set_spec, from_date=from_date, until=until):
+                processed = []
+                for record in records:
+                    deleted_id = self.deleted_id(record)
+                    if deleted_id is not None:
+                        deleted.add(deleted_id)
+                        continue
+                    record = self.process_record(record)
+                    if record is not None:
+                        processed.append(record)
+                writer.write(processed)
+                print(f"Registros coletados: {writer.count}")
+
+        self.merge(filename, delta_path if writer.count else None, deleted)
+
+        if state_path and self.last_response_date:
+            state[state_key] = self.last_response_date
+            write_json(state_path, state)
+
+        print(f"Total de registros coletados: {writer.count} ({len(deleted)} removido(s))")
+        return filename
+
+    @staticmethod
+    def merge(filename: str, delta_path: Optional[str], deleted: set):
+        """
+        Incorpora um delta ao espelho: cada id fica com a versão do delta, e os ids removidos
+        saem do espelho. Sem espelho anterior, o delta passa a ser o espelho. O arquivo de
+        delta é removido ao final.
+
+        Args:
+            filename (str): Espelho (.csv ou .parquet)
+            delta_path (Optional[str]): Registros coletados (None se nenhum registro foi coletado)
+            deleted (set): Ids removidos no repositório
+        """
+        if not os.path.exists(filename):
+            if delta_path:
+                os.replace(delta_path, filename)
+            return
+        if not delta_path and not deleted:
+            return
+
+        mirror = read_records_table(filename)
+        if delta_path:
+            delta = read_records_table(delta_path)
+            # Um id listado no delta como removido e depois recriado permanece
+            deleted = deleted - set(delta['id'].astype(str))
+            mirror = pd.concat([delta, mirror]).drop_duplicates(subset='id', keep='first')
+        if deleted:
+            mirror = mirror[~mirror['id'].astype(str).isin(deleted)]
+
+        # Grava em um arquivo temporário e o renomeia: o espelho anterior não é perdido se a gravação falhar
+        tmp_path = f"{os.path.splitext(filename)[0]}.merge{os.path.splitext(filename)[1]}"
+        write_records_table(mirror, tmp_path)
+        os.replace(tmp_path, filename)
+        if delta_path and os.path.exists(delta_path):
+            os.remove(delta_path)
+
+
+def parse_arguments():
+    """
+    Faz o parsing dos argumentos de linha de comando e retorna-os.
+
+    Returns:
+        argparse.Namespace: Objeto contendo os argumentos parseados.
+    """
+    parser = argparse.ArgumentParser(
+        description="Coleta em massa dos metadados da BDTD via OAI-PMH."
+    )
+    parser.add_argument("output", type=str, help="Arquivo de saída (.csv ou .parquet).")
+    parser.add_argument("--base_url", type=str, default=DEFAULT_OAI_URL, help="Endpoint OAI-PMH.")
+    parser.add_argument("--set", dest="set_spec", type=str, default=None, help="Set a coletar.")
+    parser.add_argument("--from", dest="from_date", type=str, default=None, help="Data inicial (datestamp OAI).")
+    parser.add_argument("--until", type=str, default=None, help="Data final (datestamp OAI).")
+    parser.add_argument(
+        "--state",
+        type=str,
+        default=None,
+        help="Arquivo de estado para coletas incrementais (guarda a data da última coleta)."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    Ponto de entrada quando executado via linha de comando.
+    """
+    args = parse_arguments()
+    harvester = OAIHarvester(base_url=args.base_url)
+    harvester.harvest(
+        args.output,
+        set_spec=args.set_spec,
+        from_date=args.from_date,
+        until=args.until,
+        state_path=args.state
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from typing import Iterable, Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Backends do BeautifulSoup aceitos, do mais para o menos rápido
+HTML_PARSERS = ('lxml', 'html.parser')
+
+# Tags usadas na busca de PDFs: links, iframes e metadados (citation_pdf_url, generator)
+LINK_TAGS = ('a', 'iframe', 'meta')
+
+# Tags cujo conteúdo não é texto da página (ignoradas também pelo get_text do BeautifulSoup)
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+_default_parser: Optional[str] = None
+
+
+def html_parser(name: Optional[str] = None) -> str:
+    """
+    Escolhe o backend do BeautifulSoup.
+
+    Args:
+        name (Optional[str]): 'lxml' ou 'html.parser'. Se None, usa 'lxml' quando instalado
+            (várias vezes mais rápido) e, caso contrário, o 'html.parser' da biblioteca padrão.
+
+    Returns:
+        str: Nome do backend
+
+    Raises:
+        ValueError: Se o backend não for suportado
+        ImportError: Se 'lxml' for pedido sem estar instalado
+    """
+    global _default_parser
+    if name is None:
+        if _default_parser is None:
+            try:
+                BeautifulSoup('', 'lxml')
+                _default_parser = 'lxml'
+            except FeatureNotFound:
+                _default_parser = 'html.parser'
+        return _default_parser
+    if name not in HTML_PARSERS:
+        raise ValueError(f"Backend de HTML não suportado: {name} (use {', '.join(HTML_PARSERS)})")
+    if name == 'lxml':
+        try:
+            BeautifulSoup('', 'lxml')
+        except FeatureNotFound:
+            raise ImportError("O backend 'lxml' requer o pacote 'lxml' (pip install .[html])")
+    return name
+
+
+def parse_html(html: str, parser: Optional[str] = None,
+               only: Optional[Iterable[str]] = LINK_TAGS) -> BeautifulSoup:
+    """
+    Analisa uma página, construindo apenas as tags necessárias.
+
+    Com only (padrão: links, iframes e metadados), a árvore contém só essas tags e seus
+    conteúdos, o que basta para a busca de PDFs (find_pdf_links, adaptadores e regras por
+    padrão ou texto do link) e evita montar o restante do documento.
+
+    Args:
+        html (str): Conteúdo HTML
+        parser (Optional[str]): Backend (ver html_parser)
+        only (Optional[Iterable[str]]): Tags a construir; None constrói a árvore completa
+
+    Returns:
+        BeautifulSoup: Página analisada
+    """
+    parse_only = SoupStrainer(list(only)) if only is not None else None
+    return BeautifulSoup(html, html_parser(parser), parse_only=parse_only)
+
+
+def html_text(html: str, parser: Optional[str] = None) -> str:
+    """
+    Extrai o texto de uma página (sem HTML), com as partes separadas por espaços.
+
+    Usa o selectolax (pip install .[html]) quando instalado e nenhum backend for pedido,
+    sem construir uma árvore do BeautifulSoup; caso contrário, o BeautifulSoup.
+
+    Args:
+        html (str): Conteúdo HTML
+        parser (Optional[str]): Backend do BeautifulSoup (ver html_parser)
+
+    Returns:
+        str: Texto da página
+    """
+    if HTMLParser is not None and parser is None:
+        tree = HTMLParser(html)
+        tree.strip_tags(list(NON_TEXT_TAGS))
+        return tree.text(separator=' ', strip=True)
+    return BeautifulSoup(html, html_parser(parser)).get_text(separator=' ', strip=True)
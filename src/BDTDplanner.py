@@ -0,0 +1,244 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from BDTDfinder import BDTDCrawler, MAX_PAGE_LIMIT, RECORD_FIELDS
+from BDTDrecord import BDTDRecord
+
+# Facetas usadas, em ordem, para dividir uma busca grande em subconsultas disjuntas
+DEFAULT_PARTITION_FACETS = ('publishDate', 'format')
+
+
+def facet_filter(facet: str, value: str, exclude: bool = False) -> str:
+    """
+    Monta um filtro de faceta no formato aceito pelo parâmetro filter[] do VuFind.
+
+    Args:
+        facet (str): Nome da faceta
+        value (str): Valor da faceta
+        exclude (bool): Se True, gera o filtro negado (registros sem esse valor)
+
+    Returns:
+        str: Filtro, ex.: 'publishDate:"2020"' ou '-publishDate:"2020"'
+    """
+    escaped = str(value).replace('"', '\\"')
+    return f'{"-" if exclude else ""}{facet}:"{escaped}"'
+
+
+class PartitionHarvestError(Exception):
+    """
+    Uma ou mais partições falharam durante a coleta (ver QueryPlanner.iter_partition_records).
+    """
+
+    def __init__(self, failures: List[Tuple['QueryPartition', Exception]]):
+        """
+        Args:
+            failures (List[Tuple[QueryPartition, Exception]]): Partições que falharam e seus erros
+        """
+        self.failures = failures
+        super().__init__(f"{len(failures)} partição(ões) não coletada(s): "
+                         + '; '.join(f"{partition.filters}: {error}" for partition, error in failures))
+
+
+class QueryPartition:
+    """
+    Subconsulta de uma busca: os mesmos termos restritos por um conjunto de filtros de faceta.
+    """
+
+    __slots__ = ('filters', 'count')
+
+    def __init__(self, filters: List[str], count: int):
+        """
+        Args:
+            filters (List[str]): Filtros (filter[]) que definem a partição
+            count (int): Número de registros da partição informado pela API
+        """
+        self.filters = filters
+        self.count = count
+
+    def __repr__(self) -> str:
+        return f"QueryPartition(filters={self.filters!r}, count={self.count})"
+
+
+class QueryPlanner:
+    """
+    Divide uma busca muito ampla em partições disjuntas de tamanho controlado, usando as
+    contagens de facetas da API (por ano de publicação e, se ainda grandes, por tipo de documento).
+    Cada partição pode ser percorrida em paralelo e sem paginação profunda; os registros são
+    depois combinados e deduplicados por id.
+    """
+
+    def __init__(
+        self,
+        crawler: Optional[BDTDCrawler] = None,
+        max_partition_size: int = 2000,
+        facets: Tuple[str, ...] = DEFAULT_PARTITION_FACETS
+    ):
+        """
+        Inicializa o planejador.
+
+        Args:
+            crawler (Optional[BDTDCrawler]): Crawler usado nas consultas. Se None, cria um novo.
+            max_partition_size (int): Número máximo de registros desejado por partição
+            facets (Tuple[str, ...]): Facetas usadas, em ordem, para subdividir as partições
+        """
+        self.crawler = crawler or BDTDCrawler()
+        self.max_partition_size = max_partition_size
+        self.facets = facets
+
+    def _facet_counts(self, keywords: str, filters: List[str], facet: Optional[str], **kwargs) -> Tuple[int, List[Tuple[str, int]]]:
+        """
+        Consulta o total de registros e as contagens de uma faceta, sem baixar registros.
+        """
+        url = self.crawler.create_query_url(
+            keywords,
+            limit=0,
+            filters=filters,
+            facets=[facet] if facet else None,
+            **kwargs
+        )
+        results = self.crawler.fetch_results(url)
+        values = []
+        for item in results.get('facets', {}).get(facet, []) if facet else []:
+            value = item.get('value')
+            if value is not None and item.get('count', 0) > 0:
+                values.append((str(value), item['count']))
+        return results.get('resultCount', 0), values
+
+    def plan(self, keywords: str, filters: Optional[List[str]] = None, **kwargs) -> List[QueryPartition]:
+        """
+        Gera as partições da busca.
+
+        Partições acima de max_partition_size são subdivididas pela próxima faceta. Registros
+        que não aparecem nas contagens da faceta (sem valor, ou fora da lista retornada pela API)
+        formam uma partição complementar com os valores conhecidos excluídos, de modo que a
+        união das partições cubra toda a busca.
+
+        A soma das partições é conferida com o total da busca não particionada. Se não bater
+        (faceta multivalorada, como um registro com os formatos "Dissertação" e "Tese", que
+        aparece em mais de uma partição), o trecho é mantido como uma única partição e
+        percorrido por paginação, sem subdivisão.
+
+        Args:
+            keywords (str): Termos de busca
+            filters (Optional[List[str]]): Filtros já aplicados à busca
+            **kwargs: Parâmetros adicionais para create_query_url (search_type, language...)
+
+        Returns:
+            List[QueryPartition]: Partições disjuntas da busca
+        """
+        return self._plan(keywords, list(filters or []), 0, None, **kwargs)
+
+    def _plan(self, keywords: str, filters: List[str], depth: int, count: Optional[int], **kwargs) -> List[QueryPartition]:
+        facet = self.facets[depth] if depth < len(self.facets) else None
+        if count is not None and (count <= self.max_partition_size or facet is None):
+            if count > self.max_partition_size:
+                print(f"Aviso: partição {filters} com {count} registros não pode ser subdividida.")
+            return [QueryPartition(filters, count)]
+
+        total, values = self._facet_counts(keywords, filters, facet, **kwargs)
+        if total <= self.max_partition_size or facet is None or not values:
+            if facet is not None and not values and total > self.max_partition_size:
+                return self._plan(keywords, filters, depth + 1, None, **kwargs)
+            if total > self.max_partition_size:
+                print(f"Aviso: partição {filters} com {total} registros não pode ser subdividida.")
+            return [QueryPartition(filters, total)] if total else []
+
+        covered = sum(value_count for _, value_count in values)
+        if covered > total:
+            # Registros contados em mais de um valor: a faceta não divide este trecho
+            return self._unpartitioned(filters, total, facet, covered)
+
+        partitions = []
+        for value, value_count in values:
+            sub_filters = filters + [facet_filter(facet, value)]
+            partitions.extend(self._plan(keywords, sub_filters, depth + 1, value_count, **kwargs))
+
+        if covered < total:
+            # A API limita o número de valores por faceta: o complemento é planejado de novo pela
+            # mesma faceta, que então retorna os próximos valores mais frequentes
+            rest_filters = filters + [facet_filter(facet, value, exclude=True) for value, _ in values]
+            partitions.extend(self._plan(keywords, rest_filters, depth, None, **kwargs))
+
+        planned = sum(partition.count for partition in partitions)
+        if planned != total:
+            # A sobreposição também pode aparecer só nos valores seguintes ou no complemento
+            return self._unpartitioned(filters, total, facet, planned)
+        return partitions
+
+    @staticmethod
+    def _unpartitioned(filters: List[str], total: int, facet: str, planned: int) -> List[QueryPartition]:
+        """
+        Mantém o trecho como uma única partição quando a divisão pela faceta não soma o total.
+        """
+        print(f"Aviso: partições de {filters or 'busca'} por {facet} somam {planned} registros, "
+              f"mas a busca tem {total}; o trecho será percorrido sem partição.")
+        return [QueryPartition(filters, total)] if total else []
+
+    def iter_partition_records(
+        self,
+        keywords: str,
+        partitions: List[QueryPartition],
+        max_workers: int = 4,
+        **kwargs
+    ) -> Iterator[Tuple[QueryPartition, List[BDTDRecord]]]:
+        """
+        Coleta as partições em paralelo, produzindo os registros de cada partição assim que
+        ela termina. Registros com id já produzido por outra partição são descartados.
+        Uma partição que falha não interrompe as demais; ao final, se alguma falhou, a iteração
+        levanta PartitionHarvestError com as partições não coletadas.
+
+        Args:
+            keywords (str): Termos de busca
+            partitions (List[QueryPartition]): Partições geradas por plan
+            max_workers (int): Número de partições coletadas simultaneamente
+            **kwargs: Parâmetros adicionais para create_query_url
+
+        Yields:
+            Tuple[QueryPartition, List[BDTDRecord]]: Partição concluída e seus registros inéditos
+
+        Raises:
+            PartitionHarvestError: Depois das partições concluídas, se alguma partição falhou
+        """
+        kwargs.setdefault('limit', MAX_PAGE_LIMIT)
+        kwargs.setdefault('fields', RECORD_FIELDS)
+        seen_ids = set()
+        lock = threading.Lock()
+
+        def harvest(partition: QueryPartition) -> List[BDTDRecord]:
+            records = list(self.crawler.iter_records(keywords, filters=partition.filters, **kwargs))
+            with lock:
+                unique = [record for record in records if record.id not in seen_ids]
+                seen_ids.update(record.id for record in unique)
+            return unique
+
+        failures = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(harvest, partition): partition for partition in partitions}
+            for future in as_completed(futures):
+                partition = futures[future]
+                try:
+                    records = future.result()
+                except Exception as e:
+                    print(f"Erro na partição {partition.filters}: {e}")
+                    failures.append((partition, e))
+                    continue
+                yield partition, records
+        if failures:
+            raise PartitionHarvestError(failures)
+
+    def summary(self, partitions: List[QueryPartition]) -> Dict:
+        """
+        Resume o plano: número de partições, total de registros e maior partição.
+
+        Args:
+            partitions (List[QueryPartition]): Partições geradas por plan
+
+        Returns:
+            Dict: Resumo do plano
+        """
+        return {
+            'partitions': len(partitions),
+            'records': sum(partition.count for partition in partitions),
+            'largest': max((partition.count for partition in partitions), default=0)
+        }
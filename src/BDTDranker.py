@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from BDTDtext import fold_text, term_counts, text_series, tokenize
+
+# Campos pontuados e seus pesos padrão: um termo no título vale mais que nos assuntos ou no resumo
+DEFAULT_FIELD_WEIGHTS = {'title': 3.0, 'subjects': 2.0, 'abstract': 1.0}
+
+
+class RecordRanker:
+    """
+    Ordena registros por relevância em relação aos termos do assunto usando BM25.
+
+    Cada campo (título, assuntos, resumo) é pontuado separadamente e as pontuações são somadas
+    com os pesos de cada campo. As frequências dos termos são contadas de forma vetorizada sobre
+    a coluna inteira (uma passada por termo), ignorando acentos e maiúsculas.
+    """
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None, k1: float = 1.2, b: float = 0.75):
+        """
+        Inicializa o ranqueador.
+
+        Args:
+            field_weights (Optional[Dict[str, float]]): Peso de cada campo (ver DEFAULT_FIELD_WEIGHTS)
+            k1 (float): Saturação da frequência dos termos no BM25
+            b (float): Normalização pelo tamanho do campo no BM25
+        """
+        self.field_weights = field_weights or dict(DEFAULT_FIELD_WEIGHTS)
+        self.k1 = k1
+        self.b = b
+
+    @staticmethod
+    def query_terms(query: str) -> List[str]:
+        """
+        Extrai os termos distintos da consulta (sem distinção de acentos e maiúsculas).
+
+        Args:
+            query (str): Termos de busca
+
+        Returns:
+            List[str]: Termos distintos, na ordem em que aparecem
+        """
+        terms = {}
+        for term in tokenize(query):
+            terms.setdefault(fold_text(term), term)
+        return list(terms.values())
+
+    def _bm25(self, texts: pd.Series, terms: List[str]) -> np.ndarray:
+        """
+        Pontua um campo com BM25 para os termos da consulta.
+        """
+        # Matriz documentos x termos com as frequências de cada termo
+        counts = np.column_stack([term_counts(texts, term) for term in terms])
+        # O tamanho em caracteres substitui a contagem de palavras: o BM25 só usa o tamanho
+        # relativo à média do campo, e contá-lo assim é muito mais barato em textos longos
+        lengths = texts.str.len().to_numpy(dtype=float)
+        avg_length = lengths.mean() or 1.0
+
+        doc_freq = (counts > 0).sum(axis=0)
+        idf = np.log(1.0 + (len(texts) - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / avg_length)
+        saturated = counts * (self.k1 + 1.0) / (counts + norm[:, None])
+        return saturated @ idf
+
+    def score(self, df: pd.DataFrame, query: str) -> np.ndarray:
+        """
+        Calcula a pontuação de cada registro para a consulta.
+
+        Args:
+            df (pd.DataFrame): Tabela de registros (campos ausentes são ignorados)
+            query (str): Termos de busca
+
+        Returns:
+            np.ndarray: Pontuação por linha de df (0 = nenhum termo encontrado)
+        """
+        scores = np.zeros(len(df))
+        terms = self.query_terms(query)
+        if not terms or df.empty:
+            return scores
+        for field, weight in self.field_weights.items():
+            if field in df.columns and weight:
+                scores += weight * self._bm25(text_series(df[field]), terms)
+        return scores
+
+    def rank(self, df: pd.DataFrame, query: str, top_k: Optional[int] = None) -> pd.DataFrame:
+        """
+        Ordena os registros pela pontuação, descartando os que não contêm nenhum termo.
+
+        Args:
+            df (pd.DataFrame): Tabela de registros
+            query (str): Termos de busca
+            top_k (Optional[int]): Número máximo de registros retornados (None retorna todos)
+
+        Returns:
+            pd.DataFrame: Registros ordenados do mais ao menos relevante, com a coluna 'score'
+        """
+        ranked = df.assign(score=self.score(df, query))
+        ranked = ranked[ranked['score'] > 0].sort_values('score', ascending=False, kind='stable')
+        return ranked.head(top_k) if top_k else ranked
@@ -0,0 +1,194 @@
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Separadores usados na representação textual (CSV) dos campos multivalorados
+LIST_SEPARATOR = '; '
+URL_SEPARATOR = '|'
+
+
+class BDTDRecord:
+    """
+    Registro normalizado de uma tese/dissertação da BDTD.
+
+    Usa __slots__ para evitar um dicionário por instância e mantém os campos multivalorados
+    (autores, assuntos, URLs, formatos...) como listas. A conversão para texto só acontece
+    na gravação em CSV (to_row); em Parquet os campos viram colunas do tipo lista.
+    """
+
+    SCALAR_FIELDS = ('id', 'title', 'abstract')
+    LIST_FIELDS = (
+        'primary_authors',
+        'primary_authors_profiles',
+        'secondary_authors',
+        'corporate_authors',
+        'formats',
+        'languages',
+        'series',
+        'subjects',
+        'urls',
+        'urls_descriptions',
+        'publication_dates'
+    )
+    FIELDS = SCALAR_FIELDS + LIST_FIELDS
+
+    __slots__ = FIELDS
+
+    def __init__(self, id: str = '', title: str = '', abstract: str = '', **lists: List[str]):
+        """
+        Inicializa o registro.
+
+        Args:
+            id (str): Identificador do registro na BDTD
+            title (str): Título do trabalho
+            abstract (str): Resumo do trabalho
+            **lists: Campos multivalorados (ver LIST_FIELDS); campos ausentes ficam vazios
+        """
+        unknown = set(lists) - set(self.LIST_FIELDS)
+        if unknown:
+            raise TypeError(f"Campos desconhecidos: {', '.join(sorted(unknown))}")
+
+        self.id = id
+        self.title = title
+        self.abstract = abstract
+        for field in self.LIST_FIELDS:
+            setattr(self, field, list(lists.get(field) or []))
+
+    def __repr__(self) -> str:
+        return f"BDTDRecord(id={self.id!r}, title={self.title!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BDTDRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    def to_dict(self) -> Dict:
+        """
+        Converte o registro em dicionário, mantendo os campos multivalorados como listas.
+
+        Returns:
+            Dict: Registro com listas
+        """
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def to_row(self) -> Dict[str, str]:
+        """
+        Converte o registro em uma linha de texto para CSV. As URLs são unidas por '|'
+        e os demais campos multivalorados por '; '.
+
+        Returns:
+            Dict[str, str]: Linha do CSV
+        """
+        row = {field: getattr(self, field) for field in self.SCALAR_FIELDS}
+        for field in self.LIST_FIELDS:
+            separator = URL_SEPARATOR if field == 'urls' else LIST_SEPARATOR
+            row[field] = separator.join(getattr(self, field))
+        return row
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'BDTDRecord':
+        """
+        Reconstrói um registro a partir de uma linha de CSV ou Parquet.
+
+        Args:
+            row (Dict): Linha lida com read_records_table (campos como texto ou listas)
+
+        Returns:
+            BDTDRecord: Registro reconstruído
+        """
+        lists = {}
+        for field in cls.LIST_FIELDS:
+            separator = URL_SEPARATOR if field == 'urls' else LIST_SEPARATOR
+            lists[field] = split_field(row.get(field), separator)
+        return cls(
+            id=_to_str(row.get('id')),
+            title=_to_str(row.get('title')),
+            abstract=_to_str(row.get('abstract')),
+            **lists
+        )
+
+    @classmethod
+    def arrow_schema(cls):
+        """
+        Retorna o schema Arrow do registro, com os campos multivalorados como list<string>.
+
+        Returns:
+            pyarrow.Schema: Schema para gravação em Parquet
+        """
+        import pyarrow as pa
+        return pa.schema(
+            [(field, pa.string()) for field in cls.SCALAR_FIELDS]
+            + [(field, pa.list_(pa.string())) for field in cls.LIST_FIELDS]
+        )
+
+
+def _to_str(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return str(value)
+
+
+def split_field(value, separator: str = LIST_SEPARATOR) -> List[str]:
+    """
+    Converte um campo multivalorado lido de CSV (texto) ou Parquet (lista/array) em lista.
+
+    Args:
+        value: Valor do campo
+        separator (str): Separador usado na representação textual
+
+    Returns:
+        List[str]: Valores não vazios do campo
+    """
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    if isinstance(value, str):
+        items = value.split(separator.strip()) if separator.strip() else value.split(separator)
+    elif isinstance(value, (int, float)):
+        items = [value]
+    else:
+        items = list(value)
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def split_urls(value) -> List[str]:
+    """
+    Retorna a lista de URLs de um registro lido de CSV ('|') ou Parquet (lista).
+
+    Args:
+        value: Valor do campo 'urls'
+
+    Returns:
+        List[str]: URLs do registro
+    """
+    return split_field(value, URL_SEPARATOR)
+
+
+def read_records_table(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lê um arquivo de resultados em CSV (separador ';') ou Parquet.
+    As colunas do CSV são lidas como texto, para que ids e datas não sejam convertidos em números.
+
+    Args:
+        path (str): Caminho do arquivo
+        columns (Optional[List[str]]): Colunas a carregar (None carrega todas)
+
+    Returns:
+        pd.DataFrame: Tabela de registros
+    """
+    if path.lower().endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, sep=';', usecols=columns, dtype=str)
+
+
+def write_records_table(df: pd.DataFrame, path: str):
+    """
+    Grava uma tabela de registros em CSV (separador ';') ou Parquet, de acordo com a extensão.
+
+    Args:
+        df (pd.DataFrame): Tabela de registros
+        path (str): Caminho do arquivo
+    """
+    if path.lower().endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8', sep=';')
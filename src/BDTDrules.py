@@ -0,0 +1,346 @@
+import os
+import re
+import json
+import math
+import threading
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from BDTDharvest import write_json
+
+# Nome do arquivo com as regras aprendidas, mantido na raiz do repositório de PDFs (PDFStore)
+LINK_RULES_FILE = 'rules.json'
+
+# Tipos de regra, na ordem em que são derivadas de um link que levou a um PDF
+RULE_KINDS = ('template', 'pattern', 'text', 'position')
+
+# Trechos variáveis de uma URL: números e identificadores hexadecimais (UUIDs, hashes)
+_NUMERIC = re.compile(r'^\d+$')
+_HEX_ID = re.compile(r'^[0-9a-f]{8,}(-[0-9a-f]{4,})*$', re.I)
+_CSS_NAME = re.compile(r'^[A-Za-z_][\w-]*$')
+
+
+def _is_variable(segment: str) -> bool:
+    return bool(_NUMERIC.match(segment) or _HEX_ID.match(segment))
+
+
+def _normalize_text(text: str) -> str:
+    return ' '.join(text.split()).lower()
+
+
+def _link_url(element) -> Optional[str]:
+    return element.get('href') or element.get('src')
+
+
+class LinkRule:
+    """
+    Regra aprendida para um host: indica como o link do texto completo foi encontrado.
+
+    - template: a URL do PDF montada com trechos da URL da página ("https://h/bitstream/{2}/{3}/tese.pdf"),
+      o que dispensa o acesso à página;
+    - pattern: expressão regular do caminho do link, com números e identificadores generalizados;
+    - text: texto do link ("texto completo (pdf)");
+    - position: posição do link na página, como seletor CSS ("div.file-list > span.name > a").
+
+    hits e misses são contadores com decaimento: a cada resultado os anteriores perdem peso,
+    de modo que uma regra que deixa de funcionar perde a confiança em poucas tentativas.
+    """
+
+    def __init__(self, host: str, kind: str, value: str, hits: float = 0.0, misses: float = 0.0):
+        self.host = host
+        self.kind = kind
+        self.value = value
+        self.hits = hits
+        self.misses = misses
+
+    @property
+    def confidence(self) -> float:
+        """
+        Confiança da regra (estimativa de Laplace da taxa de acerto): 0.5 sem histórico.
+        """
+        return (self.hits + 1) / (self.hits + self.misses + 2)
+
+    def to_dict(self) -> dict:
+        return {'kind': self.kind, 'value': self.value, 'hits': round(self.hits, 4), 'misses': round(self.misses, 4)}
+
+
+class LinkRules:
+    """
+    Regras de localização do texto completo aprendidas por host e persistidas em JSON.
+
+    Quando um link leva a um PDF válido, o downloader registra (learn) o modelo de URL, o padrão
+    do caminho, o texto e a posição do link. Nos registros seguintes do mesmo host, as regras
+    são tentadas primeiro, da mais para a menos confiável: um modelo de URL confirmado evita o
+    acesso à página, e as demais regras apontam o link certo sem sondar todos os candidatos.
+    Cada tentativa atualiza os contadores da regra (record); regras cuja confiança cai abaixo de
+    min_confidence são descartadas.
+    """
+
+    def __init__(self, path: Optional[str] = None, decay: float = 0.9, min_confidence: float = 0.25,
+                 min_template_hits: float = 2.0, max_rules: int = 20):
+        """
+        Abre (ou cria) o conjunto de regras.
+
+        Args:
+            path (Optional[str]): Arquivo JSON das regras; se None, as regras ficam apenas em memória.
+            decay (float): Fator aplicado aos contadores de uma regra antes de cada novo resultado.
+            min_confidence (float): Confiança abaixo da qual uma regra é descartada.
+            min_template_hits (float): Acertos necessários para usar um modelo de URL sem acessar a página
+                (um modelo visto em um único registro pode conter trechos próprios daquele registro).
+                Contados já com o decaimento: dois acertos seguidos bastam para o padrão 2.
+            max_rules (int): Máximo de regras por host; as menos confiáveis são descartadas.
+        """
+        self.path = path
+        self.decay = decay
+        self.min_confidence = min_confidence
+        self.min_template_hits = min_template_hits
+        self.max_rules = max_rules
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, List[LinkRule]] = {}
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for host, rules in json.load(f).items():
+                    self.hosts[host] = [LinkRule(host, **rule) for rule in rules]
+
+    @property
+    def template_threshold(self) -> float:
+        """
+        Contador de acertos de um modelo confirmado em min_template_hits registros seguidos: com o
+        decaimento, n acertos somam 1 + decay + ... + decay^(n-1), e não n.
+        """
+        return sum(self.decay ** i for i in range(math.ceil(self.min_template_hits)))
+
+    def rules_for(self, host: str, kinds: Tuple[str, ...] = RULE_KINDS) -> List[LinkRule]:
+        """
+        Regras de um host, da mais para a menos confiável.
+
+        Args:
+            host (str): Host (netloc) das páginas
+            kinds (Tuple[str, ...]): Tipos de regra desejados
+
+        Returns:
+            List[LinkRule]: Regras ordenadas pela confiança
+        """
+        with self._lock:
+            rules = [rule for rule in self.hosts.get(host.lower(), []) if rule.kind in kinds]
+        return sorted(rules, key=lambda rule: rule.confidence, reverse=True)
+
+    # ------------------------------------------------------------------
+    # Aplicação das regras
+    # ------------------------------------------------------------------
+
+    def resolve_url(self, url: str) -> Tuple[Optional[LinkRule], List[str]]:
+        """
+        Monta a URL do PDF apenas pela URL da página, com o modelo de URL confirmado mais confiável.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            Tuple[Optional[LinkRule], List[str]]: (regra, URLs dos PDFs); (None, []) se nenhum modelo se aplicar
+        """
+        segments = urlparse(url).path.split('/')
+        for rule in self.rules_for(urlparse(url).netloc, ('template',)):
+            if rule.hits + 1e-9 < self.template_threshold:
+                continue
+            # Os trechos referenciados precisam existir e ser variáveis também nesta página
+            fields = [int(field) for _, field, _, _ in Formatter().parse(rule.value) if field]
+            if all(i < len(segments) and _is_variable(segments[i]) for i in fields):
+                return rule, [rule.value.format(*segments)]
+        return None, []
+
+    def resolve(self, soup: BeautifulSoup, base_url: str) -> Tuple[Optional[LinkRule], List[str]]:
+        """
+        Localiza os links do texto completo na página com a regra mais confiável que encontrar algum.
+
+        Args:
+            soup (BeautifulSoup): Página
+            base_url (str): URL final da página (base dos links relativos)
+
+        Returns:
+            Tuple[Optional[LinkRule], List[str]]: (regra, URLs dos PDFs); (None, []) se nenhuma regra se aplicar
+        """
+        if soup is None:
+            return None, []
+        for rule in self.rules_for(urlparse(base_url).netloc, ('pattern', 'text', 'position')):
+            links = list(dict.fromkeys(urljoin(base_url, href) for href in self._matching_hrefs(rule, soup, base_url)))
+            if links:
+                return rule, links
+        return None, []
+
+    @staticmethod
+    def _matching_hrefs(rule: LinkRule, soup: BeautifulSoup, base_url: str) -> List[str]:
+        if rule.kind == 'position':
+            try:
+                elements = soup.select(rule.value)
+            except Exception:
+                return []
+            return [_link_url(element) for element in elements if _link_url(element)]
+
+        elements = soup.find_all('a', href=True) + soup.find_all('iframe', src=True)
+        if rule.kind == 'text':
+            return [_link_url(element) for element in elements
+                    if _normalize_text(element.get_text(' ')) == rule.value]
+        if rule.kind == 'pattern':
+            pattern = re.compile(rule.value)
+            hrefs = []
+            for element in elements:
+                parsed = urlparse(urljoin(base_url, _link_url(element)))
+                if pattern.fullmatch(parsed.netloc + parsed.path):
+                    hrefs.append(_link_url(element))
+            return hrefs
+        return []
+
+    # ------------------------------------------------------------------
+    # Aprendizado
+    # ------------------------------------------------------------------
+
+    def learn(self, page_url: str, base_url: str, soup: Optional[BeautifulSoup], links: List[str]):
+        """
+        Registra as regras derivadas dos links que levaram a PDFs válidos. Regras já conhecidas
+        recebem um acerto (uma vez por página, mesmo que várias levem ao mesmo PDF); as novas
+        entram com um acerto.
+
+        Args:
+            page_url (str): URL requisitada da página (base do modelo de URL)
+            base_url (str): URL final da página (base dos links relativos)
+            soup (Optional[BeautifulSoup]): Página; se None, apenas o modelo de URL é aprendido
+            links (List[str]): URLs absolutas dos links, antes da sondagem e dos redirecionamentos
+        """
+        derived = []
+        host = urlparse(base_url).netloc
+        for link in links:
+            template = self._template(page_url, link)
+            if template:
+                derived.append((urlparse(page_url).netloc, 'template', template))
+            if soup is None:
+                continue
+            derived.append((host, 'pattern', self._pattern(link)))
+            element = self._find_element(soup, base_url, link)
+            if element is not None:
+                text = _normalize_text(element.get_text(' '))
+                if text and len(text) <= 80:
+                    derived.append((host, 'text', text))
+                position = self._position(element)
+                if position:
+                    derived.append((host, 'position', position))
+
+        for host, kind, value in dict.fromkeys(derived):
+            rule = self._get_or_add(host.lower(), kind, value)
+            self.record(rule, True)
+
+    def record(self, rule: LinkRule, success: bool):
+        """
+        Registra o resultado de uma tentativa com a regra. Os contadores anteriores decaem, e a
+        regra é descartada se a confiança ficar abaixo de min_confidence.
+
+        Args:
+            rule (LinkRule): Regra usada
+            success (bool): True se a regra levou a um PDF válido
+        """
+        with self._lock:
+            rule.hits *= self.decay
+            rule.misses *= self.decay
+            if success:
+                rule.hits += 1
+            else:
+                rule.misses += 1
+            rules = self.hosts.get(rule.host)
+            if rules is not None and rule.confidence < self.min_confidence and rule in rules:
+                rules.remove(rule)
+                print(f"Regra descartada para {rule.host}: [{rule.kind}] {rule.value}")
+
+    def save(self):
+        """
+        Grava as regras (se houver arquivo associado).
+        """
+        if not self.path:
+            return
+        with self._lock:
+            data = {host: [rule.to_dict() for rule in rules] for host, rules in self.hosts.items() if rules}
+        write_json(self.path, data)
+
+    def _get_or_add(self, host: str, kind: str, value: str) -> LinkRule:
+        with self._lock:
+            rules = self.hosts.setdefault(host, [])
+            for rule in rules:
+                if rule.kind == kind and rule.value == value:
+                    return rule
+            if len(rules) >= self.max_rules:
+                rules.remove(min(rules, key=lambda r: r.confidence))
+            rule = LinkRule(host, kind, value)
+            rules.append(rule)
+            return rule
+
+    @staticmethod
+    def _template(page_url: str, link: str) -> Optional[str]:
+        """
+        Modelo de URL: os trechos variáveis do caminho do link (números, identificadores) que também
+        aparecem no caminho da página viram referências a eles ("{2}"). Se algum trecho variável
+        não vier da página, não há modelo.
+        """
+        page_segments = urlparse(page_url).path.split('/')
+        parsed = urlparse(link)
+        if parsed.query:
+            return None
+        segments = []
+        for segment in parsed.path.split('/'):
+            if _is_variable(segment):
+                if segment not in page_segments:
+                    return None
+                segments.append(f"{{{page_segments.index(segment)}}}")
+            else:
+                segments.append(segment.replace('{', '{{').replace('}', '}}'))
+        if not any(segment.startswith('{') and not segment.startswith('{{') for segment in segments):
+            return None
+        prefix = f"{parsed.scheme}://{parsed.netloc}".replace('{', '{{').replace('}', '}}')
+        return prefix + '/'.join(segments)
+
+    @staticmethod
+    def _pattern(link: str) -> str:
+        """
+        Padrão do link: host e caminho, com números, identificadores e o nome do arquivo generalizados.
+        """
+        parsed = urlparse(link)
+        segments = parsed.path.split('/')
+        parts = []
+        for i, segment in enumerate(segments):
+            if _is_variable(segment):
+                parts.append(r'[0-9A-Fa-f-]+' if not _NUMERIC.match(segment) else r'\d+')
+            elif i == len(segments) - 1 and '.' in segment:
+                parts.append(r'[^/]+' + re.escape(os.path.splitext(segment)[1]))
+            else:
+                parts.append(re.escape(segment))
+        return re.escape(parsed.netloc) + '/'.join(parts)
+
+    @staticmethod
+    def _find_element(soup: BeautifulSoup, base_url: str, link: str):
+        for element in soup.find_all('a', href=True) + soup.find_all('iframe', src=True):
+            if urljoin(base_url, _link_url(element)) == link:
+                return element
+        return None
+
+    @staticmethod
+    def _position(element) -> Optional[str]:
+        """
+        Seletor CSS da posição do link: o elemento e até três ancestrais, identificados pela tag e
+        pela primeira classe. Sem nenhuma classe, a posição é genérica demais e não é registrada.
+        """
+        steps = []
+        has_class = False
+        for node in [element] + list(element.parents)[:3]:
+            if node.name in (None, '[document]', 'html', 'body'):
+                break
+            classes = [c for c in node.get('class', []) if _CSS_NAME.match(c)]
+            if classes:
+                has_class = True
+                steps.append(f"{node.name}.{classes[0]}")
+            else:
+                steps.append(node.name)
+        if not has_class:
+            return None
+        return ' > '.join(reversed(steps))
@@ -0,0 +1,185 @@
+import os
+import json
+import hashlib
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from BDTDharvest import write_json
+
+# Nome do arquivo com o índice URL -> conteúdos, mantido na raiz do repositório
+URL_INDEX_FILE = 'urls.json'
+
+# Tamanho dos blocos lidos ao conferir o conteúdo de um arquivo
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """
+    Calcula o SHA-256 de um arquivo, lido em blocos.
+
+    Args:
+        path (str): Caminho do arquivo
+
+    Returns:
+        str: SHA-256 (hexadecimal)
+    """
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class PDFStore:
+    """
+    Repositório de PDFs endereçado por conteúdo: cada arquivo é gravado uma única vez, em
+    objects/<2 primeiros dígitos>/<sha256>.pdf, e as pastas dos registros recebem hardlinks
+    (ou cópias, se o sistema de arquivos não suportar hardlinks) para os objetos.
+
+    Um índice persistente associa cada URL já baixada (página ou PDF) aos conteúdos obtidos,
+    de modo que a mesma URL, vista em outro registro ou em uma nova execução, é atendida sem
+    acessar a rede.
+    """
+
+    def __init__(self, root: str):
+        """
+        Abre (ou cria) o repositório.
+
+        Args:
+            root (str): Diretório do repositório
+        """
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.tmp_dir = os.path.join(root, 'tmp')
+        self.index_path = os.path.join(root, URL_INDEX_FILE)
+        self._lock = threading.Lock()
+        self.urls: Dict[str, List[Tuple[str, str]]] = {}
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.urls = {url: [tuple(entry) for entry in entries] for url, entries in json.load(f).items()}
+
+    def object_path(self, digest: str) -> str:
+        """
+        Caminho do objeto com o SHA-256 informado.
+
+        Args:
+            digest (str): SHA-256 (hexadecimal) do conteúdo
+
+        Returns:
+            str: Caminho do objeto
+        """
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.pdf")
+
+    def add(self, path: str, digest: str) -> str:
+        """
+        Move um arquivo já validado para o repositório. Se o conteúdo já existir, o arquivo é
+        descartado e o objeto existente é reaproveitado.
+
+        Args:
+            path (str): Arquivo a incorporar (removido do local original)
+            digest (str): SHA-256 do arquivo, calculado durante o download
+
+        Returns:
+            str: Caminho do objeto
+        """
+        object_path = self.object_path(digest)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        if os.path.exists(object_path):
+            os.remove(path)
+        else:
+            os.replace(path, object_path)
+        return object_path
+
+    def same_content(self, path: str, digest: str) -> bool:
+        """
+        Verifica se um arquivo tem o conteúdo do objeto informado: o mesmo arquivo (hardlink) ou,
+        no caso de uma cópia, o mesmo tamanho e o mesmo SHA-256.
+
+        Args:
+            path (str): Arquivo a conferir
+            digest (str): SHA-256 do objeto
+
+        Returns:
+            bool: True se o conteúdo for o mesmo
+        """
+        object_path = self.object_path(digest)
+        if os.path.samefile(path, object_path):
+            return True
+        if os.path.getsize(path) != os.path.getsize(object_path):
+            return False
+        return file_digest(path) == digest
+
+    def link(self, digest: str, output_dir: str, filename: str) -> str:
+        """
+        Disponibiliza um objeto na pasta de um registro. Um arquivo já presente com o mesmo conteúdo
+        (hardlink ou cópia de uma execução anterior) é reaproveitado; se o arquivo com o mesmo nome
+        for diferente, o nome recebe o início do SHA-256 ("document_1a2b3c4d.pdf").
+
+        Args:
+            digest (str): SHA-256 do objeto
+            output_dir (str): Pasta do registro
+            filename (str): Nome desejado
+
+        Returns:
+            str: Caminho do arquivo na pasta do registro
+        """
+        object_path = self.object_path(digest)
+        target = os.path.join(output_dir, filename)
+        if os.path.exists(target):
+            if self.same_content(target, digest):
+                return target
+            stem, ext = os.path.splitext(filename)
+            target = os.path.join(output_dir, f"{stem}_{digest[:8]}{ext or '.pdf'}")
+            if os.path.exists(target):
+                return target
+        try:
+            os.link(object_path, target)
+        except FileExistsError:
+            # Criado em paralelo por outro download do mesmo registro
+            pass
+        except OSError:
+            shutil.copyfile(object_path, target)
+        return target
+
+    def remember(self, urls: List[str], digest: str, filename: str):
+        """
+        Associa URLs (a requisitada, as intermediárias e a final) a um conteúdo baixado.
+
+        Args:
+            urls (List[str]): URLs que levaram ao conteúdo
+            digest (str): SHA-256 do conteúdo
+            filename (str): Nome original do arquivo
+        """
+        with self._lock:
+            for url in urls:
+                entries = self.urls.setdefault(url, [])
+                if (digest, filename) not in entries:
+                    entries.append((digest, filename))
+
+    def lookup(self, url: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Retorna os conteúdos já obtidos de uma URL, se todos ainda estiverem no repositório.
+
+        Args:
+            url (str): URL de uma página ou de um PDF
+
+        Returns:
+            Optional[List[Tuple[str, str]]]: Pares (SHA-256, nome do arquivo), ou None se a URL for desconhecida
+        """
+        with self._lock:
+            entries = self.urls.get(url)
+        if entries and all(os.path.exists(self.object_path(digest)) for digest, _ in entries):
+            return list(entries)
+        return None
+
+    def save(self):
+        """
+        Grava o índice de URLs.
+        """
+        with self._lock:
+            data = {url: [list(entry) for entry in entries] for url, entries in self.urls.items()}
+        write_json(self.index_path, data)
@@ -0,0 +1,223 @@
+import re
+import unicodedata
+from typing import Iterable, List, Pattern, Sequence
+
+import numpy as np
+
+import pandas as pd
+
+# Marcas diacríticas combinantes separadas pela normalização NFKD (acentos, cedilha, til...)
+_COMBINING_MARKS = '[\u0300-\u036f]'
+
+# Caracteres de palavra em textos latinos, incluindo letras acentuadas e marcas combinantes.
+# Usado no lugar de \b, que no motor RE2 do pandas (strings Arrow) só reconhece letras ASCII.
+_WORD_CHARS = '0-9A-Za-z_\u00c0-\u024f\u0300-\u036f'
+_LEFT_BOUNDARY = f'(?:^|[^{_WORD_CHARS}])'
+_RIGHT_BOUNDARY = f'(?:$|[^{_WORD_CHARS}])'
+
+# Radicais menores que isso casam com palavras demais; nesses casos o termo é usado inteiro
+MIN_STEM_LENGTH = 4
+
+_stemmer = None
+
+
+def fold_text(text: str) -> str:
+    """
+    Normaliza um texto para comparação: minúsculas e sem acentos ("Regressão" -> "regressao").
+
+    Args:
+        text (str): Texto original
+
+    Returns:
+        str: Texto normalizado
+    """
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return re.sub(_COMBINING_MARKS, '', decomposed).lower()
+
+
+def fold_series(series: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de fold_text para uma coluna inteira (ver text_series).
+
+    Args:
+        series (pd.Series): Coluna de texto (ou de listas de texto)
+
+    Returns:
+        pd.Series: Coluna em minúsculas e sem acentos
+    """
+    return (
+        text_series(series)
+        .str.normalize('NFKD')
+        .str.replace(_COMBINING_MARKS, '', regex=True)
+        .str.lower()
+    )
+
+
+def _accent_variants() -> dict:
+    """
+    Agrupa as letras latinas acentuadas pela letra base ('a' -> 'áàâãä...').
+    """
+    variants = {}
+    for code in range(0xc0, 0x250):
+        char = chr(code)
+        base = fold_text(char)
+        if len(base) == 1 and len(char.lower()) == 1 and base != char.lower():
+            variants.setdefault(base, set()).add(char.lower())
+    return variants
+
+
+_ACCENT_VARIANTS = _accent_variants()
+
+
+def accent_pattern(word: str) -> str:
+    """
+    Gera uma expressão que casa com a palavra com ou sem acentos ("regressao" -> "r[eé...]gr...").
+    Deve ser usada com a flag (?i) para ignorar também maiúsculas.
+
+    Args:
+        word (str): Palavra (com ou sem acentos)
+
+    Returns:
+        str: Expressão regular da palavra
+    """
+    parts = []
+    for char in fold_text(word):
+        variants = _ACCENT_VARIANTS.get(char)
+        if variants:
+            parts.append('[' + char + ''.join(sorted(variants)) + ']' + _COMBINING_MARKS + '*')
+        else:
+            parts.append(re.escape(char))
+    return ''.join(parts)
+
+
+def text_series(series: pd.Series) -> pd.Series:
+    """
+    Prepara uma coluna para busca textual: colunas multivaloradas lidas de Parquet (listas)
+    são unidas por espaço e valores ausentes viram texto vazio.
+
+    Args:
+        series (pd.Series): Coluna de texto (ou de listas de texto)
+
+    Returns:
+        pd.Series: Coluna de texto
+    """
+    non_null = series.dropna()
+    if len(non_null) and not isinstance(non_null.iloc[0], str):
+        series = series.str.join(' ')
+    return series.fillna('').astype(str)
+
+
+def get_stemmer():
+    """
+    Retorna o stemmer RSLP para português (nltk), criado no primeiro uso.
+
+    Raises:
+        ImportError: Se o pacote 'nltk' não estiver instalado
+        LookupError: Se os dados do RSLP não tiverem sido baixados
+    """
+    global _stemmer
+    if _stemmer is None:
+        try:
+            from nltk.stem import RSLPStemmer
+        except ImportError:
+            raise ImportError("O stemming requer o pacote 'nltk' (pip install nltk)")
+        try:
+            _stemmer = RSLPStemmer()
+        except LookupError:
+            raise LookupError("Dados do stemmer RSLP não encontrados. Execute: python -c \"import nltk; nltk.download('rslp')\"")
+    return _stemmer
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Separa um texto em palavras em minúsculas (os acentos são mantidos).
+
+    Args:
+        text (str): Texto original
+
+    Returns:
+        List[str]: Palavras do texto
+    """
+    return re.findall(r'\w+', str(text).lower())
+
+
+def compile_terms(terms: Iterable[str], stem: bool = False) -> Pattern:
+    """
+    Compila todos os termos em uma única expressão regular (alternação) que ignora
+    maiúsculas e acentos, aplicada diretamente sobre o texto original.
+
+    Sem stemming cada termo casa como palavra inteira. Com stemming, o termo é reduzido ao
+    radical (RSLP) e casa com qualquer palavra iniciada por ele ("regressão" e "regressões"
+    casam com "regress").
+
+    Args:
+        terms (Iterable[str]): Termos de busca
+        stem (bool): Se True, casa pelos radicais dos termos
+
+    Returns:
+        Pattern: Expressão compilada
+    """
+    words = set()
+    prefixes = set()
+    for term in terms:
+        term = term.strip().lower()
+        if not term:
+            continue
+        if stem:
+            root = get_stemmer().stem(term)
+            if len(root) >= MIN_STEM_LENGTH:
+                prefixes.add(fold_text(root))
+                continue
+        words.add(fold_text(term))
+
+    # Alternativas mais longas primeiro, para que prevaleçam sobre as mais curtas
+    alternatives = []
+    if prefixes:
+        alternation = '|'.join(accent_pattern(p) for p in sorted(prefixes, key=len, reverse=True))
+        alternatives.append(f'{_LEFT_BOUNDARY}(?:{alternation})')
+    if words:
+        alternation = '|'.join(accent_pattern(w) for w in sorted(words, key=len, reverse=True))
+        alternatives.append(f'{_LEFT_BOUNDARY}(?:{alternation}){_RIGHT_BOUNDARY}')
+    if not alternatives:
+        # Nenhum termo: a expressão não casa com nada
+        return re.compile('(?!)')
+    return re.compile('(?i)' + '|'.join(alternatives))
+
+
+def match_terms(df: pd.DataFrame, terms: Sequence[str], fields: Sequence[str] = ('title',), stem: bool = False) -> pd.Series:
+    """
+    Indica as linhas em que ao menos um dos termos aparece em algum dos campos.
+
+    Args:
+        df (pd.DataFrame): Tabela de registros
+        terms (Sequence[str]): Termos de busca
+        fields (Sequence[str]): Colunas pesquisadas (colunas ausentes são ignoradas)
+        stem (bool): Se True, compara pelos radicais dos termos (ver compile_terms)
+
+    Returns:
+        pd.Series: Máscara booleana alinhada ao índice de df
+    """
+    pattern = compile_terms(terms, stem=stem)
+    mask = pd.Series(False, index=df.index)
+    for field in fields:
+        if field in df.columns:
+            mask |= text_series(df[field]).str.contains(pattern)
+    return mask
+
+
+def term_counts(series: pd.Series, term: str) -> np.ndarray:
+    """
+    Conta as ocorrências de um termo (palavra inteira, ignorando maiúsculas e acentos) em
+    cada linha de uma coluna de texto.
+
+    Args:
+        series (pd.Series): Coluna de texto (ver text_series)
+        term (str): Termo procurado
+
+    Returns:
+        np.ndarray: Número de ocorrências por linha
+    """
+    # Conta as ocorrências com fronteira à esquerda e desconta as que continuam em outra palavra
+    start = f'(?i){_LEFT_BOUNDARY}{accent_pattern(term)}'
+    counts = series.str.count(start).to_numpy(dtype=float)
+    return counts - series.str.count(f'{start}[{_WORD_CHARS}]').to_numpy(dtype=float)
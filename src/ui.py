@@ -14,6 +14,7 @@ import random
 # Adiciona o diretório pai ao sys.path para permitir importações
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from BDTDReviewer import BDTDReviewer
+from BDTDcache import DEFAULT_CACHE_DIR
 
 
 def load_markdown_file(file_path):
@@ -369,7 +370,8 @@ def create_ui():
                                 output_dir=output_dir,
                                 debug=debug,
                                 openrouter_api_key=api_key,
-                                model=modelo_selecionado
+                                model=modelo_selecionado,
+                                cache_dir=DEFAULT_CACHE_DIR
                             )
 
                             # Agora sim chamamos a lógica de revisão
@@ -6,6 +6,7 @@ from datetime import datetime
 
 from BDTDResearchAgent import BDTDAgent
 from BDTDUiReviewer import BDTDUiReviewer
+from BDTDcache import DEFAULT_CACHE_DIR
 
 # Configuração da página
 st.set_page_config(
@@ -196,7 +197,8 @@ def execute_search(theme, max_pages, download_pdfs, scrape_text, output_dir):
             subject=theme,
             max_pages_limit=max_pages,
             download_pdf=False,
-            output_dir=output_dir
+            output_dir=output_dir,
+            cache_dir=DEFAULT_CACHE_DIR
         )
         agent.scrape_text = scrape_text
         agent.run()
@@ -242,7 +244,6 @@ def generate_review(df_full, theme, max_pages, download_pdfs, scrape_text, outpu
                 output_dir=output_dir
             )
             temp_agent.download_pdfs(selected_csv_path)
-            temp_agent.sanity_check_downloads()
             st.success("✅ Download dos PDFs concluído!")
     
     results_page_path = os.path.join(output_dir, "results_page.csv")
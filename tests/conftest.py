@@ -0,0 +1,148 @@
+import os
+import re
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+# Os módulos do pacote usam imports planos (from BDTDx import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# Facetas da API -> campos dos registros brutos
+FACET_FIELDS = {'publishDate': 'publicationDates', 'format': 'formats'}
+
+_FILTER = re.compile(r'^(-?)(\w+):"(.*)"$')
+
+
+def make_record(n: int, year: str, formats=('Dissertação',), **fields) -> dict:
+    """
+    Registro bruto no formato da API de busca da BDTD.
+    """
+    record = {
+        'id': f'REC{n:05d}',
+        'title': f'Trabalho {n}',
+        'authors': {'primary': {f'Autor {n}': []}},
+        'formats': list(formats),
+        'publicationDates': [year],
+        'urls': [{'url': f'http://example.org/{n}', 'desc': 'Texto completo'}],
+    }
+    record.update(fields)
+    return record
+
+
+def json_response(url: str, body, status: int = 200, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response._content = json.dumps(body).encode('utf-8') if body is not None else b''
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSearchAPI:
+    """
+    Substituto do HTTPClient para a API de busca da BDTD: pagina, ordena (relevance/year) e
+    filtra (filter[], com negação '-') uma lista de registros brutos, e conta facetas (facet[]),
+    retornando no máximo facet_limit valores por faceta, como o VuFind.
+    """
+
+    def __init__(self, records, facet_limit: int = 30):
+        self.records = list(records)
+        self.facet_limit = facet_limit
+        self.requests = []
+        self.timeout = 10
+
+    def _matches(self, record: dict, filters) -> bool:
+        for item in filters:
+            exclude, facet, value = _FILTER.match(item).groups()
+            present = value in record.get(FACET_FIELDS[facet], [])
+            if present == bool(exclude):
+                return False
+        return True
+
+    def get(self, url: str, headers=None, **kwargs) -> requests.Response:
+        self.requests.append(url)
+        params = parse_qs(urlparse(url).query)
+        records = [r for r in self.records if self._matches(r, params.get('filter[]', []))]
+        if params.get('sort', ['relevance'])[0] == 'year':
+            records.sort(key=lambda r: max(r['publicationDates'] or ['']), reverse=True)
+
+        body = {'resultCount': len(records), 'status': 'OK'}
+        facets = {}
+        for facet in params.get('facet[]', []):
+            counts = {}
+            for record in records:
+                for value in record.get(FACET_FIELDS[facet], []):
+                    counts[value] = counts.get(value, 0) + 1
+            ranked = sorted(counts.items(), key=lambda item: -item[1])[:self.facet_limit]
+            facets[facet] = [{'value': value, 'count': count} for value, count in ranked]
+        if facets:
+            body['facets'] = facets
+
+        limit = int(params.get('limit', ['20'])[0])
+        page = int(params.get('page', ['1'])[0])
+        page_records = records[(page - 1) * limit:page * limit] if limit else []
+        if page_records:
+            body['records'] = page_records
+        return json_response(url, body)
+
+
+class LocalServer:
+    """
+    Servidor HTTP local (http.server) em uma thread, para os testes que precisam de sockets reais.
+    """
+
+    def __init__(self, handler_class):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def serve():
+    """
+    Inicia um LocalServer com a classe de handler informada; encerrado ao fim do teste.
+    """
+    servers = []
+
+    def start(handler_class) -> LocalServer:
+        server = LocalServer(handler_class).__enter__()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.__exit__(None, None, None)
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, status: int, body: bytes = b'', content_type: str = 'text/html', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
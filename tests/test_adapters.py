@@ -0,0 +1,101 @@
+import asyncio
+import os
+
+import pytest
+
+from BDTDadapters import AdapterRegistry, CitationMetaAdapter, DSpaceAdapter, OJSAdapter, default_registry
+from BDTDdownloader import PDFDownloader
+from BDTDhttp import HTTPClient
+from BDTDparse import parse_html
+
+from conftest import QuietHandler
+
+PDF = b'%PDF-1.4\n' + b'0' * 4000
+
+
+def make_handler(hits):
+    class Handler(QuietHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if self.path.startswith('/files/'):
+                return self.send(200, PDF, 'application/pdf')
+            if self.path == '/ojs/article/view/1/9':
+                # A galley não segue o padrão de download do OJS (adaptador desatualizado)
+                return self.send(200, b'<html><a href="/files/ojs1.pdf">Baixar</a></html>')
+            if self.path == '/handle/2':
+                # citation_pdf_url aponta para um arquivo que não existe mais
+                return self.send(200, b'<html><head><meta name="citation_pdf_url" content="/gone.pdf"></head>'
+                                      b'<body><a href="/files/tese2.pdf">Texto completo</a></body></html>')
+            if self.path == '/handle/3':
+                return self.send(200, b'<html><head><meta name="citation_pdf_url" content="/files/tese3.pdf">'
+                                      b'</head><body><a href="/files/outro.pdf">pdf</a></body></html>')
+            return self.send(404, b'nf')
+    return Handler
+
+
+@pytest.fixture
+def repo(serve):
+    hits = []
+    return serve(make_handler(hits)), hits
+
+
+def test_default_adapters_resolve():
+    soup = parse_html('<meta name="citation_pdf_url" content="/bitstream/1/a.pdf">')
+    assert CitationMetaAdapter().resolve(soup, 'http://r/handle/1') == ['http://r/bitstream/1/a.pdf']
+
+    soup = parse_html('<meta name="generator" content="DSpace 7.6"><a href="/bitstreams/ab-12/download">tese.pdf</a>'
+                      '<a href="/items/1/full">Ver</a>')
+    dspace = DSpaceAdapter()
+    assert dspace.matches(soup, 'http://r/x') and dspace.resolve(soup, 'http://r/x') == ['http://r/bitstreams/ab-12/download']
+
+    assert OJSAdapter().resolve_url('http://r/index.php/rev/article/view/12/30') == \
+        ['http://r/index.php/rev/article/download/12/30']
+
+    registry = AdapterRegistry()
+    registry.register(OJSAdapter(), hosts=('journal.org',))
+    assert registry.resolve_url('http://journal.org/article/view/1/2')[0] == 'ojs'
+    assert registry.resolve_url('http://other.org/article/view/1/2') == (None, [])
+    assert default_registry().resolve(parse_html('<a href="/x.pdf">x</a>'), 'http://r/') == (None, [])
+
+
+def sync_download(tmp_path, url):
+    downloader = PDFDownloader(str(tmp_path), client=HTTPClient(), min_size=100, retries=0)
+    return downloader.process_page(url)
+
+
+def async_download(tmp_path, url):
+    pytest.importorskip('aiohttp')
+    pytest.importorskip('aiofiles')
+    from BDTDasync import AsyncPDFDownloader
+
+    async def run():
+        async with AsyncPDFDownloader(str(tmp_path), min_size=100, retries=0) as downloader:
+            return await downloader.process_page(url)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('download', [sync_download, async_download])
+def test_stale_ojs_rewrite_falls_back_to_page(repo, tmp_path, download):
+    server, hits = repo
+    files = download(tmp_path, server.url + '/ojs/article/view/1/9')
+
+    assert [os.path.basename(path) for path in files] == ['ojs1.pdf']
+    assert '/ojs/article/download/1/9' in hits
+
+
+@pytest.mark.parametrize('download', [sync_download, async_download])
+def test_wrong_citation_meta_falls_back_to_heuristic(repo, tmp_path, download):
+    server, hits = repo
+    files = download(tmp_path, server.url + '/handle/2')
+
+    assert [os.path.basename(path) for path in files] == ['tese2.pdf']
+    assert '/gone.pdf' in hits
+
+
+@pytest.mark.parametrize('download', [sync_download, async_download])
+def test_adapter_hit_skips_heuristic(repo, tmp_path, download):
+    server, hits = repo
+    files = download(tmp_path, server.url + '/handle/3')
+
+    assert [os.path.basename(path) for path in files] == ['tese3.pdf']
+    assert '/files/outro.pdf' not in hits
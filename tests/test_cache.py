@@ -0,0 +1,90 @@
+import os
+
+import BDTDcache
+from BDTDcache import ResponseCache
+from BDTDfinder import BDTDCrawler
+
+from conftest import json_response
+
+
+class ConditionalAPI:
+    """
+    Substituto do HTTPClient que responde com ETag e atende requisições condicionais (304).
+    """
+
+    def __init__(self, body: dict, etag: str = '"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url: str, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        if headers.get('If-None-Match') == self.etag:
+            return json_response(url, None, status=304, headers={'ETag': self.etag})
+        return json_response(url, self.body, headers={'ETag': self.etag})
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_crawler(tmp_path, monkeypatch, api, ttl: float = 60):
+    clock = Clock()
+    monkeypatch.setattr(BDTDcache.time, 'time', clock)
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=ttl)
+    return BDTDCrawler(client=api, cache=cache, retries=0), cache, clock
+
+
+def test_fresh_entry_is_served_without_network(tmp_path, monkeypatch):
+    api = ConditionalAPI({'resultCount': 1})
+    crawler, _, clock = make_crawler(tmp_path, monkeypatch, api)
+
+    assert crawler.fetch_results('http://api/search?lookfor=a&page=1') == {'resultCount': 1}
+    clock.now += 59
+    # A ordem dos parâmetros não altera a chave do cache
+    assert crawler.fetch_results('http://API/search?page=1&lookfor=a') == {'resultCount': 1}
+    assert len(api.requests) == 1
+
+
+def test_expired_entry_is_revalidated_with_etag(tmp_path, monkeypatch):
+    api = ConditionalAPI({'resultCount': 1})
+    crawler, cache, clock = make_crawler(tmp_path, monkeypatch, api)
+    url = 'http://api/search?lookfor=a'
+    crawler.fetch_results(url)
+
+    clock.now += 61
+    assert crawler.fetch_results(url) == {'resultCount': 1}
+    assert api.requests[1] == {'If-None-Match': '"v1"'}
+    # O 304 renova o TTL: a próxima busca não vai à rede
+    assert cache.is_fresh(cache.get(url))
+    crawler.fetch_results(url)
+    assert len(api.requests) == 2
+
+    # Conteúdo alterado no servidor: a resposta 200 substitui a entrada
+    api.body, api.etag = {'resultCount': 2}, '"v2"'
+    clock.now += 61
+    assert crawler.fetch_results(url) == {'resultCount': 2}
+    assert cache.get(url)['etag'] == '"v2"'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'), max_bytes=7_000)
+    body = {'records': ['x' * 3000]}
+    urls = [f'http://api/search?page={n}' for n in range(3)]
+    for n, url in enumerate(urls[:2]):
+        cache.set(url, body)
+        os.utime(cache._path(url), (n, n))
+    # A leitura marca a página 0 como usada mais recentemente
+    cache.get(urls[0])
+
+    cache.set(urls[2], body)
+
+    assert cache.get(urls[0]) is not None
+    assert cache.get(urls[1]) is None
+    assert cache.get(urls[2]) is not None
+    assert cache._total_bytes <= cache.max_bytes
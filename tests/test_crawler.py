@@ -0,0 +1,119 @@
+import json
+
+import pytest
+import requests
+
+from BDTDfinder import BDTDCrawler, RecordWriter
+from BDTDrecord import read_records_table
+
+from conftest import FakeSearchAPI, json_response, make_record
+
+
+class FlakyAPI:
+    """
+    Substituto do HTTPClient que entrega respostas pré-definidas, uma por requisição.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url: str, headers=None, **kwargs) -> requests.Response:
+        self.requests.append(url)
+        return self.responses.pop(0)
+
+
+def truncated_response(url: str, legacy: bool = False) -> requests.Response:
+    response = json_response(url, None)
+    response._content = b'{"resultCount": 3, "records": [{"id"'
+    if legacy:
+        # requests < 2.27: response.json() levanta o ValueError do decodificador JSON
+        def raise_decode_error(**kwargs):
+            return json.loads(response.text)
+        response.json = raise_decode_error
+    return response
+
+
+@pytest.mark.parametrize('legacy', [False, True])
+def test_truncated_json_is_retried(legacy):
+    url = 'http://api/search?page=1'
+    api = FlakyAPI(truncated_response(url, legacy), json_response(url, {'resultCount': 0, 'records': []}))
+    crawler = BDTDCrawler(client=api, retries=2, backoff=0)
+
+    assert crawler.fetch_results(url) == {'resultCount': 0, 'records': []}
+    assert len(api.requests) == 2
+
+
+def test_truncated_json_raises_after_retries():
+    url = 'http://api/search?page=1'
+    api = FlakyAPI(*(truncated_response(url, legacy=True) for _ in range(3)))
+    crawler = BDTDCrawler(client=api, retries=2, backoff=0)
+
+    with pytest.raises(ValueError):
+        crawler.fetch_results(url)
+    assert len(api.requests) == 3
+
+
+def test_invalid_url_is_not_transient():
+    # InvalidURL e afins também são ValueError, mas repetir a requisição não adianta
+    assert not BDTDCrawler.is_transient_error(requests.exceptions.InvalidURL('url inválida'))
+    assert not BDTDCrawler.is_transient_error(requests.exceptions.MissingSchema('sem esquema'))
+    assert BDTDCrawler.is_transient_error(requests.exceptions.ConnectionError('conexão recusada'))
+
+
+def test_iter_pages_streams_pages_in_order():
+    api = FakeSearchAPI([make_record(n, '2020') for n in range(95)])
+    crawler = BDTDCrawler(client=api)
+
+    pages = list(crawler.iter_pages('tema', max_workers=3, limit=20))
+
+    assert [page for page, _ in pages] == [1, 2, 3, 4, 5]
+    ids = [record['id'] for _, results in pages for record in results['records']]
+    assert ids == [f'REC{n:05d}' for n in range(95)]
+
+
+def test_iter_pages_limits():
+    api = FakeSearchAPI([make_record(n, '2020') for n in range(95)])
+    crawler = BDTDCrawler(client=api)
+
+    assert [page for page, _ in crawler.iter_pages('tema', max_pages=2, max_workers=3, limit=20)] == [1, 2]
+    assert not any('page=3' in url for url in api.requests)
+
+    records = list(crawler.iter_records('tema', max_records=30, max_workers=3, limit=20))
+    assert [record.id for record in records] == [f'REC{n:05d}' for n in range(30)]
+
+    # Página inicial além do fim da busca: nada é produzido
+    assert list(crawler.iter_pages('tema', page=10, limit=20)) == []
+
+
+def test_record_writer_writes_each_batch(tmp_path):
+    crawler = BDTDCrawler()
+    path = str(tmp_path / 'results.csv')
+    pages = [[crawler.process_record(make_record(n, '2020')) for n in range(start, start + 3)] for start in (0, 3)]
+
+    with RecordWriter(path) as writer:
+        writer.write(pages[0])
+        # O lote já está no disco antes do fim da coleta
+        assert list(read_records_table(path)['id']) == ['REC00000', 'REC00001', 'REC00002']
+        writer.write(pages[1])
+        assert writer.write([]) == 0
+    assert writer.count == 6
+
+    with RecordWriter(path, append=True) as writer:
+        writer.write([crawler.process_record(make_record(6, '2021'))])
+    df = read_records_table(path)
+    assert list(df['id']) == [f'REC{n:05d}' for n in range(7)]
+
+    with pytest.raises(ValueError):
+        RecordWriter(str(tmp_path / 'results.parquet'), append=True)
+
+
+def test_search_and_save_streams_to_csv(tmp_path, capsys):
+    api = FakeSearchAPI([make_record(n, '2020') for n in range(45)])
+    path = str(tmp_path / 'busca.csv')
+
+    BDTDCrawler(client=api).search_and_save('tema', filename=path, max_pages=2, limit=20)
+
+    assert len(read_records_table(path)) == 40
+    out = capsys.readouterr().out
+    assert 'Total de registros encontrados: 45' in out and 'Registros processados: 40' in out
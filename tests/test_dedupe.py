@@ -0,0 +1,54 @@
+import pandas as pd
+
+from BDTDdedupe import MinHashDeduplicator
+from BDTDrecord import read_records_table, write_records_table
+from BDTDResearchAgent import BDTDAgent
+
+
+def make_table(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=['id', 'title', 'primary_authors', 'publication_dates', 'abstract'])
+
+
+def near_duplicates() -> pd.DataFrame:
+    return make_table([
+        ('A1', 'Regressão logística aplicada à análise de crédito', 'Silva, João', '2019', ''),
+        # Mesma obra sem acentos e em maiúsculas, em outro repositório e com resumo
+        ('A2', 'REGRESSAO LOGISTICA APLICADA A ANALISE DE CREDITO', 'Silva, João', '2019', 'Resumo'),
+        # Autor em ordem direta e pontuação diferente
+        ('A3', 'Regressão logística aplicada à análise de crédito.', 'João Silva', '2019-03-01', ''),
+        ('B1', 'Redes neurais para previsão de séries temporais', 'Souza, Maria', '2021', ''),
+        ('C1', 'Regressão logística aplicada à análise de crédito', 'Pereira, Ana', '2015', ''),
+    ])
+
+
+def test_near_duplicate_variants_are_merged(capsys):
+    deduped = MinHashDeduplicator().deduplicate(near_duplicates())
+
+    assert list(deduped['id']) == ['A2', 'B1', 'C1']
+    # O registro mais completo (com resumo) é o canônico do grupo
+    assert deduped.loc[0, 'duplicate_ids'] == 'A1; A3'
+    assert list(deduped['duplicate_ids'][1:]) == ['', '']
+    # O relatório fica a cargo do chamador
+    assert capsys.readouterr().out == ''
+
+
+def test_agent_reports_duplicates(tmp_path, capsys):
+    agent = BDTDAgent('tema', output_dir=str(tmp_path))
+    write_records_table(near_duplicates(), agent.output_csv)
+
+    path = agent.deduplicate(agent.output_csv)
+
+    assert list(read_records_table(path)['id']) == ['A2', 'B1', 'C1']
+    assert '1 grupo(s) de duplicatas; 2 registro(s) removido(s).' in capsys.readouterr().out
+
+
+def test_records_without_title_are_kept():
+    df = make_table([
+        ('A1', '', 'Silva, João', '2019', ''),
+        ('A2', '', 'Silva, João', '2019', ''),
+    ])
+
+    deduped = MinHashDeduplicator().deduplicate(df)
+
+    assert list(deduped['id']) == ['A1', 'A2']
+    assert MinHashDeduplicator().clusters(df) == []
@@ -0,0 +1,67 @@
+from BDTDfinder import BDTDCrawler, RecordWriter
+from BDTDharvest import HarvestState
+from BDTDResearchAgent import BDTDAgent
+from BDTDrecord import read_records_table
+
+from conftest import FakeSearchAPI, make_record
+
+
+def make_corpus(known: int = 150, new: int = 300):
+    old = [make_record(i, str(2000 + i % 15)) for i in range(known)]
+    fresh = [make_record(10_000 + i, str(2020 + i % 4)) for i in range(new)]
+    return old, fresh
+
+
+def known_state(tmp_path, crawler, old) -> HarvestState:
+    state = HarvestState.for_query(str(tmp_path), 'tema')
+    state.update(crawler.process_record(record) for record in old)
+    return state
+
+
+def test_delta_spans_several_pages_while_state_is_updated(tmp_path):
+    old, fresh = make_corpus()
+    crawler = BDTDCrawler(client=FakeSearchAPI(old + fresh))
+    state = known_state(tmp_path, crawler, old)
+
+    harvested = []
+    for records in crawler.iter_new_records('tema', state, limit=100):
+        harvested.extend(records)
+        # O chamador atualiza o estado a cada página (como run_delta_crawler)
+        state.update(records)
+
+    assert len(harvested) == len(fresh)
+    assert {record.id for record in harvested} == {record['id'] for record in fresh}
+    assert state.newest_date == '2023'
+
+
+def test_delta_stops_at_known_records(tmp_path):
+    old, fresh = make_corpus(new=30)
+    api = FakeSearchAPI(old + fresh)
+    crawler = BDTDCrawler(client=api)
+    state = known_state(tmp_path, crawler, old)
+
+    pages = list(crawler.iter_new_records('tema', state, limit=20))
+
+    assert sum(len(records) for records in pages) == 30
+    # Página 1: 20 novos; página 2: 10 novos e registros antigos, que encerram a coleta
+    # (a página 3 já pode ter sido pedida antecipadamente por iter_pages, mas não a 4)
+    assert not any('page=4' in url for url in api.requests)
+
+
+def test_run_delta_crawler_merges_all_new_records(tmp_path):
+    old, fresh = make_corpus()
+    api = FakeSearchAPI(old + fresh)
+    agent = BDTDAgent('tema', max_pages_limit=50, output_dir=str(tmp_path), client=api, delta=True)
+    crawler = BDTDCrawler(client=api)
+    with RecordWriter(agent.output_csv) as writer:
+        writer.write(crawler.process_record(record) for record in old)
+    state = known_state(tmp_path, crawler, old)
+    state.save()
+
+    agent.run_delta_crawler(crawler, HarvestState.for_query(str(tmp_path), 'tema'))
+
+    merged = read_records_table(agent.output_csv)
+    assert len(merged) == len(old) + len(fresh)
+    assert merged['id'].is_unique
+    reloaded = HarvestState.for_query(str(tmp_path), 'tema')
+    assert len(reloaded.seen_ids) == len(old) + len(fresh)
@@ -0,0 +1,297 @@
+import os
+
+import pytest
+import requests
+
+from BDTDdownloader import CHUNK_SIZE, PROBE_BYTES, InvalidPDFError, PDFDownloader, PDFStreamValidator
+from BDTDhttp import HTTPClient
+
+from conftest import QuietHandler
+
+PDF = b'%PDF-1.4\n' + bytes(range(256)) * 800
+
+
+class CountingRaw:
+    """
+    Corpo de resposta que registra quantos bytes foram lidos pelo downloader.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.read_bytes = 0
+
+    def read(self, size: int = -1, **kwargs) -> bytes:
+        size = len(self.data) - self.read_bytes if size is None or size < 0 else size
+        chunk = self.data[self.read_bytes:self.read_bytes + size]
+        self.read_bytes += len(chunk)
+        return chunk
+
+    def close(self):
+        pass
+
+
+def streamed_response(url: str, body: bytes, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.raw = CountingRaw(body)
+    response.headers.update(headers or {'Content-Type': 'application/pdf'})
+    return response
+
+
+def test_validator():
+    validator = PDFStreamValidator(min_size=10, max_size=100)
+    validator.feed(b'%PD')
+    validator.feed(b'F-1.4 corpo')
+    validator.finish()
+
+    with pytest.raises(InvalidPDFError, match='assinatura'):
+        PDFStreamValidator().feed(b'<html>' + b' ' * PROBE_BYTES)
+    with pytest.raises(InvalidPDFError, match='mais de 100 bytes'):
+        validator.feed(b'x' * 100)
+    with pytest.raises(InvalidPDFError, match='KB'):
+        short = PDFStreamValidator(min_size=1000)
+        short.feed(b'%PDF-1.4')
+        short.finish()
+    with pytest.raises(InvalidPDFError, match='assinatura'):
+        PDFStreamValidator(min_size=0).finish()
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    return PDFDownloader(str(tmp_path), client=HTTPClient(), min_size=1000, max_size=len(PDF), retries=0)
+
+
+def remaining_files(downloader) -> list:
+    return sorted(os.listdir(downloader.output_dir))
+
+
+def test_invalid_content_is_abandoned_early(downloader):
+    # Página de erro servida como PDF, sem Content-Length: recusada no primeiro bloco
+    response = streamed_response('http://r/tese.pdf', b'<html>erro</html>' + b' ' * 10_000_000)
+
+    with pytest.raises(InvalidPDFError, match='assinatura'):
+        downloader.save_response(response)
+
+    assert response.raw.read_bytes < 1_000_000
+    assert remaining_files(downloader) == []
+
+
+def test_oversized_stream_is_abandoned(downloader):
+    response = streamed_response('http://r/tese.pdf', PDF + b'0' * 10_000_000)
+
+    with pytest.raises(InvalidPDFError, match='mais de'):
+        downloader.save_response(response)
+
+    assert response.raw.read_bytes < len(PDF) + 1_000_000
+    assert remaining_files(downloader) == []
+
+
+def test_declared_size_is_checked_before_reading(downloader):
+    response = streamed_response('http://r/tese.pdf', PDF * 2,
+                                 {'Content-Type': 'application/pdf', 'Content-Length': str(len(PDF) * 2)})
+
+    with pytest.raises(InvalidPDFError):
+        downloader.save_response(response)
+
+    assert response.raw.read_bytes == 0
+
+
+def test_download_writes_only_valid_pdfs(serve, downloader):
+    class Handler(QuietHandler):
+        def do_GET(self):
+            if self.path == '/tese.pdf':
+                return self.send(200, PDF, 'application/pdf')
+            if self.path == '/capa.pdf':
+                return self.send(200, PDF[:500], 'application/pdf')
+            return self.send(200, b'<html>' + b' ' * 5000 + b'</html>', 'application/pdf')
+
+    server = serve(Handler)
+
+    path = downloader.download_pdf(server.url + '/tese.pdf')
+    assert downloader.download_pdf(server.url + '/capa.pdf') == ''
+    assert downloader.download_pdf(server.url + '/erro') == ''
+
+    with open(path, 'rb') as f:
+        assert f.read() == PDF
+    # Nenhum arquivo parcial ('.part') ou recusado permanece na pasta
+    assert remaining_files(downloader) == ['tese.pdf']
+
+
+class Resource:
+    """
+    Arquivo servido com ETag, Range e If-Range. cuts lista, por requisição, após quantos bytes
+    a conexão é encerrada; refuse_range responde 416 a qualquer pedido de intervalo.
+    """
+
+    def __init__(self, content: bytes, etag: str = '"v1"'):
+        self.content = content
+        self.etag = etag
+        self.cuts = []
+        self.refuse_range = False
+        self.requests = []
+
+
+# Interrupção em um limite de bloco: o que chega de um bloco incompleto não é gravado
+CUT = 2 * CHUNK_SIZE
+
+
+def resource_handler(resource: Resource):
+    class Handler(QuietHandler):
+        def do_GET(self):
+            resource.requests.append({name: self.headers.get(name) for name in ('Range', 'If-Range')})
+            content, range_header = resource.content, self.headers.get('Range')
+            headers = {'ETag': resource.etag}
+            if range_header and resource.refuse_range:
+                return self.send(416, b'', 'text/plain', {'Content-Range': f'bytes */{len(content)}'})
+            if range_header and self.headers.get('If-Range') in (None, resource.etag):
+                start = int(range_header.split('=')[1].rstrip('-'))
+                status, body = 206, content[start:]
+                headers['Content-Range'] = f'bytes {start}-{len(content) - 1}/{len(content)}'
+            else:
+                status, body = 200, content
+
+            cut = resource.cuts.pop(0) if resource.cuts else None
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            if cut is not None:
+                # Conexão interrompida no meio da transferência
+                self.close_connection = True
+    return Handler
+
+
+@pytest.fixture
+def resource(serve, tmp_path):
+    resource = Resource(PDF)
+    server = serve(resource_handler(resource))
+    downloader = PDFDownloader(str(tmp_path), client=HTTPClient(), min_size=1000, retries=2, backoff=0)
+    return resource, downloader, server.url + '/tese.pdf'
+
+
+def downloaded(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_interrupted_download_resumes_with_range(resource):
+    resource, downloader, url = resource
+    resource.cuts = [CUT]
+
+    path = downloader.download_pdf(url)
+
+    assert downloaded(path) == PDF
+    assert resource.requests == [{'Range': None, 'If-Range': None},
+                                 {'Range': f'bytes={CUT}-', 'If-Range': '"v1"'}]
+    assert remaining_files(downloader) == ['tese.pdf']
+
+
+def test_changed_file_is_downloaded_again(resource):
+    resource, downloader, url = resource
+    resource.cuts = [CUT]
+    downloader.retries = 0
+    assert downloader.download_pdf(url) == ''
+
+    # O arquivo muda no servidor: If-Range não confere e a resposta é 200 com o arquivo novo
+    resource.content, resource.etag = b'%PDF-1.5\n' + PDF[::-1], '"v2"'
+    path = downloader.download_pdf(url)
+
+    assert downloaded(path) == resource.content
+    assert resource.requests[-1] == {'Range': f'bytes={CUT}-', 'If-Range': '"v1"'}
+
+
+def test_refused_range_restarts_from_scratch(resource):
+    resource, downloader, url = resource
+    resource.cuts = [CUT]
+    downloader.retries = 0
+    assert downloader.download_pdf(url) == ''
+
+    resource.refuse_range = True
+    downloader.retries = 2
+    path = downloader.download_pdf(url)
+
+    assert downloaded(path) == PDF
+    # 416 descarta o parcial; a nova tentativa pede o arquivo inteiro
+    assert resource.requests[1:] == [{'Range': f'bytes={CUT}-', 'If-Range': '"v1"'},
+                                     {'Range': None, 'If-Range': None}]
+
+
+def test_weak_etag_is_not_resumed(resource):
+    resource, downloader, url = resource
+    resource.etag = 'W/"v1"'
+    resource.cuts = [CUT]
+
+    path = downloader.download_pdf(url)
+
+    assert downloaded(path) == PDF
+    assert resource.requests[1] == {'Range': None, 'If-Range': None}
+
+
+def test_probe_verdict(downloader):
+    pdf_headers = {'Content-Type': 'application/octet-stream', 'Content-Range': f'bytes 0-99/{len(PDF)}'}
+
+    # A assinatura decide, não o Content-Type
+    assert downloader.probe_verdict(206, pdf_headers, PDF[:100]) == ''
+    assert downloader.probe_verdict(200, {'Content-Type': 'application/pdf'}, b'<html>erro</html>').startswith('não é PDF')
+    assert 'KB' in downloader.probe_verdict(200, {'Content-Length': '500'}, PDF[:100])
+    assert 'bytes (>' in downloader.probe_verdict(206, {'Content-Range': f'bytes 0-99/{len(PDF) + 1}'}, PDF[:100])
+    # Sem os primeiros bytes, apenas o tamanho é verificado
+    assert downloader.probe_verdict(200, {'Content-Length': str(len(PDF))}) == ''
+
+
+def test_probe_accepts_pdf_and_rejects_html(serve, downloader):
+    class Handler(QuietHandler):
+        def do_GET(self):
+            if self.path == '/tese.pdf':
+                start, end = self.headers['Range'].split('=')[1].split('-')
+                return self.send(206, PDF[int(start):int(end) + 1], 'application/octet-stream',
+                                 {'Content-Range': f'bytes {start}-{end}/{len(PDF)}'})
+            if self.path == '/link':
+                self.send_response(302)
+                self.send_header('Location', '/tese.pdf')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            return self.send(200, b'<html>' + b' ' * 5000 + b'</html>', 'application/pdf')
+
+    server = serve(Handler)
+
+    assert downloader.probe(server.url + '/tese.pdf') == server.url + '/tese.pdf'
+    # Redirecionamentos são seguidos até o PDF
+    assert downloader.probe(server.url + '/link') == server.url + '/tese.pdf'
+    assert downloader.probe(server.url + '/erro') == ''
+    assert remaining_files(downloader) == []
+
+
+class FakeClient:
+    """
+    Cliente que responde sempre com o mesmo corpo, ignorando o cabeçalho Range.
+    """
+
+    def __init__(self, body: bytes, headers: dict):
+        self.body = body
+        self.headers = headers
+        self.responses = []
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        response = streamed_response(url, self.body, self.headers)
+        self.responses.append(response)
+        return response
+
+
+def test_probe_reads_only_the_start_when_range_is_ignored(downloader):
+    body = PDF + b'0' * 10_000_000
+    downloader.max_size = None
+    downloader.client = FakeClient(body, {'Content-Type': 'application/pdf', 'Content-Length': str(len(body))})
+
+    assert downloader.probe('http://r/tese.pdf') == 'http://r/tese.pdf'
+    assert downloader.client.responses[0].raw.read_bytes <= PROBE_BYTES
+
+    downloader.client = FakeClient(b'<html>' + b' ' * 10_000_000, {'Content-Type': 'text/html'})
+    assert downloader.probe('http://r/pagina') == ''
+    assert downloader.client.responses[0].raw.read_bytes <= PROBE_BYTES
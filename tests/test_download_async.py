@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('aiofiles')
+
+import BDTDResearchAgent
+from BDTDResearchAgent import BDTDAgent
+
+
+def test_async_batch_survives_a_failing_task(tmp_path, monkeypatch, capsys):
+    output_dir = str(tmp_path / 'out')
+    os.makedirs(output_dir)
+    csv_path = os.path.join(output_dir, 'results_filtered.csv')
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('id;urls\n')
+        f.write('A;http://example.org/a\n')
+        f.write('B;http://example.org/erro|http://example.org/b\n')
+        f.write('C;http://example.org/c\n')
+
+    async def process_page(self, url):
+        if url.endswith('/erro'):
+            raise OSError('disco cheio')
+        path = os.path.join(self.output_dir, url.rsplit('/', 1)[1] + '.pdf')
+        with open(path, 'wb') as f:
+            f.write(b'%PDF-1.4')
+        return [path]
+
+    monkeypatch.setattr(BDTDResearchAgent.AsyncPDFDownloader, 'process_page', process_page)
+    agent = BDTDAgent('tema', output_dir=output_dir, async_downloads=True)
+
+    agent.download_pdfs(csv_path)
+
+    out = capsys.readouterr().out
+    assert 'Erro ao baixar de http://example.org/erro: disco cheio' in out
+    for rec_id, name in (('A', 'a.pdf'), ('B', 'b.pdf'), ('C', 'c.pdf')):
+        assert os.path.exists(os.path.join(output_dir, rec_id, name))
+    # Todos os registros são concluídos, inclusive o que teve a tarefa com erro
+    assert '[3/3]' in out
@@ -0,0 +1,120 @@
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import BDTDhttp
+from BDTDhttp import HostLimiter, HTTPClient, RateLimiter, parse_retry_after
+
+from conftest import QuietHandler
+
+
+class Clock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('0.5') == 0.5
+    assert parse_retry_after('-4') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('amanhã') is None
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    assert parse_retry_after('Mon, 01 Jan 2001 00:00:00 GMT') == 0.0
+
+
+def test_token_bucket_refills_at_rate(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(BDTDhttp.time, 'monotonic', clock)
+    limiter = HostLimiter(rate=4.0, concurrency=2)
+
+    limiter.acquire()
+    assert limiter.tokens == 0
+    clock.now += 0.125
+    limiter._refill(clock.now)
+    assert limiter.tokens == pytest.approx(0.5)
+    # O balde acumula no máximo tantas fichas quanto o limite de concorrência
+    clock.now += 10
+    limiter._refill(clock.now)
+    assert limiter.tokens == 2.0
+
+
+def test_token_bucket_paces_requests():
+    limiter = HostLimiter(rate=20.0, concurrency=1)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(None)
+    # A primeira ficha já está disponível; as outras quatro chegam a cada 1/20 s
+    assert time.monotonic() - start >= 0.19
+
+
+def test_aimd_adjusts_rate_and_concurrency(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(BDTDhttp.time, 'monotonic', clock)
+    limiter = HostLimiter(rate=4.0, rate_step=0.5, concurrency=4, max_concurrency=5, min_rate=1.5)
+
+    # As vagas são ocupadas diretamente: com o relógio parado, o balde não seria reabastecido
+    limiter.in_flight += 2
+    limiter.release(200)
+    assert (limiter.rate, limiter.limit) == (4.5, 4.25)
+
+    limiter.release(429, retry_after=2.0)
+    assert (limiter.rate, limiter.limit) == (2.25, 2.125)
+    assert limiter.blocked_until == clock.now + 2.0
+
+    # Sem Retry-After, o host fica suspenso pelo intervalo de uma requisição na nova taxa
+    limiter.blocked_until = 0.0
+    limiter.in_flight += 1
+    limiter.release(503)
+    assert (limiter.rate, limiter.limit) == (1.5, 1.0625)
+    assert limiter.blocked_until == pytest.approx(clock.now + 1 / 1.5)
+
+    # Erros do servidor (5xx) e falhas de conexão não alteram os limites
+    limiter.in_flight += 2
+    limiter.release(500)
+    limiter.release(None)
+    assert (limiter.rate, limiter.limit, limiter.in_flight) == (1.5, 1.0625, 0)
+
+    for _ in range(50):
+        limiter.in_flight += 1
+        limiter.release(200)
+    assert limiter.limit == 5.0
+
+
+def throttling_handler(statuses, hits):
+    class Handler(QuietHandler):
+        def do_GET(self):
+            hits.append(time.monotonic())
+            status = statuses.pop(0) if statuses else 200
+            headers = {'Retry-After': '0.3'} if status == 429 else {}
+            self.send(status, b'ok', headers=headers)
+    return Handler
+
+
+def test_client_waits_for_retry_after(serve):
+    hits = []
+    server = serve(throttling_handler([429], hits))
+    client = HTTPClient(rate_limiter=RateLimiter(rate=5.0, rate_step=0.5))
+
+    response = client.get(server.url + '/busca')
+
+    assert response.status_code == 200
+    assert len(hits) == 2 and hits[1] - hits[0] >= 0.3
+    limiter = client.rate_limiter.for_host(server.url.split('//', 1)[1])
+    assert limiter.rate == 3.0
+
+
+def test_client_returns_throttled_response_after_retries(serve):
+    hits = []
+    server = serve(throttling_handler([429, 429], hits))
+    client = HTTPClient(throttle_retries=1)
+
+    assert client.get(server.url + '/busca').status_code == 429
+    assert len(hits) == 2
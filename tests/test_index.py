@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from BDTDfinder import RecordWriter
+from BDTDindex import RecordIndex
+from BDTDrecord import BDTDRecord
+
+pytestmark = pytest.mark.skipif(
+    sqlite3.sqlite_version_info < (3, 27, 0),
+    reason="remove_diacritics 2 requer SQLite >= 3.27"
+)
+
+RECORDS = [
+    BDTDRecord(id='R1', title='Regressão logística em séries históricas', subjects=['Estatística'],
+               primary_authors=['Conceição, José']),
+    BDTDRecord(id='R2', title='Modelos de previsao', abstract='Uso de REGRESSOES nao lineares',
+               primary_authors=['Souza, Maria']),
+    BDTDRecord(id='R3', title='Redes neurais', subjects=['Aprendizado de máquina']),
+]
+
+
+@pytest.fixture
+def index():
+    with RecordIndex() as index:
+        index.add(RECORDS)
+        yield index
+
+
+def ids(results) -> list:
+    return [record.id for record, _ in results]
+
+
+def test_accents_and_case_are_folded(index):
+    assert ids(index.search('regressao logistica')) == ['R1']
+    assert ids(index.search('SÉRIES HISTORICAS')) == ['R1']
+    assert ids(index.search('previsão')) == ['R2']
+    assert ids(index.search('conceicao')) == ['R1']
+    assert ids(index.search('maquina')) == ['R3']
+
+
+def test_prefix_and_any_term(index):
+    assert ids(index.search('regressão')) == ['R1']
+    assert sorted(ids(index.search('regress', prefix=True))) == ['R1', 'R2']
+    assert sorted(ids(index.search('neurais previsao', any_term=True))) == ['R2', 'R3']
+    assert index.search('neurais previsao') == []
+
+
+def test_title_outranks_abstract(index):
+    results = index.search('regress', prefix=True)
+
+    assert ids(results) == ['R1', 'R2']
+    assert results[0][1] > results[1][1] > 0
+    # Com os pesos invertidos, o resumo passa a valer mais que o título
+    assert ids(index.search('regress', prefix=True, weights={'title': 0.1, 'abstract': 10.0})) == ['R2', 'R1']
+
+
+def test_query_operators_are_not_interpreted(index):
+    assert index.search('"') == []
+    assert ids(index.search('redes AND OR -neurais')) == []
+    assert ids(index.search('redes NOT')) == []
+    assert ids(index.search('(redes)')) == ['R3']
+
+
+def test_readd_replaces_and_file_persists(tmp_path):
+    path = str(tmp_path / 'index.db')
+    csv_path = str(tmp_path / 'results.csv')
+    with RecordWriter(csv_path) as writer:
+        writer.write(RECORDS)
+
+    with RecordIndex(path) as index:
+        assert index.add_file(csv_path) == 3
+        index.add([BDTDRecord(id='R3', title='Redes convolucionais')])
+
+    with RecordIndex(path) as index:
+        assert len(index) == 3
+        assert index.search('neurais') == []
+        [(record, _)] = index.search('convolucionais')
+        assert record == BDTDRecord(id='R3', title='Redes convolucionais')
+        assert index.search('conceicao')[0][0].primary_authors == ['Conceição, José']
@@ -0,0 +1,176 @@
+import os
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+import pytest
+
+from BDTDhttp import HTTPClient
+from BDTDoai import OAI_NS, OAIHarvester, OAIError
+from BDTDrecord import read_records_table
+
+from conftest import QuietHandler
+
+PAGE_SIZE = 2
+
+
+class OAIRepository:
+    """
+    Repositório OAI-PMH mínimo: registros com datestamp, remoção lógica e resumptionTokens.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.response_date = '2024-01-01T00:00:00Z'
+        self.requests = []
+
+    def put(self, rec_id: str, title: str, datestamp: str, deleted: bool = False):
+        self.records[rec_id] = {'title': title, 'datestamp': datestamp, 'deleted': deleted}
+
+    def record_xml(self, rec_id: str, record: dict) -> str:
+        status = ' status="deleted"' if record['deleted'] else ''
+        header = (f'<header{status}><identifier>oai:bdtd:{rec_id}</identifier>'
+                  f'<datestamp>{record["datestamp"]}</datestamp></header>')
+        if record['deleted']:
+            return f'<record>{header}</record>'
+        return (f'<record>{header}<metadata><oai_dc:dc><dc:title>{escape(record["title"])}</dc:title>'
+                f'<dc:creator>Autor</dc:creator><dc:date>2020-05-01</dc:date>'
+                f'<dc:identifier>http://example.org/{rec_id}</dc:identifier></oai_dc:dc></metadata></record>')
+
+    def respond(self, params: dict) -> str:
+        self.requests.append(params)
+        if 'resumptionToken' in params:
+            offset, from_date = params['resumptionToken'].split('|')
+            offset = int(offset)
+        else:
+            offset, from_date = 0, params.get('from', '')
+        matches = sorted(rec_id for rec_id, record in self.records.items() if record['datestamp'] >= from_date)
+
+        body = ''
+        if not matches:
+            body = '<error code="noRecordsMatch">Nenhum registro</error>'
+        else:
+            page = matches[offset:offset + PAGE_SIZE]
+            token = f'{offset + PAGE_SIZE}|{from_date}' if offset + PAGE_SIZE < len(matches) else ''
+            body = ('<ListRecords>' + ''.join(self.record_xml(rec_id, self.records[rec_id]) for rec_id in page)
+                    + f'<resumptionToken>{token}</resumptionToken></ListRecords>')
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/" '
+                'xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" '
+                'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+                f'<responseDate>{self.response_date}</responseDate>{body}</OAI-PMH>')
+
+
+@pytest.fixture
+def oai(serve):
+    repository = OAIRepository()
+
+    class Handler(QuietHandler):
+        def do_GET(self):
+            params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+            self.send(200, repository.respond(params).encode('utf-8'), 'text/xml')
+
+    server = serve(Handler)
+    return repository, OAIHarvester(base_url=server.url + '/OAI', client=HTTPClient())
+
+
+def mirror_titles(path: str) -> dict:
+    df = read_records_table(path)
+    return dict(zip(df['id'], df['title']))
+
+
+def test_full_harvest_follows_resumption_tokens(oai, tmp_path):
+    repository, harvester = oai
+    for n in range(1, 6):
+        repository.put(f'R{n}', f'Título {n}', '2023-12-01')
+    mirror = str(tmp_path / 'mirror.csv')
+
+    harvester.harvest(mirror)
+
+    assert mirror_titles(mirror) == {f'R{n}': f'Título {n}' for n in range(1, 6)}
+    # 5 registros em páginas de 2: a requisição inicial e duas com resumptionToken
+    assert len(repository.requests) == 3
+    assert all(set(params) == {'verb', 'resumptionToken'} for params in repository.requests[1:])
+
+
+def test_incremental_harvest_upserts_and_removes(oai, tmp_path):
+    repository, harvester = oai
+    for n in range(1, 5):
+        repository.put(f'R{n}', f'Título {n}', '2023-12-01')
+    mirror = str(tmp_path / 'mirror.csv')
+    state = str(tmp_path / 'oai_state.json')
+    harvester.harvest(mirror, state_path=state)
+
+    # Alterações no repositório após a primeira coleta
+    repository.response_date = '2024-02-01T00:00:00Z'
+    repository.put('R2', 'Título 2 (revisado)', '2024-01-10')
+    repository.put('R3', '', '2024-01-11', deleted=True)
+    repository.put('R99', 'Título 99', '2024-01-12')
+    repository.requests.clear()
+
+    harvester.harvest(mirror, state_path=state)
+
+    assert repository.requests[0]['from'] == '2024-01-01T00:00:00Z'
+    assert mirror_titles(mirror) == {
+        'R1': 'Título 1',
+        'R2': 'Título 2 (revisado)',
+        'R4': 'Título 4',
+        'R99': 'Título 99',
+    }
+    assert not os.path.exists(str(tmp_path / 'mirror.delta.csv'))
+
+    # Nenhuma alteração desde a última coleta (noRecordsMatch): o espelho é mantido
+    repository.requests.clear()
+    harvester.harvest(mirror, state_path=state)
+    assert repository.requests[0]['from'] == '2024-02-01T00:00:00Z'
+    assert len(mirror_titles(mirror)) == 4
+
+
+def test_deletions_only_delta(oai, tmp_path):
+    repository, harvester = oai
+    for n in range(1, 4):
+        repository.put(f'R{n}', f'Título {n}', '2023-12-01')
+    mirror = str(tmp_path / 'mirror.csv')
+    state = str(tmp_path / 'oai_state.json')
+    harvester.harvest(mirror, state_path=state)
+
+    repository.put('R1', '', '2024-01-05', deleted=True)
+    harvester.harvest(mirror, state_path=state)
+
+    assert set(mirror_titles(mirror)) == {'R2', 'R3'}
+
+
+def test_no_records_match(oai, tmp_path):
+    repository, harvester = oai
+    with pytest.raises(OAIError) as error:
+        harvester._request({'verb': 'ListRecords', 'metadataPrefix': 'oai_dc'})
+    assert error.value.code == 'noRecordsMatch'
+    # Em ListRecords, noRecordsMatch encerra a coleta sem erro e sem criar o espelho
+    mirror = str(tmp_path / 'mirror.csv')
+    harvester.harvest(mirror)
+    assert not os.path.exists(mirror)
+
+
+def test_invalid_responses_are_retried(serve):
+    repository = OAIRepository()
+    repository.put('R1', 'Título 1', '2023-12-01')
+    # Resposta truncada e página de erro HTML, ambas com status 200, antes da resposta válida
+    bad = [b'<?xml version="1.0"?><OAI-PMH><ListRecords><rec', b'<html><body>Erro interno</body>']
+
+    class Handler(QuietHandler):
+        def do_GET(self):
+            params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+            if bad:
+                return self.send(200, bad.pop(0), 'text/html')
+            self.send(200, repository.respond(params).encode('utf-8'), 'text/xml')
+
+    harvester = OAIHarvester(base_url=serve(Handler).url + '/OAI', client=HTTPClient(), retries=2, backoff=0)
+    params = {'verb': 'ListRecords', 'metadataPrefix': 'oai_dc'}
+
+    assert len(harvester._request(params).findall('.//oai:record', OAI_NS)) == 1
+
+    # Sem novas tentativas, a resposta inválida vira um OAIError que identifica a requisição
+    harvester.retries = 0
+    bad.append(b'<html><body>Erro interno</body>')
+    with pytest.raises(OAIError, match='ListRecords') as error:
+        harvester._request(params)
+    assert error.value.code == 'invalidResponse'
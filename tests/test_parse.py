@@ -0,0 +1,63 @@
+import pytest
+
+import BDTDparse
+from BDTDadapters import default_registry
+from BDTDdownloader import PDFDownloader
+from BDTDparse import LINK_TAGS, html_text, parse_html
+
+PAGE = """<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+  <title>Regressão logística &amp; crédito</title>
+  <meta name="generator" content="DSpace 6.3">
+  <meta name="citation_pdf_url" content="/bitstream/123/4/tese.pdf">
+  <style>.files { color: red }</style>
+  <script>var url = "/nao/e/link.pdf";</script>
+</head>
+<body>
+  <div id="menu"><a href="/">Início</a> | <a href="/sobre">Sobre</a></div>
+  <h1>Regressão logística aplicada à análise de crédito</h1>
+  <p>Resumo: estudo de <b>modelos</b> lineares generalizados.<br>Palavras-chave: crédito</p>
+  <table><tr><td class="files">
+    <a class="file" href="/bitstream/123/4/tese.pdf?sequence=1">Texto completo (PDF)</a>
+    <a href="https://outro.br/download/99"><img src="pdf.png" alt="PDF"></a>
+  </td></tr></table>
+  <iframe src="/viewer?file=/bitstream/123/4/anexo.pdf"></iframe>
+  <template><a href="/rascunho.pdf">rascunho</a></template>
+  <p>Acesso em 2024 &mdash; BDTD</p>
+</body>
+</html>"""
+
+URL = 'http://repo.br/handle/123/4'
+
+
+def tags(soup) -> list:
+    return [(tag.name, sorted(tag.attrs.items())) for tag in soup.find_all(LINK_TAGS)]
+
+
+@pytest.mark.parametrize('parser', ['lxml', 'html.parser'])
+def test_restricted_parse_finds_the_same_links(tmp_path, parser):
+    if parser == 'lxml':
+        pytest.importorskip('lxml')
+    restricted = parse_html(PAGE, parser)
+    full = parse_html(PAGE, parser, only=None)
+
+    assert tags(restricted) == tags(full)
+    finder = PDFDownloader(str(tmp_path))
+    assert sorted(finder.find_pdf_links(restricted, URL)) == sorted(finder.find_pdf_links(full, URL))
+    assert default_registry().resolve(restricted, URL) == default_registry().resolve(full, URL)
+    # A árvore restrita não contém o resto do documento
+    assert restricted.find('h1') is None and full.find('h1') is not None
+
+
+def test_html_text_is_the_same_with_and_without_selectolax():
+    pytest.importorskip('lxml')
+    if BDTDparse.HTMLParser is None:
+        pytest.skip('selectolax não instalado')
+
+    fast = html_text(PAGE)
+    words = html_text(PAGE, 'lxml').split()
+
+    assert fast.split() == words == html_text(PAGE, 'html.parser').split()
+    assert 'Regressão logística aplicada à análise de crédito' in fast
+    assert 'nao/e/link' not in fast and 'color' not in fast and 'rascunho' not in fast
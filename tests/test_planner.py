@@ -0,0 +1,115 @@
+import os
+from urllib.parse import quote
+
+import pytest
+import requests
+
+import BDTDfinder
+from BDTDfinder import BDTDCrawler
+from BDTDharvest import HarvestState
+from BDTDplanner import PartitionHarvestError, QueryPlanner
+from BDTDrecord import read_records_table
+from BDTDResearchAgent import BDTDAgent
+
+from conftest import FakeSearchAPI, make_record
+
+
+def make_corpus(overlapping: bool = True):
+    """
+    70 registros de 2020: 20 dissertações, 15 teses, 10 com os dois formatos (ou dissertações, se
+    overlapping=False), 5 sem formato e 20 livros.
+    """
+    both = ('Dissertação', 'Tese') if overlapping else ('Dissertação',)
+    groups = [(20, ('Dissertação',)), (15, ('Tese',)), (10, both), (5, ()), (20, ('Livro',))]
+    records = []
+    for size, formats in groups:
+        records.extend(make_record(len(records), '2020', formats=formats) for _ in range(size))
+    return records
+
+
+def harvest(planner: QueryPlanner, partitions) -> set:
+    ids = set()
+    for _, records in planner.iter_partition_records('tema', partitions, max_workers=2):
+        ids.update(record.id for record in records)
+    return ids
+
+
+@pytest.mark.parametrize('facet_limit', [30, 2])
+def test_multivalued_facet_falls_back_to_unpartitioned_slice(facet_limit):
+    corpus = make_corpus()
+    api = FakeSearchAPI(corpus, facet_limit=facet_limit)
+    planner = QueryPlanner(BDTDCrawler(client=api), max_partition_size=20)
+
+    partitions = planner.plan('tema')
+
+    # Com todos os formatos listados, a soma (80) já excede o total; com apenas os dois mais
+    # frequentes, a sobreposição só aparece somando o complemento (30 + 25 + 25)
+    assert [(partition.filters, partition.count) for partition in partitions] == [(['publishDate:"2020"'], 70)]
+    assert planner.summary(partitions)['records'] == 70
+    assert harvest(planner, partitions) == {record['id'] for record in corpus}
+
+
+def test_single_valued_facet_is_partitioned():
+    corpus = make_corpus(overlapping=False)
+    planner = QueryPlanner(BDTDCrawler(client=FakeSearchAPI(corpus, facet_limit=2)), max_partition_size=30)
+
+    partitions = planner.plan('tema')
+
+    assert len(partitions) > 1
+    assert all(partition.count <= 30 for partition in partitions)
+    assert planner.summary(partitions)['records'] == 70
+    assert harvest(planner, partitions) == {record['id'] for record in corpus}
+
+
+class FailingSearchAPI(FakeSearchAPI):
+    """
+    Falha ao baixar os registros das partições com o filtro informado (as contagens funcionam).
+    """
+
+    def __init__(self, records, failing_filter: str, **kwargs):
+        super().__init__(records, **kwargs)
+        self.failing_filter = failing_filter
+
+    def get(self, url: str, headers=None, **kwargs):
+        if 'limit=0' not in url and quote(self.failing_filter) in url:
+            raise requests.exceptions.ConnectionError('conexão recusada')
+        return super().get(url, headers=headers, **kwargs)
+
+
+def by_year():
+    return [make_record(n, str(2018 + n % 3)) for n in range(60)]
+
+
+def test_failed_partitions_are_reported():
+    planner = QueryPlanner(BDTDCrawler(client=FailingSearchAPI(by_year(), 'publishDate:"2019"'), retries=0),
+                           max_partition_size=20)
+    partitions = planner.plan('tema')
+    harvested = []
+
+    with pytest.raises(PartitionHarvestError) as error:
+        for partition, records in planner.iter_partition_records('tema', partitions, max_workers=2):
+            harvested.append(partition.filters)
+
+    assert sorted(harvested) == [['publishDate:"2018"'], ['publishDate:"2020"']]
+    assert [partition.filters for partition, _ in error.value.failures] == [['publishDate:"2019"']]
+
+
+def test_incomplete_partitioned_harvest_keeps_delta_state(tmp_path, capsys, monkeypatch):
+    # Sem espera entre as novas tentativas do crawler criado pelo agente
+    monkeypatch.setattr(BDTDfinder.time, 'sleep', lambda delay: None)
+    api = FailingSearchAPI(by_year(), 'publishDate:"2019"')
+    agent = BDTDAgent('tema', output_dir=str(tmp_path), client=api, partition_size=20, delta=True)
+
+    path = agent.run_crawler()
+
+    assert len(read_records_table(path)) == 40
+    assert [partition.filters for partition in agent.failed_partitions] == [['publishDate:"2019"']]
+    assert not os.path.exists(HarvestState.for_query(str(tmp_path), 'tema').path)
+    out = capsys.readouterr().out
+    assert 'Coleta incompleta' in out and 'Total de registros coletados' not in out
+
+    # Sem falhas, a coleta é concluída e o estado é gravado
+    api.failing_filter = 'nenhum'
+    agent.run_crawler()
+    assert agent.failed_partitions == []
+    assert len(HarvestState.for_query(str(tmp_path), 'tema').seen_ids) == 60
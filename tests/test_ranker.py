@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from BDTDranker import RecordRanker
+
+
+def records() -> pd.DataFrame:
+    return pd.DataFrame({
+        'id': ['A', 'B', 'C', 'D', 'E'],
+        'title': ['Redes neurais', 'Regressão logística', 'Modelos de previsão', 'Regressao', 'Redes de computadores'],
+        'subjects': ['Aprendizado de máquina', 'Estatística', 'Séries temporais', None, 'Telecomunicações'],
+        'abstract': ['Uso de redes neurais', 'Regressão logística e regressão linear em dados de crédito',
+                     'Regressão', '', 'Protocolos'],
+    })
+
+
+def test_bm25_ordering():
+    ranked = RecordRanker().rank(records(), 'regressão logística')
+
+    # Os dois termos no título vêm antes de um termo no título, que vem antes de um termo no resumo
+    assert list(ranked['id']) == ['B', 'D', 'C']
+    assert list(ranked['score']) == sorted(ranked['score'], reverse=True)
+    assert (ranked['score'] > 0).all()
+
+
+def test_field_weights_change_ordering():
+    ranker = RecordRanker(field_weights={'abstract': 1.0})
+
+    # Só o resumo conta: o resumo curto de C supera o longo de B (normalização pelo tamanho)
+    assert list(ranker.rank(records(), 'regressão')['id']) == ['C', 'B']
+
+
+def test_rare_terms_weigh_more():
+    df = pd.DataFrame({'title': ['redes neurais', 'redes sociais', 'redes de sensores', 'neurais']})
+    scores = RecordRanker().score(df, 'redes neurais')
+
+    # 'neurais' aparece em menos títulos que 'redes'
+    assert scores[3] > scores[1]
+    assert scores[0] == scores.max()
+
+
+def test_top_k_cut_off():
+    ranker = RecordRanker()
+
+    assert list(ranker.rank(records(), 'regressão logística', top_k=2)['id']) == ['B', 'D']
+    assert len(ranker.rank(records(), 'regressão logística', top_k=10)) == 3
+    assert len(ranker.rank(records(), 'regressão logística', top_k=None)) == 3
+
+
+def test_empty_input_and_zero_scores():
+    ranker = RecordRanker()
+    empty = records().iloc[0:0]
+
+    assert ranker.score(empty, 'redes').shape == (0,)
+    assert ranker.rank(empty, 'redes', top_k=3).empty
+    # Nenhum termo encontrado, ou consulta vazia: todas as pontuações são 0 e nada é mantido
+    assert np.array_equal(ranker.score(records(), 'inexistente'), np.zeros(5))
+    assert ranker.rank(records(), 'inexistente').empty
+    assert ranker.rank(records(), '  ', top_k=2).empty
+    assert 'score' in ranker.rank(records(), 'inexistente').columns
@@ -0,0 +1,71 @@
+import pytest
+
+from BDTDfinder import BDTDCrawler, RecordWriter
+from BDTDrecord import BDTDRecord, read_records_table, split_field, split_urls
+
+from conftest import make_record
+
+
+def sample_record() -> BDTDRecord:
+    raw = make_record(
+        7, '2019',
+        formats=('Dissertação', 'Tese'),
+        authors={'primary': {'Silva, João': {'profile': ['http://lattes/1']}, 'Souza, Maria': []},
+                 'secondary': ['Pereira, Ana']},
+        subjects=[['Estatística'], ['Regressão', 'Modelos lineares']],
+        urls=[{'url': 'http://example.org/a', 'desc': 'Texto completo'},
+              {'url': 'http://example.org/b', 'desc': 'PDF'}],
+    )
+    return BDTDCrawler().process_record(raw)
+
+
+def test_process_record_keeps_lists():
+    record = sample_record()
+
+    assert record.id == 'REC00007'
+    assert record.primary_authors == ['Silva, João', 'Souza, Maria']
+    assert record.primary_authors_profiles == ['http://lattes/1']
+    assert record.secondary_authors == ['Pereira, Ana']
+    assert record.formats == ['Dissertação', 'Tese']
+    assert record.urls == ['http://example.org/a', 'http://example.org/b']
+    assert not hasattr(record, '__dict__')
+
+
+def test_row_round_trip():
+    record = sample_record()
+
+    row = record.to_row()
+
+    assert row['urls'] == 'http://example.org/a|http://example.org/b'
+    assert row['formats'] == 'Dissertação; Tese'
+    assert BDTDRecord.from_row(row) == record
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(TypeError):
+        BDTDRecord(id='1', autores=['x'])
+
+
+def test_split_field():
+    assert split_field(float('nan')) == []
+    assert split_field(None) == []
+    assert split_field('a; b;; c ') == ['a', 'b', 'c']
+    assert split_field(['a', ' ', 'b']) == ['a', 'b']
+    assert split_field(2020) == ['2020']
+    assert split_urls('http://x/a?p=1;2|http://x/b') == ['http://x/a?p=1;2', 'http://x/b']
+
+
+@pytest.mark.parametrize('extension', ['csv', 'parquet'])
+def test_table_round_trip(tmp_path, extension):
+    if extension == 'parquet':
+        pytest.importorskip('pyarrow')
+    record = sample_record()
+    path = str(tmp_path / f'results.{extension}')
+    with RecordWriter(path) as writer:
+        writer.write([record, BDTDRecord(id='0042', title='Sem autores')])
+
+    df = read_records_table(path)
+
+    # Ids com zeros à esquerda continuam texto
+    assert list(df['id']) == ['REC00007', '0042']
+    assert [BDTDRecord.from_row(row) for row in df.to_dict('records')] == [record, BDTDRecord(id='0042', title='Sem autores')]
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+import BDTDReviewer
+from BDTDReviewer import BDTDReviewer as Reviewer
+
+
+class StopAfterCleanup(Exception):
+    pass
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    path = tmp_path / 'output'
+    (path / '.pdfstore' / 'objects').mkdir(parents=True)
+    (path / '.pdfstore' / 'urls.json').write_text('{}')
+    (path / 'REC1').mkdir()
+    for name in ('results.csv', 'results_filtered.csv', 'results_page.csv', 'harvest_state_abc.json'):
+        (path / name).write_text('x')
+    return path
+
+
+def run_cleanup(output_dir, monkeypatch, **kwargs) -> set:
+    """
+    Executa apenas a limpeza inicial de run (o BDTDAgent é substituído) e retorna o que restou.
+    """
+    def agent(*args, **agent_kwargs):
+        raise StopAfterCleanup()
+
+    monkeypatch.setattr(BDTDReviewer, 'BDTDAgent', agent)
+    reviewer = Reviewer('tema', output_dir=str(output_dir), openrouter_api_key='x', **kwargs)
+    # run encapsula qualquer erro das etapas em Exception('Erro no processo de revisão: ...')
+    with pytest.raises(Exception, match='Erro no processo de revisão'):
+        reviewer.run()
+    return set(os.listdir(output_dir))
+
+
+def test_cleanup_keeps_pdf_store(output_dir, monkeypatch):
+    remaining = run_cleanup(output_dir, monkeypatch)
+
+    assert remaining == {'.pdfstore'}
+    assert (output_dir / '.pdfstore' / 'urls.json').exists()
+
+
+def test_cleanup_keeps_interrupted_crawl(output_dir, monkeypatch):
+    (output_dir / 'results.csv.checkpoint.json').write_text('{}')
+
+    remaining = run_cleanup(output_dir, monkeypatch)
+
+    assert remaining == {'.pdfstore', 'results.csv', 'results.csv.checkpoint.json'}
+
+
+def test_cleanup_keeps_delta_state(output_dir, monkeypatch):
+    remaining = run_cleanup(output_dir, monkeypatch, delta=True)
+
+    assert remaining == {'.pdfstore', 'results.csv', 'harvest_state_abc.json'}
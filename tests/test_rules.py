@@ -0,0 +1,157 @@
+import os
+
+from bs4 import BeautifulSoup
+
+from BDTDadapters import AdapterRegistry
+from BDTDdownloader import PDFDownloader
+from BDTDhttp import HTTPClient
+from BDTDrules import LinkRule, LinkRules
+
+from conftest import QuietHandler
+
+PDF = b'%PDF-1.4\n' + b'0' * 4000
+
+
+def page(item: str, pdf_path: str) -> str:
+    return (f'<html><body><a href="/handle/{item}/citar">Citar</a>'
+            f'<div class="files"><span class="name"><a class="file" href="{pdf_path}">Texto completo (PDF)</a>'
+            f'</span></div></body></html>')
+
+
+def learned(rules: LinkRules, host: str) -> dict:
+    return {rule.kind: rule.value for rule in rules.rules_for(host)}
+
+
+def test_learn_derives_all_rule_kinds():
+    rules = LinkRules()
+    url = 'http://repo.br/handle/123/4567'
+    soup = BeautifulSoup(page('123/4567', '/bitstream/123/4567/tese.pdf'), 'html.parser')
+
+    rules.learn(url, url, soup, ['http://repo.br/bitstream/123/4567/tese.pdf'])
+
+    assert learned(rules, 'repo.br') == {
+        'template': 'http://repo.br/bitstream/{2}/{3}/tese.pdf',
+        'pattern': r'repo\.br/bitstream/\d+/\d+/[^/]+\.pdf',
+        'text': 'texto completo (pdf)',
+        'position': 'div.files > span.name > a.file',
+    }
+    # Um modelo visto em um único registro ainda não dispensa o acesso à página
+    assert rules.resolve_url('http://repo.br/handle/9/99') == (None, [])
+
+    other = 'http://repo.br/handle/123/8888'
+    rules.learn(other, other, None, ['http://repo.br/bitstream/123/8888/tese.pdf'])
+    rule, links = rules.resolve_url('http://repo.br/handle/9/99')
+    assert rule.kind == 'template' and links == ['http://repo.br/bitstream/9/99/tese.pdf']
+    # Páginas de outro formato não recebem o modelo
+    assert rules.resolve_url('http://repo.br/handle/sobre') == (None, [])
+
+
+def test_learned_rules_find_links_on_new_pages():
+    rules = LinkRules()
+    url = 'http://repo.br/handle/1/10'
+    rules.learn(url, url, BeautifulSoup(page('1/10', '/bitstream/1/10/a.pdf'), 'html.parser'),
+                ['http://repo.br/bitstream/1/10/a.pdf'])
+
+    soup = BeautifulSoup(page('2/20', '/bitstream/2/20/outro-nome.pdf'), 'html.parser')
+    rule, links = rules.resolve(soup, 'http://repo.br/handle/2/20')
+
+    assert links == ['http://repo.br/bitstream/2/20/outro-nome.pdf']
+    assert rules.resolve(soup, 'http://outro.br/handle/2/20') == (None, [])
+
+
+def test_misses_decay_confidence_until_rule_is_dropped(capsys):
+    rules = LinkRules(decay=0.9, min_confidence=0.25)
+    url = 'http://repo.br/handle/1/10'
+    rules.learn(url, url, None, ['http://repo.br/bitstream/1/10/a.pdf'])
+    [rule] = rules.rules_for('repo.br')
+
+    confidences = []
+    while rule in rules.rules_for('repo.br'):
+        rules.record(rule, False)
+        confidences.append(rule.confidence)
+
+    assert confidences == sorted(confidences, reverse=True)
+    assert len(confidences) == 5
+    assert 'Regra descartada para repo.br' in capsys.readouterr().out
+
+
+def test_decay_bounds_old_successes():
+    rules = LinkRules(decay=0.9)
+    rule = LinkRule('repo.br', 'text', 'pdf')
+    rules.hosts['repo.br'] = [rule]
+    for _ in range(200):
+        rules.record(rule, True)
+
+    # Os acertos antigos perdem peso: o total fica limitado a 1 / (1 - decay)
+    assert rule.hits < 10
+    misses = 0
+    while rule in rules.hosts['repo.br']:
+        rules.record(rule, False)
+        misses += 1
+    assert misses < 20
+
+
+def test_rules_persist_and_are_capped(tmp_path):
+    path = str(tmp_path / 'rules.json')
+    rules = LinkRules(path, max_rules=2)
+    for value in ('a', 'b', 'c'):
+        rules.record(rules._get_or_add('repo.br', 'text', value), True)
+    rules.record(rules._get_or_add('repo.br', 'text', 'c'), True)
+    rules.save()
+
+    reloaded = LinkRules(path)
+
+    assert [(rule.value, rule.hits) for rule in reloaded.rules_for('repo.br')] == [('c', 1.9), ('b', 1.0)]
+
+
+def make_repository(hits, layout):
+    class Handler(QuietHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            prefix = f'/{layout[0]}/'
+            if self.path.startswith(prefix):
+                return self.send(200, PDF, 'application/pdf')
+            if not self.path.startswith('/handle/'):
+                return self.send(404, b'nf')
+            item = self.path[len('/handle/'):]
+            pdf_path = f'{prefix}{item}/tese.pdf'
+            return self.send(200, page(item, pdf_path).encode('utf-8'))
+    return Handler
+
+
+def test_downloader_learns_and_unlearns_templates(serve, tmp_path):
+    hits, layout = [], ['bitstream']
+    server = serve(make_repository(hits, layout))
+    rules = LinkRules(str(tmp_path / 'rules.json'))
+
+    def download(item: str) -> list:
+        downloader = PDFDownloader(str(tmp_path / item.replace('/', '_')), client=HTTPClient(), min_size=100,
+                                   retries=0, adapters=AdapterRegistry(), rules=rules)
+        return downloader.process_page(f'{server.url}/handle/{item}')
+
+    for item in ('1/10', '2/20'):
+        assert len(download(item)) == 1
+    hits.clear()
+
+    # Modelo confirmado em dois registros: o PDF é deduzido sem acessar a página
+    assert [os.path.basename(path) for path in download('3/30')] == ['tese.pdf']
+    assert hits == ['/bitstream/3/30/tese.pdf']
+
+    # O repositório muda de formato: o modelo falha, a página é acessada e a regra perde confiança
+    layout[0] = 'files'
+    host = server.url.split('//', 1)[1]
+    [old_template] = rules.rules_for(host, ('template',))
+    before = old_template.confidence
+    for item in ('4/40', '5/50'):
+        hits.clear()
+        assert len(download(item)) == 1
+        assert hits == [f'/bitstream/{item}/tese.pdf', f'/handle/{item}', f'/files/{item}/tese.pdf']
+    assert old_template.confidence < before
+
+    # O novo formato, confirmado em dois registros, passa à frente do antigo
+    hits.clear()
+    assert len(download('6/60')) == 1
+    assert hits == ['/files/6/60/tese.pdf']
+    rules.save()
+    templates = [rule.value for rule in LinkRules(rules.path).rules_for(host, ('template',))]
+    assert templates[0] == f'{server.url}/files/{{2}}/{{3}}/tese.pdf'
@@ -0,0 +1,70 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from BDTDdownloader import DownloadScheduler
+
+
+class FakeDownloader:
+    """
+    Handler que registra a ordem das chamadas e o maior número de downloads simultâneos por host.
+    """
+
+    def __init__(self, delay: float = 0.0, slow_host: str = None, fail: str = None):
+        self.delay = delay
+        self.slow_host = slow_host
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.order = []
+        self.active = {}
+        self.peak = {}
+
+    def __call__(self, key, url: str) -> list:
+        host = urlparse(url).netloc
+        with self.lock:
+            self.order.append(url)
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        try:
+            time.sleep(self.delay * (5 if host == self.slow_host else 1))
+            if url == self.fail:
+                raise ConnectionError('conexão recusada')
+            return [f'{key}.pdf']
+        finally:
+            with self.lock:
+                self.active[host] -= 1
+
+
+def test_round_robin_across_hosts():
+    tasks = [(n, url) for n, url in enumerate([
+        'http://a.br/1', 'http://a.br/2', 'http://a.br/3', 'http://b.br/1', 'http://b.br/2', 'http://c.br/1'])]
+    downloader = FakeDownloader()
+
+    results = list(DownloadScheduler(max_workers=1, per_host=1).run(tasks, downloader))
+
+    assert downloader.order == ['http://a.br/1', 'http://b.br/1', 'http://c.br/1',
+                                'http://a.br/2', 'http://b.br/2', 'http://a.br/3']
+    assert sorted(results) == sorted((key, url, [f'{key}.pdf']) for key, url in tasks)
+
+
+def test_per_host_cap():
+    tasks = [(f'lento{n}', f'http://lento.br/{n}') for n in range(8)]
+    tasks += [(f'rapido{n}', f'http://rapido.br/{n}') for n in range(4)]
+    downloader = FakeDownloader(delay=0.02, slow_host='lento.br')
+
+    results = list(DownloadScheduler(max_workers=6, per_host=2).run(tasks, downloader))
+
+    assert len(results) == 12
+    assert downloader.peak == {'lento.br': 2, 'rapido.br': 2}
+    # O host lento não atrasa o outro: os downloads rápidos terminam primeiro
+    assert {key for key, _, _ in results[:4]} == {f'rapido{n}' for n in range(4)}
+
+
+def test_failed_task_yields_empty_list(capsys):
+    tasks = [(1, 'http://a.br/1'), (2, 'http://b.br/2')]
+
+    results = dict((key, files) for key, _, files in
+                   DownloadScheduler().run(tasks, FakeDownloader(fail='http://a.br/1')))
+
+    assert results == {1: [], 2: ['2.pdf']}
+    assert 'Erro ao baixar de http://a.br/1' in capsys.readouterr().out
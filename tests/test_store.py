@@ -0,0 +1,101 @@
+import hashlib
+import os
+
+import pytest
+
+import BDTDstore
+from BDTDstore import PDFStore
+
+PDF = b'%PDF-1.4\n' + b'1' * 2000
+OTHER = b'%PDF-1.4\n' + b'2' * 2000
+
+
+def stage(store: PDFStore, content: bytes, name: str) -> str:
+    """
+    Grava um download concluído na pasta temporária do repositório e o incorpora.
+    """
+    path = os.path.join(store.tmp_dir, name)
+    with open(path, 'wb') as f:
+        f.write(content)
+    digest = hashlib.sha256(content).hexdigest()
+    store.add(path, digest)
+    return digest
+
+
+def objects(store: PDFStore) -> list:
+    return sorted(name for _, _, files in os.walk(store.objects_dir) for name in files)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PDFStore(str(tmp_path / 'store'))
+
+
+def test_same_content_from_two_urls_is_stored_once(store, tmp_path):
+    first = stage(store, PDF, 'a.part')
+    second = stage(store, PDF, 'b.part')
+    store.remember(['http://a.br/handle/1', 'http://a.br/tese.pdf'], first, 'tese.pdf')
+    store.remember(['http://b.br/espelho.pdf'], second, 'espelho.pdf')
+
+    assert first == second
+    assert objects(store) == [f'{first}.pdf']
+    assert os.listdir(store.tmp_dir) == []
+    assert store.lookup('http://a.br/handle/1') == [(first, 'tese.pdf')]
+    assert store.lookup('http://b.br/espelho.pdf') == [(first, 'espelho.pdf')]
+
+
+def test_link_uses_hardlink(store, tmp_path):
+    digest = stage(store, PDF, 'a.part')
+
+    path = store.link(digest, str(tmp_path), 'tese.pdf')
+
+    assert os.path.samefile(path, store.object_path(digest))
+    assert store.link(digest, str(tmp_path), 'tese.pdf') == path
+    assert sorted(os.listdir(tmp_path)) == ['store', 'tese.pdf']
+
+
+def test_copy_fallback_is_not_duplicated_on_rerun(store, tmp_path, monkeypatch):
+    def no_hardlinks(src, dst):
+        raise OSError('hardlinks não suportados')
+
+    monkeypatch.setattr(BDTDstore.os, 'link', no_hardlinks)
+    digest = stage(store, PDF, 'a.part')
+
+    path = store.link(digest, str(tmp_path), 'tese.pdf')
+
+    assert not os.path.samefile(path, store.object_path(digest))
+    with open(path, 'rb') as f:
+        assert f.read() == PDF
+    # A cópia da execução anterior é reconhecida pelo conteúdo
+    assert store.link(digest, str(tmp_path), 'tese.pdf') == path
+    assert sorted(os.listdir(tmp_path)) == ['store', 'tese.pdf']
+
+
+def test_name_clash_gets_digest_suffix(store, tmp_path):
+    first = stage(store, PDF, 'a.part')
+    second = stage(store, OTHER, 'b.part')
+    # Mesmo tamanho, conteúdo diferente
+    assert len(PDF) == len(OTHER)
+
+    store.link(first, str(tmp_path), 'tese.pdf')
+    path = store.link(second, str(tmp_path), 'tese.pdf')
+
+    assert os.path.basename(path) == f'tese_{second[:8]}.pdf'
+    assert store.link(second, str(tmp_path), 'tese.pdf') == path
+    assert sorted(os.listdir(tmp_path)) == ['store', 'tese.pdf', f'tese_{second[:8]}.pdf']
+
+
+def test_url_index_round_trip(store):
+    digest = stage(store, PDF, 'a.part')
+    store.remember(['http://a.br/handle/1', 'http://a.br/tese.pdf'], digest, 'tese.pdf')
+    store.remember(['http://a.br/handle/1'], digest, 'tese.pdf')
+    store.save()
+
+    reloaded = PDFStore(store.root)
+
+    assert reloaded.urls == store.urls
+    assert reloaded.lookup('http://a.br/handle/1') == [(digest, 'tese.pdf')]
+    assert reloaded.lookup('http://desconhecida.br') is None
+    # Objetos removidos do repositório invalidam a entrada
+    os.remove(reloaded.object_path(digest))
+    assert reloaded.lookup('http://a.br/tese.pdf') is None
@@ -0,0 +1,104 @@
+import re
+import unicodedata
+
+import pandas as pd
+import pytest
+
+import BDTDtext
+from BDTDrecord import read_records_table, write_records_table
+from BDTDResearchAgent import BDTDAgent
+from BDTDtext import compile_terms, match_terms
+
+TITLES = [
+    'Regressão logística em séries históricas',
+    'REGRESSAO LOGISTICA PARA CREDITO',
+    'Modelos de regressões não lineares',
+    'Um estudo regressivo da inflação',
+    'Redes neurais (Regressão)',
+    'Análise de sobrevivência',
+    None,
+]
+
+
+class FakeStemmer:
+    """
+    Stemmer com radicais fixos, para os testes não dependerem dos dados do RSLP.
+    """
+    ROOTS = {'regressão': 'regress', 'regressões': 'regress', 'de': 'de', 'análise': 'anális'}
+
+    def stem(self, word: str) -> str:
+        return self.ROOTS.get(word, word)
+
+
+@pytest.fixture
+def stemmer(monkeypatch):
+    monkeypatch.setattr(BDTDtext, '_stemmer', FakeStemmer())
+
+
+def matching(terms, stem: bool = False, fields=('title',)) -> list:
+    df = pd.DataFrame({'title': TITLES})
+    return list(df.index[match_terms(df, terms, fields=fields, stem=stem)])
+
+
+def test_accents_and_case_are_ignored():
+    pattern = compile_terms(['regressao'])
+
+    assert pattern.search('Regressão linear')
+    assert pattern.search('REGRESSÃO') and pattern.search('regressao')
+    # Forma decomposta (NFD): letra seguida da marca combinante
+    assert pattern.search('regressão')
+    assert not pattern.search('regressões') and not pattern.search('autorregressao')
+    assert matching(['Regressão']) == matching(['regressao']) == [0, 1, 4]
+    assert matching(['analise', 'credito']) == [1, 5]
+
+
+def test_stemmed_variants_match(stemmer):
+    assert matching(['regressão']) == [0, 1, 4]
+    assert matching(['regressão'], stem=True) == [0, 1, 2, 3, 4]
+    # Radicais curtos demais são usados como palavra inteira
+    assert matching(['de'], stem=True) == [2, 5]
+    assert matching(['Análise'], stem=True) == [5]
+
+
+def test_real_stemmer_variants():
+    try:
+        BDTDtext.get_stemmer()
+    except (ImportError, LookupError) as e:
+        pytest.skip(str(e))
+    assert matching(['regressões'], stem=True) == matching(['regressao'], stem=True)
+    assert {0, 1, 2, 4} <= set(matching(['regressões'], stem=True))
+
+
+def test_empty_terms_and_missing_fields():
+    assert compile_terms([' ', '']).search('qualquer coisa') is None
+    assert matching(['regressao'], fields=('title', 'abstract')) == [0, 1, 4]
+    assert matching(['regressao'], fields=('abstract',)) == []
+
+
+def old_filter(df: pd.DataFrame, subject: str) -> pd.DataFrame:
+    """
+    Filtro anterior de BDTDAgent.filter_by_subject: uma busca por termo em cada título.
+    """
+    terms = subject.lower().split()
+
+    def match_title(title):
+        title_lower = str(title).lower()
+        return any(re.search(rf"\b{term}\b", title_lower) for term in terms)
+
+    return df[df['title'].apply(match_title)]
+
+
+@pytest.mark.parametrize('subject', ['regressão logística', 'Redes neurais', 'sobrevivência modelos', 'inexistente'])
+def test_filter_by_subject_keeps_rows_of_per_row_loop(tmp_path, subject):
+    df = pd.DataFrame({'id': [f'R{n}' for n in range(len(TITLES))], 'title': TITLES})
+    agent = BDTDAgent(subject, output_dir=str(tmp_path))
+    write_records_table(df, agent.output_csv)
+
+    path = agent.filter_by_subject(agent.output_csv)
+
+    expected = old_filter(read_records_table(agent.output_csv), subject)
+    # O filtro novo também aceita a grafia sem acentos, que o antigo perdia
+    if subject == 'regressão logística':
+        assert list(expected['id']) == ['R0', 'R4']
+        expected = read_records_table(agent.output_csv).iloc[[0, 1, 4]]
+    assert list(read_records_table(path)['id']) == list(expected['id'])